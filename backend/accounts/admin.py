@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, JobSeekerProfile, EmployerProfile
+from .models import User, JobSeekerProfile, EmployerProfile, StatCounter
 
 
 @admin.register(User)
@@ -26,3 +26,9 @@ class EmployerProfileAdmin(admin.ModelAdmin):
     list_display = ['company_name', 'user', 'industry', 'location']
     search_fields = ['company_name', 'user__email', 'industry']
 
+
+
+@admin.register(StatCounter)
+class StatCounterAdmin(admin.ModelAdmin):
+    list_display = ['name', 'value']
+    search_fields = ['name']
@@ -1,77 +1,67 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework import permissions
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from datetime import datetime, timedelta
 from accounts.models import User
+from accounts.serializers import UserSerializer
+from accounts.stats import get_admin_stats
+from jobportal.metrics import metrics_enabled, registry
+from jobportal.pagination import KeysetPagination
+from jobportal.streaming import export_response
 from jobs.models import Job
-from applications.models import Application
+from jobs.serializers import JobSerializer
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAdminUser])
 def admin_stats(request):
     """Get admin dashboard statistics"""
-    total_users = User.objects.count()
-    job_seekers = User.objects.filter(role='job_seeker').count()
-    employers = User.objects.filter(role='employer').count()
-    
-    total_jobs = Job.objects.count()
-    active_jobs = Job.objects.filter(status='active').count()
-    internships = Job.objects.filter(is_internship=True).count()
-    
-    total_applications = Application.objects.count()
-    pending_applications = Application.objects.filter(status='pending').count()
-    
-    # Recent activity (last 7 days)
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_users = User.objects.filter(created_at__gte=week_ago).count()
-    recent_jobs = Job.objects.filter(created_at__gte=week_ago).count()
-    recent_applications = Application.objects.filter(applied_date__gte=week_ago).count()
-    
-    # Top categories
-    top_categories = Job.objects.values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')[:5]
-    
-    return Response({
-        'users': {
-            'total': total_users,
-            'job_seekers': job_seekers,
-            'employers': employers,
-            'recent': recent_users,
-        },
-        'jobs': {
-            'total': total_jobs,
-            'active': active_jobs,
-            'internships': internships,
-            'recent': recent_jobs,
-        },
-        'applications': {
-            'total': total_applications,
-            'pending': pending_applications,
-            'recent': recent_applications,
-        },
-        'top_categories': list(top_categories),
-    })
+    return Response(get_admin_stats())
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAdminUser])
-def admin_users(request):
-    """Get all users for admin"""
-    from accounts.serializers import UserSerializer
-    users = User.objects.all().order_by('-date_joined')
-    serializer = UserSerializer(users, many=True)
-    return Response(serializer.data)
+def admin_metrics(request):
+    """Rolling per-route request metrics for this worker"""
+    return Response({
+        'enabled': metrics_enabled(),
+        'window_seconds': settings.REQUEST_METRICS_WINDOW_SECONDS,
+        'routes': registry.snapshot(),
+    })
+
+
+class UserKeysetPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
+
+
+class AdminUserListView(generics.ListAPIView):
+    """Paginated, filterable user listing for admin; ?export=csv|ndjson streams everything"""
+    serializer_class = UserSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserKeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['role', 'is_active', 'is_verified']
+    search_fields = ['email', 'username']
+    ordering_fields = ['date_joined', 'email', 'username']
+    ordering = ['-date_joined']
+    
+    def get_queryset(self):
+        return User.objects.all()
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        export = export_response(request, queryset, UserSerializer, basename='users')
+        if export is not None:
+            return export
+        return super().list(request, *args, **kwargs)
 
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([permissions.IsAdminUser])
 def admin_user_detail(request, user_id):
     """Get, update, or delete a specific user"""
-    from accounts.serializers import UserSerializer
     try:
         user = User.objects.get(id=user_id)
     except User.DoesNotExist:
@@ -91,14 +81,26 @@ def admin_user_detail(request, user_id):
         return Response({'message': 'User deleted successfully'}, status=200)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAdminUser])
-def admin_jobs(request):
-    """Get all jobs for admin"""
-    from jobs.serializers import JobSerializer
-    jobs = Job.objects.all().order_by('-created_at')
-    serializer = JobSerializer(jobs, many=True, context={'request': request})
-    return Response(serializer.data)
+class AdminJobListView(generics.ListAPIView):
+    """Paginated, filterable job listing for admin; ?export=csv|ndjson streams everything"""
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['status', 'category', 'job_type', 'is_internship', 'remote', 'posted_by']
+    search_fields = ['title', 'category', 'posted_by__email']
+    ordering_fields = ['created_at', 'title', 'status']
+    ordering = ['-created_at']
+    
+    def get_queryset(self):
+        return Job.objects.for_listing()
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        export = export_response(request, queryset, JobSerializer, self.get_serializer_context(), basename='jobs')
+        if export is not None:
+            return export
+        return super().list(request, *args, **kwargs)
 
 
 @api_view(['PUT'])
@@ -125,9 +127,10 @@ def admin_job_moderate(request, job_id):
 
 urlpatterns = [
     path('stats/', admin_stats, name='admin-stats'),
-    path('users/', admin_users, name='admin-users'),
+    path('metrics/', admin_metrics, name='admin-metrics'),
+    path('users/', AdminUserListView.as_view(), name='admin-users'),
     path('users/<int:user_id>/', admin_user_detail, name='admin-user-detail'),
-    path('jobs/', admin_jobs, name='admin-jobs'),
+    path('jobs/', AdminJobListView.as_view(), name='admin-jobs'),
     path('jobs/<int:job_id>/moderate/', admin_job_moderate, name='admin-job-moderate'),
 ]
 
@@ -0,0 +1,138 @@
+"""
+JWT authentication backed by a per-process user cache.
+
+``CachedJWTAuthentication`` resolves the token's user from ``user_cache``,
+an LRU of ``User`` rows whose entries expire ``AUTH_USER_CACHE_TTL``
+seconds after they were loaded, so most authenticated requests run no user
+query. Saving or deleting a user drops its entry in this process at once
+(see ``accounts.signals``); other workers see the change once their entry
+expires. Tokens from ``RoleRefreshToken`` also carry ``role`` and
+``is_active``: a token issued to an account that was inactive is refused
+without a lookup, and one whose role no longer matches the account's is
+refused too, so a role change ends the old sessions.
+
+The async views call ``AsyncJWTAuthentication.aauthenticate()`` instead,
+which validates the token in the event loop and loads a missing user with
+the async ORM.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """LRU of users by token user id; each entry expires AUTH_USER_CACHE_TTL seconds after it was stored"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 30)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000)
+
+    def get(self, user_id):
+        """A private copy of the cached user, or None"""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        # Views may change request.user; they must not change the cached one
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[user_id] = (copy.copy(user), time.monotonic() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that takes the user from ``user_cache`` and checks the role and is_active claims"""
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is not None:
+                user_cache.set(user_id, user)
+        return self.check_user(user, validated_token)
+
+    def get_user_id(self, validated_token):
+        if validated_token.get('is_active') is False:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def check_user(self, user, validated_token):
+        """The checks JWTAuthentication.get_user() makes, plus the role claim"""
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        role = validated_token.get('role')
+        if role is not None and role != user.role:
+            raise AuthenticationFailed(_("The user's role has changed."), code='role_changed')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """CachedJWTAuthentication with awaitable counterparts of authenticate() and get_user()"""
+
+    async def aauthenticate(self, request):
+        """The signed-in user, or AnonymousUser when no token was sent"""
+        header = self.get_header(request)
+        if header is None:
+            return AnonymousUser()
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return AnonymousUser()
+        return await self.aget_user(self.get_validated_token(raw_token))
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+            if user is not None:
+                user_cache.set(user_id, user)
+        return self.check_user(user, validated_token)
@@ -0,0 +1,137 @@
+"""
+Refresh token blacklist checks without a query per refresh.
+
+Every worker keeps a Bloom filter of the blacklisted token ids (``jti``).
+A token the filter has never seen is not blacklisted, so refreshing it
+reads nothing from the blacklist tables. A hit, which is either a
+blacklisted token or a rare false positive, is confirmed with the usual
+query. The cost of a refresh no longer depends on how many tokens have
+been blacklisted.
+
+The filter is built on first use and caught up every
+``JWT_BLACKLIST_SYNC_SECONDS`` from the rows past the highest blacklist id
+seen. That is a primary key range scan whatever the table size. Tokens this
+worker blacklists go into the filter at once. Tokens blacklisted by other
+workers are seen from their next sync, so a rotated refresh token can be
+replayed against another worker for at most that long; 0 syncs before
+every check. When the filter fills up past ``JWT_BLACKLIST_BLOOM_CAPACITY``
+it is rebuilt twice as large, which also drops the rows ``compact_tokens``
+has deleted.
+
+``delete_expired_tokens()`` (``manage.py compact_tokens``) is the batched
+counterpart of simplejwt's ``flushexpiredtokens``, which deletes every
+expired token in one statement and one transaction.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+# Blacklist ids are handed out before their rows commit; re-read this many
+# below the highest one seen so a row committed out of order is not skipped
+SYNC_OVERLAP = 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+
+class TokenBlacklistFilter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.watermark = 0
+        self.synced_at = 0.0
+
+    def blacklisted_rows(self):
+        return BlacklistedToken.objects.order_by('id').values_list('id', 'token__jti')
+
+    def build(self, capacity=None):
+        rows = self.blacklisted_rows()
+        total = rows.count()
+        capacity = max(capacity or 0, getattr(settings, 'JWT_BLACKLIST_BLOOM_CAPACITY', 1000000), total * 2)
+        bloom = BloomFilter(capacity, getattr(settings, 'JWT_BLACKLIST_BLOOM_ERROR_RATE', 0.01))
+        watermark = 0
+        for row_id, jti in rows.iterator(chunk_size=5000):
+            bloom.add(jti)
+            watermark = max(watermark, row_id)
+        self.bloom, self.watermark = bloom, watermark
+        self.synced_at = time.monotonic()
+
+    def sync(self, force=False):
+        """Add the rows blacklisted by other workers since the last sync"""
+        interval = getattr(settings, 'JWT_BLACKLIST_SYNC_SECONDS', 5)
+        with self.lock:
+            if self.bloom is None:
+                self.build()
+                return
+            if not force and time.monotonic() - self.synced_at < interval:
+                return
+            rows = self.blacklisted_rows().filter(id__gt=self.watermark - SYNC_OVERLAP)
+            for row_id, jti in rows:
+                # The overlap re-reads rows already in the filter; count each once
+                if jti not in self.bloom:
+                    self.bloom.add(jti)
+                self.watermark = max(self.watermark, row_id)
+            if self.bloom.count > self.bloom.capacity:
+                self.build(capacity=self.bloom.capacity * 2)
+            self.synced_at = time.monotonic()
+
+    def might_contain(self, jti):
+        """False only if ``jti`` was not blacklisted as of the last sync"""
+        self.sync()
+        return jti in self.bloom
+
+    def add(self, jti):
+        """Record a token this worker has just blacklisted"""
+        with self.lock:
+            if self.bloom is not None and jti not in self.bloom:
+                self.bloom.add(jti)
+
+    def reset(self):
+        with self.lock:
+            self.bloom = None
+            self.watermark = 0
+            self.synced_at = 0.0
+
+
+token_blacklist = TokenBlacklistFilter()
+
+
+def delete_expired_tokens(batch_size=1000):
+    """Delete expired outstanding tokens and their blacklist rows, one short transaction per batch"""
+    deleted = 0
+    while True:
+        # Expired tokens are the oldest, so this scan stops near the start of the table
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=aware_utcnow())
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
@@ -0,0 +1,69 @@
+"""
+Password hashers whose cost comes from settings.
+
+``PASSWORD_HASHER`` names the algorithm new hashes use: 'scrypt', 'argon2'
+(needs the argon2-cffi package) or 'pbkdf2'. The other two stay in
+``PASSWORD_HASHERS`` so existing hashes still verify. Django rehashes a
+password on a successful ``check_password()`` whenever its algorithm is not
+the preferred one or its cost differs from the settings below, so changing
+either migrates each user at their next login.
+
+The cost is read on every call rather than fixed on the class, so
+``override_settings`` and the hasher benchmark can change it in process.
+``manage.py benchmark_password_hashers`` reports logins per second per core
+for each algorithm at the configured cost.
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.exceptions import ImproperlyConfigured
+
+HASHERS = {
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'accounts.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'accounts.hashers.PBKDF2PasswordHasher',
+}
+
+
+def password_hashers(preferred):
+    """PASSWORD_HASHERS with ``preferred`` first"""
+    if preferred not in HASHERS:
+        raise ImproperlyConfigured(f'PASSWORD_HASHER must be one of {", ".join(HASHERS)}, not {preferred!r}')
+    return [HASHERS[preferred]] + [path for name, path in HASHERS.items() if name != preferred]
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    # A cap, not an allocation; OpenSSL's 32 MiB default would refuse hashes
+    # made with a work factor above 2**14
+    maxmem = 2**30
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', hashers.ScryptPasswordHasher.block_size)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', hashers.ScryptPasswordHasher.parallelism)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
@@ -0,0 +1,69 @@
+import importlib.util
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from accounts.hashers import HASHERS, password_hashers
+from accounts.models import User
+
+PASSWORD = 'Benchmark-Passw0rd!'
+
+
+class Command(BaseCommand):
+    help = (
+        'Time hashing and POST /api/auth/login/ for each password hasher at the configured cost, '
+        'and report logins per second per core. Runs in a rolled back transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hasher', action='append', choices=HASHERS, help='Hashers to measure (repeatable)')
+        parser.add_argument('--logins', type=int, default=20, help='Logins per hasher')
+
+    def handle(self, *args, **options):
+        for name in options['hasher'] or HASHERS:
+            if name == 'argon2' and importlib.util.find_spec('argon2') is None:
+                self.stdout.write(f'{name:>7}: skipped, argon2-cffi is not installed')
+                continue
+            # Hashed in this process: pool processes would ignore the override and escape process_time()
+            with override_settings(
+                PASSWORD_HASHERS=password_hashers(name), PASSWORD_POOL_WORKERS=0, ALLOWED_HOSTS=['*'],
+            ):
+                result = self.measure(options['logins'])
+            self.stdout.write(
+                f'{name:>7}: hash {result["hash_ms"]:7.1f} ms | login {result["login_ms"]:7.1f} ms | '
+                f'{result["logins_per_core"]:7.1f} logins/s per core | {result["errors"]} errors'
+            )
+        self.stdout.write(f'Preferred: {get_hasher().algorithm}')
+
+    def measure(self, logins):
+        started = time.process_time()
+        encoded = make_password(PASSWORD)
+        hash_ms = (time.process_time() - started) * 1000
+
+        client = Client()
+        latencies, errors = [], 0
+        with transaction.atomic():
+            user = User.objects.create(
+                email='hasher-benchmark@example.invalid', username='hasher-benchmark', password=encoded,
+            )
+            body = {'email': user.email, 'password': PASSWORD}
+            started = time.process_time()
+            for number in range(logins):
+                sent = time.perf_counter()
+                response = client.post('/api/auth/login/', body, content_type='application/json')
+                latencies.append(time.perf_counter() - sent)
+                errors += response.status_code != 200
+            # CPU time of this process, so other load on the machine does not count
+            cpu_seconds = time.process_time() - started
+            transaction.set_rollback(True)
+        return {
+            'hash_ms': hash_ms,
+            'login_ms': statistics.median(latencies) * 1000,
+            'logins_per_core': logins / cpu_seconds,
+            'errors': errors,
+        }
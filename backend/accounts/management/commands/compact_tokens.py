@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.blacklist import delete_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens and their blacklist rows in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per transaction')
+        parser.add_argument('--once', action='store_true', help='Compact once and exit')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between compactions')
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = delete_expired_tokens(max(1, options['batch_size']))
+            if deleted or options['once']:
+                self.stdout.write(f'Deleted {deleted} expired tokens')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.stats import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the admin dashboard counter rows from the user, job and application tables'
+
+    def handle(self, *args, **options):
+        count = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} counters'))
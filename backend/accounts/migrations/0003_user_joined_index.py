@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_statcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='accounts_user_joined_idx'),
+        ),
+    ]
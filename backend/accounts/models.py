@@ -21,6 +21,12 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Keyset pagination of the admin user listing
+            models.Index(fields=['-date_joined', '-id'], name='accounts_user_joined_idx'),
+        ]
+    
     def __str__(self):
         return self.email
     
@@ -96,3 +102,12 @@ class EmployerProfile(models.Model):
     def __str__(self):
         return f"{self.company_name} - {self.user.email}"
 
+
+
+class StatCounter(models.Model):
+    """Incrementally maintained count backing the admin dashboard (see accounts.stats)"""
+    name = models.CharField(max_length=150, unique=True)
+    value = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
@@ -0,0 +1,152 @@
+"""
+Password hashing and verification off the request thread.
+
+With ``PASSWORD_POOL_WORKERS`` above 0, login and registration hand their
+password work to a ``ProcessPoolExecutor`` of that many processes instead of
+hashing in the web worker. At most ``PASSWORD_POOL_QUEUE`` more requests per
+web worker may wait for a free process; past that ``PasswordPoolBusy``
+answers 429 with a Retry-After header at once, so a burst of logins is
+bounded by the pool and does not hold every request thread while it waits.
+A pool process that dies mid-hash breaks the executor; the request is
+retried once on a new one. A hash that does not finish within
+``PASSWORD_POOL_TIMEOUT`` seconds, or a second break, answers 503.
+The pool processes run at ``PASSWORD_POOL_NICE`` niceness, which lets the
+operating system schedule job browsing requests ahead of them when both
+want the CPU.
+
+The pool processes start with ``spawn`` and load the same settings module,
+so they hash with the configured ``PASSWORD_HASHER``; settings changed in
+the web worker at run time do not reach them. Like any spawned process
+they import the server's main script, which must keep its startup under
+``if __name__ == '__main__'`` (manage.py and gunicorn do). With 0 workers
+(the default) both functions hash in the calling thread.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent import futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import APIException, Throttled
+
+
+class PasswordPoolBusy(Throttled):
+    default_detail = _('Too many logins and registrations in progress, try again shortly.')
+    default_code = 'password_pool_busy'
+
+
+class PasswordPoolUnavailable(APIException):
+    status_code = 503
+    default_detail = _('Login is temporarily unavailable, try again shortly.')
+    default_code = 'password_pool_unavailable'
+
+
+def setup_worker(niceness):
+    import django
+
+    if niceness:
+        os.nice(niceness)
+    django.setup()
+
+
+def verify_in_worker(password, encoded):
+    """Whether ``password`` matches, and its new hash when ``encoded`` is due to be upgraded"""
+    upgraded = []
+    valid = hashers.check_password(password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw)))
+    return valid, upgraded[0] if upgraded else None
+
+
+class PasswordPool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+
+    @property
+    def workers(self):
+        return getattr(settings, 'PASSWORD_POOL_WORKERS', 0)
+
+    def start(self):
+        """The executor and the semaphore bounding the requests in it"""
+        with self.lock:
+            if self.slots is None:
+                queue = getattr(settings, 'PASSWORD_POOL_QUEUE', 32)
+                self.slots = threading.BoundedSemaphore(self.workers + queue)
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=setup_worker,
+                    initargs=(getattr(settings, 'PASSWORD_POOL_NICE', 10),),
+                )
+            return self.executor, self.slots
+
+    def discard(self, executor):
+        """Drop a broken executor so the next request starts a new one"""
+        with self.lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, function, *args):
+        """
+        ``function(*args)`` in a pool process. PasswordPoolBusy when every slot
+        is taken; PasswordPoolUnavailable when it times out or the pool breaks
+        twice in a row
+        """
+        timeout = getattr(settings, 'PASSWORD_POOL_TIMEOUT', 10)
+        for attempt in range(2):
+            executor, slots = self.start()
+            if not slots.acquire(blocking=False):
+                raise PasswordPoolBusy(wait=1)
+            try:
+                future = executor.submit(function, *args)
+            except BrokenProcessPool:
+                slots.release()
+                self.discard(executor)
+                continue
+            except BaseException:
+                slots.release()
+                raise
+            # Freed when the work finishes, even if the request has gone
+            future.add_done_callback(lambda future: slots.release())
+            try:
+                return future.result(timeout=timeout)
+            except BrokenProcessPool:
+                # A pool process died mid-hash, e.g. killed for its memory
+                self.discard(executor)
+            except futures.TimeoutError:
+                raise PasswordPoolUnavailable()
+        raise PasswordPoolUnavailable()
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+            self.slots = None
+
+
+password_pool = PasswordPool()
+
+
+def make_password(password):
+    """The hash to store for ``password``"""
+    if password_pool.workers <= 0:
+        return hashers.make_password(password)
+    return password_pool.run(hashers.make_password, password)
+
+
+def check_password(user, password):
+    """``user.check_password(password)``, including the rehash of an outdated hash"""
+    if password_pool.workers <= 0:
+        return user.check_password(password)
+    valid, upgraded = password_pool.run(verify_in_worker, password, user.password)
+    if upgraded is not None:
+        user.password = upgraded
+        user.save(update_fields=['password'])
+    return valid
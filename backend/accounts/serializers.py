@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.contrib.auth.password_validation import validate_password
 from .models import User, JobSeekerProfile, EmployerProfile
+from .password_pool import make_password
+from .tokens import RoleRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -18,10 +21,11 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ['email', 'username', 'password', 'role', 'phone_number']
     
     def create(self, validated_data):
-        password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
+        # What create_user() does, with the hash made in the password pool when enabled
+        validated_data['email'] = User.objects.normalize_email(validated_data['email'])
+        validated_data['username'] = User.normalize_username(validated_data['username'])
+        validated_data['password'] = make_password(validated_data['password'])
+        user = User.objects.create(**validated_data)
         
         # Create profile based on role
         if user.role == 'job_seeker':
@@ -61,3 +65,7 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh with RoleRefreshToken, whose blacklist check goes through the Bloom filter"""
+    token_class = RoleRefreshToken
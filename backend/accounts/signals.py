@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .authentication import user_cache
+from .models import User
+from .stats import (
+    COUNTED_MODELS, apply_deltas, counted_values, counter_deltas,
+    counters_enabled, invalidate_admin_stats, stored_values,
+)
+
+
+def touches_counted_fields(model, update_fields):
+    if update_fields is None:
+        return True
+    date_field, fields, counters = COUNTED_MODELS[model]
+    return bool(set(update_fields) & set(fields))
+
+
+def remember_counted_values(sender, instance, update_fields=None, **kwargs):
+    """Record what the row counted towards before this save"""
+    instance._stat_values = None
+    if not instance._state.adding and touches_counted_fields(sender, update_fields):
+        instance._stat_values = stored_values(sender, instance.pk)
+
+
+def count_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not touches_counted_fields(sender, update_fields):
+        return
+    old_values = None if created else getattr(instance, '_stat_values', None)
+    new_values = counted_values(sender, instance)
+    if old_values == new_values:
+        # e.g. a profile edit or a password rehash; the stats cannot have changed
+        return
+    transaction.on_commit(invalidate_admin_stats)
+    if counters_enabled():
+        apply_deltas(counter_deltas(sender, old_values, new_values))
+
+
+def count_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_admin_stats)
+    if counters_enabled():
+        apply_deltas(counter_deltas(sender, counted_values(sender, instance), None))
+
+
+for model in COUNTED_MODELS:
+    pre_save.connect(remember_counted_values, sender=model, dispatch_uid=f'stats_pre_save_{model._meta.label}')
+    post_save.connect(count_saved, sender=model, dispatch_uid=f'stats_post_save_{model._meta.label}')
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f'stats_post_delete_{model._meta.label}')
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    """Drop the user's cached row now, and again at commit in case a request cached the old one meanwhile"""
+    user_id = instance.pk
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+post_save.connect(forget_cached_user, sender=User, dispatch_uid='auth_user_cache_post_save')
+post_delete.connect(forget_cached_user, sender=User, dispatch_uid='auth_user_cache_post_delete')
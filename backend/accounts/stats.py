@@ -0,0 +1,246 @@
+"""
+Admin dashboard statistics.
+
+``get_admin_stats()`` serves the payload from the cache when it can. On a
+miss it either aggregates each table in one query (``ADMIN_STATS_SOURCE =
+'aggregate'``) or reads ``StatCounter`` rows kept up to date by model
+signals (``'counters'``), which costs the same however large the tables get.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from applications.models import Application
+from jobportal.prometheus import record_cache
+from jobs.models import Job
+from .models import StatCounter, User
+
+CACHE_KEY = 'admin_stats'
+RECENT_DAYS = 7
+TOP_CATEGORIES = 5
+
+
+def counters_enabled():
+    return getattr(settings, 'ADMIN_STATS_SOURCE', 'aggregate') == 'counters'
+
+
+def get_admin_stats():
+    stats = cache.get(CACHE_KEY)
+    record_cache('admin_stats', stats is not None)
+    if stats is None:
+        stats = counter_stats() if counters_enabled() else aggregate_stats()
+        cache.set(CACHE_KEY, stats, getattr(settings, 'ADMIN_STATS_CACHE_TTL', 60))
+    return stats
+
+
+def invalidate_admin_stats():
+    cache.delete(CACHE_KEY)
+
+
+def aggregate_stats():
+    """One conditional-aggregation query per table, plus the category breakdown"""
+    week_ago = timezone.now() - timedelta(days=RECENT_DAYS)
+
+    users = User.objects.aggregate(
+        total=Count('id'),
+        job_seekers=Count('id', filter=Q(role='job_seeker')),
+        employers=Count('id', filter=Q(role='employer')),
+        recent=Count('id', filter=Q(created_at__gte=week_ago)),
+    )
+    jobs = Job.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='active')),
+        internships=Count('id', filter=Q(is_internship=True)),
+        recent=Count('id', filter=Q(created_at__gte=week_ago)),
+    )
+    applications = Application.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        recent=Count('id', filter=Q(applied_date__gte=week_ago)),
+    )
+    top_categories = Job.objects.values('category').annotate(
+        count=Count('id')
+    ).order_by('-count')[:TOP_CATEGORIES]
+
+    return {
+        'users': users,
+        'jobs': jobs,
+        'applications': applications,
+        'top_categories': list(top_categories),
+    }
+
+
+# Counter rows
+
+def day_key(prefix, day):
+    return f'{prefix}.created.{day.isoformat()}'
+
+
+def recent_day_keys(prefix):
+    today = timezone.localdate()
+    return [f'{prefix}.created.{(today - timedelta(days=offset)).isoformat()}' for offset in range(RECENT_DAYS)]
+
+
+def counter_stats():
+    """
+    Build the payload from counter rows in two small indexed queries.
+
+    "recent" is the sum of the last seven daily buckets, i.e. calendar days
+    rather than a rolling 168 hours.
+    """
+    names = [
+        'users.total', 'users.role.job_seeker', 'users.role.employer',
+        'jobs.total', 'jobs.status.active', 'jobs.internships',
+        'applications.total', 'applications.status.pending',
+    ]
+    recent = {prefix: recent_day_keys(prefix) for prefix in ('users', 'jobs', 'applications')}
+    for keys in recent.values():
+        names.extend(keys)
+    values = dict(StatCounter.objects.filter(name__in=names).values_list('name', 'value'))
+
+    def value(name):
+        return values.get(name, 0)
+
+    def recent_total(prefix):
+        return sum(value(name) for name in recent[prefix])
+
+    top_categories = StatCounter.objects.filter(
+        name__startswith='jobs.category.', value__gt=0
+    ).order_by('-value', 'name')[:TOP_CATEGORIES]
+
+    return {
+        'users': {
+            'total': value('users.total'),
+            'job_seekers': value('users.role.job_seeker'),
+            'employers': value('users.role.employer'),
+            'recent': recent_total('users'),
+        },
+        'jobs': {
+            'total': value('jobs.total'),
+            'active': value('jobs.status.active'),
+            'internships': value('jobs.internships'),
+            'recent': recent_total('jobs'),
+        },
+        'applications': {
+            'total': value('applications.total'),
+            'pending': value('applications.status.pending'),
+            'recent': recent_total('applications'),
+        },
+        'top_categories': [
+            {'category': counter.name[len('jobs.category.'):], 'count': counter.value}
+            for counter in top_categories
+        ],
+    }
+
+
+def bump(name, delta=1):
+    """Atomically add ``delta`` to a counter row, creating it on first use"""
+    if not delta:
+        return
+    if StatCounter.objects.filter(name=name).update(value=F('value') + delta):
+        return
+    try:
+        with transaction.atomic():
+            StatCounter.objects.create(name=name, value=delta)
+    except IntegrityError:
+        # Another request created the row first
+        StatCounter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def apply_deltas(deltas):
+    for name, delta in deltas.items():
+        bump(name, delta)
+
+
+def user_counters(values):
+    """Counter names that one user row contributes to"""
+    return ['users.total', f"users.role.{values['role']}", day_key('users', values['day'])]
+
+
+def job_counters(values):
+    names = [
+        'jobs.total', f"jobs.status.{values['status']}",
+        f"jobs.category.{values['category']}", day_key('jobs', values['day']),
+    ]
+    if values['is_internship']:
+        names.append('jobs.internships')
+    return names
+
+
+def application_counters(values):
+    return [
+        'applications.total', f"applications.status.{values['status']}",
+        day_key('applications', values['day']),
+    ]
+
+
+# model: (creation timestamp field, other counted fields, counter names for a row)
+COUNTED_MODELS = {
+    User: ('created_at', ('role',), user_counters),
+    Job: ('created_at', ('status', 'category', 'is_internship'), job_counters),
+    Application: ('applied_date', ('status',), application_counters),
+}
+
+
+def counted_values(model, obj):
+    """The counted fields of an instance, with its creation day"""
+    date_field, fields, counters = COUNTED_MODELS[model]
+    values = {field: getattr(obj, field) for field in fields}
+    values['day'] = timezone.localdate(getattr(obj, date_field))
+    return values
+
+
+def row_values(model, row):
+    """The counted fields of a values() row that includes the creation timestamp"""
+    date_field, fields, counters = COUNTED_MODELS[model]
+    values = {field: row[field] for field in fields}
+    values['day'] = timezone.localdate(row[date_field])
+    return values
+
+
+def stored_values(model, pk):
+    """The counted fields of a row as currently stored, or None"""
+    date_field, fields, counters = COUNTED_MODELS[model]
+    row = model.objects.filter(pk=pk).values(*fields, date_field).first()
+    if row is None:
+        return None
+    return row_values(model, row)
+
+
+def counter_deltas(model, old_values, new_values):
+    """+1/-1 per counter name for a row moving from ``old_values`` to ``new_values``"""
+    counters = COUNTED_MODELS[model][2]
+    deltas = {}
+    if old_values is not None:
+        for name in counters(old_values):
+            deltas[name] = deltas.get(name, 0) - 1
+    if new_values is not None:
+        for name in counters(new_values):
+            deltas[name] = deltas.get(name, 0) + 1
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def rebuild_counters():
+    """Recompute every counter row from the tables (run after enabling counters)"""
+    totals = {}
+    for model, (date_field, fields, counters) in COUNTED_MODELS.items():
+        rows = model.objects.values(*fields, day=TruncDate(date_field)).annotate(
+            rows=Count('id')
+        ).order_by()
+        for values in rows:
+            for name in counters(values):
+                totals[name] = totals.get(name, 0) + values['rows']
+
+    with transaction.atomic():
+        StatCounter.objects.all().delete()
+        StatCounter.objects.bulk_create(
+            [StatCounter(name=name, value=value) for name, value in totals.items()],
+            batch_size=1000,
+        )
+    invalidate_admin_stats()
+    return len(totals)
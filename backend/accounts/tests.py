@@ -0,0 +1,246 @@
+import os
+import signal
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password as matches
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from jobs.models import Job
+from .authentication import AsyncJWTAuthentication, user_cache
+from .blacklist import delete_expired_tokens, token_blacklist
+from .models import StatCounter, User
+from .password_pool import PasswordPoolBusy, PasswordPoolUnavailable, make_password, password_pool
+from .stats import CACHE_KEY
+from .tokens import RoleRefreshToken
+
+
+@override_settings(PASSWORD_POOL_WORKERS=1, PASSWORD_POOL_QUEUE=0, PASSWORD_POOL_TIMEOUT=10)
+class PasswordPoolTests(SimpleTestCase):
+    def tearDown(self):
+        password_pool.shutdown()
+
+    def kill_pool_processes(self):
+        for process in list(password_pool.executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+    def test_pool_is_rebuilt_after_a_process_dies(self):
+        self.assertTrue(matches('first-password', make_password('first-password')))
+        self.kill_pool_processes()
+        for number in range(3):
+            self.assertTrue(matches(f'password-{number}', make_password(f'password-{number}')))
+
+    def test_full_pool_is_busy(self):
+        executor, slots = password_pool.start()
+        slots.acquire()
+        try:
+            with self.assertRaises(PasswordPoolBusy):
+                make_password('secret')
+        finally:
+            slots.release()
+
+    @override_settings(PASSWORD_POOL_TIMEOUT=0.5)
+    def test_slow_hash_is_unavailable(self):
+        with self.assertRaises(PasswordPoolUnavailable):
+            password_pool.run(time.sleep, 2)
+
+
+class AdminStatsInvalidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        cache.set(CACHE_KEY, {'cached': True})
+
+    def save(self, obj, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save(**kwargs)
+        return cache.get(CACHE_KEY) is not None
+
+    def test_saves_that_change_no_counted_field_keep_the_cache(self):
+        self.user.first_name = 'Ada'
+        self.assertTrue(self.save(self.user))
+        self.user.set_password('correct horse battery staple')
+        self.assertTrue(self.save(self.user, update_fields=['password']))
+
+        job = Job.objects.create(
+            title='Backend Engineer', description='Build APIs', category='Engineering', location='Remote',
+            requirements='Python', status='active', posted_by=self.user,
+        )
+        cache.set(CACHE_KEY, {'cached': True})
+        job.title = 'Platform Engineer'
+        self.assertTrue(self.save(job))
+
+    @override_settings(ADMIN_STATS_SOURCE='counters')
+    def test_counted_changes_clear_the_cache(self):
+        self.user.role = 'employer'
+        self.assertFalse(self.save(self.user))
+        self.assertEqual(StatCounter.objects.get(name='users.role.employer').value, 1)
+
+        cache.set(CACHE_KEY, {'cached': True})
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.assertIsNone(cache.get(CACHE_KEY))
+
+
+@override_settings(JWT_BLACKLIST_SYNC_SECONDS=3600)
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        # The filter is process-wide; start each test from an empty one
+        token_blacklist.reset()
+        self.addCleanup(token_blacklist.reset)
+        self.user = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/api/auth/token/refresh/', {'refresh': str(token)}, format='json')
+
+    def test_rotated_token_is_rejected(self):
+        token = RoleRefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+        # A new worker builds its filter from the blacklist table
+        token_blacklist.reset()
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_logged_out_token_is_rejected(self):
+        token = RoleRefreshToken.for_user(self.user)
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/auth/logout/', {'refresh_token': str(token)}, format='json')
+        self.client.force_authenticate(None)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def blacklist_elsewhere(self, token):
+        """Blacklist as another worker would, leaving this worker's filter alone"""
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token['jti']))
+
+    def test_tokens_blacklisted_elsewhere_are_seen_after_a_rebuild_or_sync(self):
+        first, second = RoleRefreshToken.for_user(self.user), RoleRefreshToken.for_user(self.user)
+        token_blacklist.sync()
+        self.blacklist_elsewhere(first)
+        token_blacklist.reset()
+        self.assertEqual(self.refresh(first).status_code, 401)
+
+        self.blacklist_elsewhere(second)
+        with self.settings(JWT_BLACKLIST_SYNC_SECONDS=0):
+            self.assertEqual(self.refresh(second).status_code, 401)
+
+    def test_unseen_tokens_skip_the_blacklist_query(self):
+        token = RoleRefreshToken.for_user(self.user)
+        token_blacklist.sync()
+        with self.assertNumQueries(0):
+            token.check_blacklist()
+
+        token.blacklist()
+        with self.assertNumQueries(1), self.assertRaises(TokenError):
+            token.check_blacklist()
+
+    @override_settings(JWT_BLACKLIST_BLOOM_CAPACITY=2)
+    def test_full_filter_is_rebuilt_larger(self):
+        token_blacklist.sync()
+        tokens = [RoleRefreshToken.for_user(self.user) for number in range(5)]
+        for token in tokens:
+            self.blacklist_elsewhere(token)
+
+        token_blacklist.sync(force=True)
+        self.assertGreaterEqual(token_blacklist.bloom.capacity, 5)
+        self.assertTrue(all(token_blacklist.might_contain(token['jti']) for token in tokens))
+
+    def test_expired_tokens_are_deleted_in_batches(self):
+        tokens = [RoleRefreshToken.for_user(self.user) for number in range(5)]
+        for token in tokens:
+            token.blacklist()
+        expired = [token['jti'] for token in tokens[:3]]
+        OutstandingToken.objects.filter(jti__in=expired).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_expired_tokens(batch_size=2), 3)
+        table = OutstandingToken._meta.db_table
+        self.assertEqual(sum(query['sql'].startswith(f'DELETE FROM "{table}"') for query in queries), 2)
+        self.assertFalse(OutstandingToken.objects.filter(jti__in=expired).exists())
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
+
+        stdout = StringIO()
+        call_command('compact_tokens', '--once', stdout=stdout)
+        self.assertEqual(stdout.getvalue(), 'Deleted 0 expired tokens\n')
+
+        # Deleted rows drop out of the filter when it is next rebuilt
+        token_blacklist.reset()
+        self.assertEqual(self.refresh(tokens[4]).status_code, 401)
+        self.assertFalse(token_blacklist.might_contain(expired[0]))
+
+
+class CachedUserAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RoleRefreshToken.for_user(self.user).access_token}')
+
+    def current_user(self):
+        return self.client.get('/api/auth/user/')
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.current_user().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.current_user().json()['email'], 'seeker@example.com')
+
+    def test_deactivating_the_user_drops_the_cached_row(self):
+        self.assertEqual(self.current_user().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        response = self.current_user()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'user_inactive')
+
+    def test_role_change_ends_sessions_with_the_old_role(self):
+        self.assertEqual(self.current_user().status_code, 200)
+        self.user.role = 'employer'
+        self.user.save()
+        response = self.current_user()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'role_changed')
+
+    def test_deleted_user_is_not_found(self):
+        self.assertEqual(self.current_user().status_code, 200)
+        self.user.delete()
+        self.assertEqual(self.current_user().json()['code'], 'user_not_found')
+
+    def test_async_views_share_the_invalidation(self):
+        token = AccessToken(str(RoleRefreshToken.for_user(self.user).access_token))
+        authentication = AsyncJWTAuthentication()
+        self.assertEqual(async_to_sync(authentication.aget_user)(token), self.user)
+        self.user.role = 'employer'
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed) as raised:
+            async_to_sync(authentication.aget_user)(token)
+        self.assertEqual(raised.exception.detail['code'], 'role_changed')
+
+    def test_changes_without_signals_show_once_the_entry_expires(self):
+        self.assertEqual(self.current_user().status_code, 200)
+        # Queryset updates send no post_save, as when another worker saves the user
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.current_user().status_code, 200)
+
+        expired = time.monotonic() + user_cache.ttl + 1
+        with mock.patch('accounts.authentication.time.monotonic', return_value=expired):
+            self.assertEqual(self.current_user().status_code, 401)
+
+    def test_views_cannot_change_the_cached_user(self):
+        self.assertEqual(self.current_user().status_code, 200)
+        user_cache.get(self.user.pk).role = 'admin'
+        self.assertEqual(user_cache.get(self.user.pk).role, 'job_seeker')
@@ -0,0 +1,25 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import token_blacklist
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token carrying the user's ``role`` and ``is_active``; access tokens made from it copy both"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['role'] = user.role
+        token['is_active'] = user.is_active
+        return token
+
+    def check_blacklist(self):
+        """Query the blacklist only for token ids the worker's Bloom filter has seen"""
+        if token_blacklist.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
@@ -1,13 +1,15 @@
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from jobportal.conditional import conditional_response, make_etag, to_timestamp
 from .models import User, JobSeekerProfile, EmployerProfile
+from .password_pool import check_password
 from .serializers import (
     UserSerializer, UserRegistrationSerializer,
     JobSeekerProfileSerializer, EmployerProfileSerializer
 )
+from .tokens import RoleRefreshToken
 
 
 class RegisterView(generics.CreateAPIView):
@@ -21,7 +23,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
         
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -53,7 +55,7 @@ def login_view(request):
             status=status.HTTP_401_UNAUTHORIZED
         )
     
-    if not user.check_password(password):
+    if not check_password(user, password):
         return Response(
             {'error': 'Invalid credentials'},
             status=status.HTTP_401_UNAUTHORIZED
@@ -65,7 +67,7 @@ def login_view(request):
             status=status.HTTP_401_UNAUTHORIZED
         )
     
-    refresh = RefreshToken.for_user(user)
+    refresh = RoleRefreshToken.for_user(user)
     
     return Response({
         'user': UserSerializer(user).data,
@@ -83,7 +85,7 @@ def logout_view(request):
     try:
         refresh_token = request.data.get('refresh_token')
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = RoleRefreshToken(refresh_token)
             token.blacklist()
         return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
     except Exception as e:
@@ -93,11 +95,34 @@ def logout_view(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def current_user_view(request):
-    serializer = UserSerializer(request.user)
-    return Response(serializer.data)
+    # The authenticated user is already loaded, so validators cost no query
+    user = request.user
+    etag = make_etag('user', user.id, user.updated_at.isoformat(), request.accepted_renderer.format)
+    return conditional_response(
+        request, etag, to_timestamp(user.updated_at),
+        lambda: Response(UserSerializer(user).data)
+    )
 
 
-class JobSeekerProfileView(generics.RetrieveUpdateAPIView):
+class ConditionalProfileMixin:
+    """Answer GETs with 304 when neither the profile nor its user changed"""
+    
+    def retrieve(self, request, *args, **kwargs):
+        row = self.get_queryset().values('id', 'updated_at', 'user__updated_at').first()
+        if row is None:
+            # Created on first access by get_object()
+            return super().retrieve(request, *args, **kwargs)
+        etag = make_etag(
+            self.get_queryset().model._meta.label, row['id'], row['updated_at'].isoformat(),
+            row['user__updated_at'].isoformat(), request.accepted_renderer.format,
+        )
+        return conditional_response(
+            request, etag, to_timestamp(row['updated_at'], row['user__updated_at']),
+            lambda: super(ConditionalProfileMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+
+class JobSeekerProfileView(ConditionalProfileMixin, generics.RetrieveUpdateAPIView):
     serializer_class = JobSeekerProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -109,7 +134,7 @@ class JobSeekerProfileView(generics.RetrieveUpdateAPIView):
         return JobSeekerProfile.objects.filter(user=self.request.user)
 
 
-class EmployerProfileView(generics.RetrieveUpdateAPIView):
+class EmployerProfileView(ConditionalProfileMixin, generics.RetrieveUpdateAPIView):
     serializer_class = EmployerProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -1,8 +1,14 @@
-from django.db import models
+from django.db import models, transaction
 from accounts.models import User
 from jobs.models import Job
 
 
+class ApplicationQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Join the job, its poster, the applicant and their profile for serialization"""
+        return self.select_related('job__posted_by', 'applicant__jobseeker_profile')
+
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -21,6 +27,8 @@ class Application(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True, help_text="Internal notes for employer")
     
+    objects = ApplicationQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_date']
@@ -32,6 +40,12 @@ class Application(models.Model):
     def __str__(self):
         return f"{self.applicant.email} applied for {self.job.title}"
     
+    def save(self, *args, **kwargs):
+        # The counter signals lock the row before the write and move the job's
+        # counters after it; both must happen in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     @property
     def status_display_class(self):
         """Return CSS class for status badge"""
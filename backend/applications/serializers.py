@@ -1,9 +1,39 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Application
+from jobs.models import Job, SavedJob
 from jobs.serializers import JobSerializer
+from accounts.models import User, JobSeekerProfile
 from accounts.serializers import UserSerializer, JobSeekerProfileSerializer
 
 
+def get_applicant_profile(application):
+    # Cached (possibly as missing) by Application.objects.for_listing()
+    try:
+        return application.applicant.jobseeker_profile
+    except JobSeekerProfile.DoesNotExist:
+        return None
+
+
+class ApplicationListSerializer(serializers.ListSerializer):
+    """Resolve saved jobs for the nested job fields of a whole page with one query"""
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        applications = list(iterable)
+        
+        request = self.context.get('request')
+        if request and request.user.is_authenticated and 'saved_job_ids' not in self.context:
+            self.context['saved_job_ids'] = set(
+                SavedJob.objects.filter(
+                    user=request.user,
+                    job_id__in={application.job_id for application in applications}
+                ).values_list('job_id', flat=True)
+            )
+        
+        return [self.child.to_representation(application) for application in applications]
+
+
 class ApplicationSerializer(serializers.ModelSerializer):
     job = JobSerializer(read_only=True)
     applicant = UserSerializer(read_only=True)
@@ -17,13 +47,58 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'status', 'status_display_class', 'applied_date', 'updated_at', 'notes'
         ]
         read_only_fields = ['id', 'applied_date', 'updated_at']
+        list_serializer_class = ApplicationListSerializer
     
     def get_applicant_profile(self, obj):
-        if hasattr(obj.applicant, 'jobseeker_profile'):
-            return JobSeekerProfileSerializer(obj.applicant.jobseeker_profile).data
+        profile = get_applicant_profile(obj)
+        if profile is not None:
+            return JobSeekerProfileSerializer(profile).data
         return None
 
 
+class ApplicationJobSummarySerializer(serializers.ModelSerializer):
+    posted_by = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'category', 'location', 'job_type', 'status', 'posted_by']
+    
+    def get_posted_by(self, obj):
+        return {'id': obj.posted_by_id, 'email': obj.posted_by.email}
+
+
+class ApplicantSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'username']
+
+
+class ApplicationSummarySerializer(serializers.ModelSerializer):
+    """Slim representation for inbox-style lists; use with Application.objects.for_listing()"""
+    job = ApplicationJobSummarySerializer(read_only=True)
+    applicant = ApplicantSummarySerializer(read_only=True)
+    applicant_profile = serializers.SerializerMethodField()
+    status_display_class = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'job', 'applicant', 'applicant_profile', 'cover_letter',
+            'status', 'status_display_class', 'applied_date', 'updated_at', 'notes'
+        ]
+    
+    def get_applicant_profile(self, obj):
+        profile = get_applicant_profile(obj)
+        if profile is None:
+            return None
+        return {
+            'id': profile.id,
+            'resume': profile.resume.url if profile.resume else None,
+            'skills_list': profile.get_skills_list(),
+            'location': profile.location,
+        }
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
@@ -0,0 +1,38 @@
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from jobs.counters import application_deltas, apply_deltas
+from .models import Application
+
+
+@receiver(pre_save, sender=Application)
+def remember_counted_state(sender, instance, update_fields=None, **kwargs):
+    """Record which job/status counters the row counted towards before this save"""
+    instance._counted_state = None
+    if instance._state.adding:
+        return
+    if update_fields is not None and not {'status', 'job', 'job_id'} & set(update_fields):
+        return
+    rows = Application.objects.filter(pk=instance.pk)
+    if connection.features.has_select_for_update:
+        # Held until save() commits, so a concurrent save reads this one's status, not the same old one
+        rows = rows.select_for_update()
+    row = rows.values('job_id', 'status').first()
+    if row is not None:
+        instance._counted_state = (row['job_id'], row['status'])
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    """Move the job's application counters in the same transaction as the write"""
+    new_state = (instance.job_id, instance.status)
+    old_state = None if created else getattr(instance, '_counted_state', None)
+    if not created and old_state in (None, new_state):
+        return
+    apply_deltas(application_deltas(old_state, new_state))
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    apply_deltas(application_deltas((instance.job_id, instance.status), None))
@@ -0,0 +1,155 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import JobSeekerProfile, User
+from jobs.models import Job
+from notifications.models import OutboxEmail
+from .models import Application
+
+SIZES = (1, 5, 20)
+
+
+class ApplicationListQueryTests(TestCase):
+    """Listing queries stay the same however many applications are returned"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.job = self.make_job('Backend Engineer')
+
+    def make_job(self, title):
+        return Job.objects.create(
+            title=title, description='Build APIs', category='Engineering', location='Remote',
+            requirements='Python', status='active', posted_by=self.employer,
+        )
+
+    def add_applications(self, count, job=None):
+        """``count`` more applications, each from a new seeker to ``job`` or to a new job"""
+        start = Application.objects.count()
+        for number in range(start, start + count):
+            seeker = User.objects.create_user(
+                email=f'seeker{number}@example.com', username=f'seeker{number}', role='job_seeker',
+            )
+            JobSeekerProfile.objects.create(user=seeker, skills='Python, Django')
+            Application.objects.create(job=job or self.make_job(f'Job {number}'), applicant=seeker)
+
+    def assertConstantQueries(self, user, path, expected, job=None):
+        self.client.force_authenticate(user)
+        for size in SIZES:
+            self.add_applications(size - Application.objects.count(), job=job)
+            with self.subTest(applications=size), self.assertNumQueries(expected):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+
+    def test_application_list(self):
+        self.assertConstantQueries(self.employer, '/api/applications/', 2)
+
+    def test_application_list_full_view(self):
+        self.assertConstantQueries(self.employer, '/api/applications/?view=full', 3)
+
+    def test_job_applications(self):
+        self.assertConstantQueries(self.employer, f'/api/applications/job/{self.job.id}/', 2, job=self.job)
+
+    def test_job_applications_full_view(self):
+        self.assertConstantQueries(
+            self.employer, f'/api/applications/job/{self.job.id}/?view=full', 3, job=self.job,
+        )
+
+
+class BulkStatusUpdateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.client.force_authenticate(self.employer)
+        self.job = Job.objects.create(
+            title='Backend Engineer', description='Build APIs', category='Engineering', location='Remote',
+            requirements='Python', status='active', posted_by=self.employer,
+        )
+        self.applications = [
+            Application.objects.create(job=self.job, applicant=User.objects.create_user(
+                email=f'seeker{number}@example.com', username=f'seeker{number}', role='job_seeker',
+            ))
+            for number in range(3)
+        ]
+
+    def bulk_update(self, new_status):
+        return self.client.post('/api/applications/bulk-update-status/', {
+            'status': new_status, 'application_ids': [application.id for application in self.applications],
+        }, format='json')
+
+    def assertCounters(self, **expected):
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.applications_total, 3)
+        for status, count in expected.items():
+            self.assertEqual(getattr(job, f'applications_{status}'), count)
+
+    def test_repeated_update_changes_nothing(self):
+        self.assertEqual(self.bulk_update('reviewing').data['status_changed'], 3)
+        self.assertEqual(self.bulk_update('reviewing').data['status_changed'], 0)
+        self.assertCounters(pending=0, reviewing=3)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+
+    def test_row_changed_after_the_read_is_not_counted_twice(self):
+        first = self.applications[0]
+        real_now = timezone.now
+
+        def concurrent_update():
+            # Another request moves one row between this request's read and its UPDATE
+            Application.objects.filter(pk=first.pk).update(status='reviewing')
+            Job.objects.filter(pk=self.job.pk).update(applications_pending=2, applications_reviewing=1)
+            return real_now()
+
+        with mock.patch('applications.views.timezone.now', side_effect=concurrent_update):
+            response = self.bulk_update('reviewing')
+
+        self.assertEqual(response.data['status_changed'], 2)
+        self.assertCounters(pending=0, reviewing=3)
+        self.assertEqual(
+            sorted(OutboxEmail.objects.values_list('recipient', flat=True)),
+            ['seeker1@example.com', 'seeker2@example.com'],
+        )
+
+
+class ApplicationCounterTests(TestCase):
+    def setUp(self):
+        employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        seeker = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.job = Job.objects.create(
+            title='Backend Engineer', description='Build APIs', category='Engineering', location='Remote',
+            requirements='Python', status='active', posted_by=employer,
+        )
+        self.application = Application.objects.create(job=self.job, applicant=seeker)
+
+    def counters(self):
+        job = Job.objects.get(pk=self.job.pk)
+        return {status: getattr(job, f'applications_{status}') for status in ('pending', 'reviewing', 'rejected')}
+
+    def test_transition_after_a_stale_read(self):
+        stale = Application.objects.get(pk=self.application.pk)
+        self.application.status = 'reviewing'
+        self.application.save()
+
+        # The stale copy still says pending; the counters follow the row's actual status
+        stale.status = 'rejected'
+        stale.save()
+        self.assertEqual(self.counters(), {'pending': 0, 'reviewing': 0, 'rejected': 1})
+
+        stale = Application.objects.get(pk=self.application.pk)
+        self.application.save()
+        stale.save()
+        self.assertEqual(self.counters(), {'pending': 0, 'reviewing': 0, 'rejected': 1})
+        self.assertEqual(Job.objects.get(pk=self.job.pk).applications_total, 1)
+
+    def test_status_read_and_write_share_a_transaction(self):
+        depths = []
+        with mock.patch('applications.signals.apply_deltas', lambda deltas: depths.append(
+            len(connection.atomic_blocks)
+        )):
+            self.application.status = 'reviewing'
+            self.application.save()
+        # The test's own transaction, plus the one save() opens around the locking read
+        self.assertEqual(depths, [len(connection.atomic_blocks) + 1])
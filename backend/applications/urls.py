@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     ApplicationCreateView, ApplicationListView, ApplicationDetailView,
-    update_application_status, job_applications
+    update_application_status, bulk_update_application_status, job_applications
 )
 
 urlpatterns = [
@@ -9,6 +9,7 @@ urlpatterns = [
     path('create/', ApplicationCreateView.as_view(), name='application-create'),
     path('<int:pk>/', ApplicationDetailView.as_view(), name='application-detail'),
     path('<int:application_id>/update-status/', update_application_status, name='update-application-status'),
+    path('bulk-update-status/', bulk_update_application_status, name='bulk-update-application-status'),
     path('job/<int:job_id>/', job_applications, name='job-applications'),
 ]
 
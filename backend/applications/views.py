@@ -1,13 +1,29 @@
+from collections import defaultdict
+
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from accounts.stats import (
+    apply_deltas, counter_deltas, counters_enabled, invalidate_admin_stats, row_values,
+)
+from jobs.counters import application_deltas, apply_deltas as apply_job_counter_deltas, merge_deltas
+from notifications.models import OutboxEmail
+from notifications.outbox import build_email, enqueue_email
 from .models import Application
-from .serializers import ApplicationSerializer, ApplicationCreateSerializer
+from .serializers import ApplicationSerializer, ApplicationCreateSerializer, ApplicationSummarySerializer
 from jobs.models import Job
 
 
+def list_serializer_class(request):
+    """Slim rows for lists unless the client asks for ?view=full"""
+    if request.query_params.get('view') == 'full':
+        return ApplicationSerializer
+    return ApplicationSummarySerializer
+
+
 class ApplicationCreateView(generics.CreateAPIView):
     serializer_class = ApplicationCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -15,19 +31,15 @@ class ApplicationCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        application = serializer.save()
         
-        # Send email notification
-        try:
-            send_mail(
+        # Queue the email notification; it commits (or not) with the application
+        with transaction.atomic():
+            application = serializer.save()
+            enqueue_email(
                 subject=f'Application Submitted: {application.job.title}',
                 message=f'Your application for {application.job.title} has been submitted successfully.',
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[application.applicant.email],
-                fail_silently=True,
             )
-        except Exception as e:
-            print(f"Email sending failed: {e}")
         
         return Response(
             ApplicationSerializer(application).data,
@@ -36,20 +48,24 @@ class ApplicationCreateView(generics.CreateAPIView):
 
 
 class ApplicationListView(generics.ListAPIView):
-    serializer_class = ApplicationSerializer
+    serializer_class = ApplicationSummarySerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_serializer_class(self):
+        return list_serializer_class(self.request)
+    
     def get_queryset(self):
         user = self.request.user
+        applications = Application.objects.for_listing()
         if user.is_job_seeker:
             # Job seeker sees their own applications
-            return Application.objects.filter(applicant=user)
+            return applications.filter(applicant=user)
         elif user.is_employer:
             # Employer sees applications for their jobs
-            return Application.objects.filter(job__posted_by=user)
+            return applications.filter(job__posted_by=user)
         elif user.is_admin:
             # Admin sees all applications
-            return Application.objects.all()
+            return applications
         return Application.objects.none()
 
 
@@ -59,26 +75,35 @@ class ApplicationDetailView(generics.RetrieveAPIView):
     
     def get_queryset(self):
         user = self.request.user
+        applications = Application.objects.for_listing()
         if user.is_job_seeker:
-            return Application.objects.filter(applicant=user)
+            return applications.filter(applicant=user)
         elif user.is_employer:
-            return Application.objects.filter(job__posted_by=user)
+            return applications.filter(job__posted_by=user)
         elif user.is_admin:
-            return Application.objects.all()
+            return applications
         return Application.objects.none()
 
 
+def status_update_email(job_title, old_status, new_status, recipient):
+    return build_email(
+        subject=f'Application Status Updated: {job_title}',
+        message=f'Your application status for {job_title} has been updated from {old_status} to {new_status}.',
+        recipient=recipient,
+    )
+
+
 @api_view(['PUT'])
 @permission_classes([permissions.IsAuthenticated])
 def update_application_status(request, application_id):
     """Update application status (for employers)"""
     try:
-        application = Application.objects.get(id=application_id)
+        application = Application.objects.select_related('job', 'applicant').get(id=application_id)
     except Application.DoesNotExist:
         return Response({'error': 'Application not found'}, status=404)
     
     # Check permissions
-    if not (request.user.is_employer and application.job.posted_by == request.user) and not request.user.is_admin:
+    if not (request.user.is_employer and application.job.posted_by_id == request.user.id) and not request.user.is_admin:
         return Response(
             {'error': 'You do not have permission to update this application'},
             status=403
@@ -91,21 +116,112 @@ def update_application_status(request, application_id):
     old_status = application.status
     application.status = new_status
     application.notes = request.data.get('notes', application.notes)
-    application.save()
     
-    # Send email notification
+    # Queue the email notification; it commits (or not) with the status change
+    with transaction.atomic():
+        application.save()
+        status_update_email(application.job.title, old_status, new_status, application.applicant.email).save()
+    
+    return Response(ApplicationSerializer(application).data)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_update_application_status(request):
+    """Move many applications to one status (for employers)"""
+    if not (request.user.is_employer or request.user.is_admin):
+        return Response(
+            {'error': 'You do not have permission to update these applications'},
+            status=403
+        )
+    
+    new_status = request.data.get('status')
+    if new_status not in dict(Application.STATUS_CHOICES):
+        return Response({'error': 'Invalid status'}, status=400)
+    
+    application_ids = request.data.get('application_ids')
+    if not isinstance(application_ids, list) or not application_ids:
+        return Response({'error': 'application_ids must be a non-empty list'}, status=400)
     try:
-        send_mail(
-            subject=f'Application Status Updated: {application.job.title}',
-            message=f'Your application status for {application.job.title} has been updated from {old_status} to {new_status}.',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[application.applicant.email],
-            fail_silently=True,
+        application_ids = {int(application_id) for application_id in application_ids}
+    except (TypeError, ValueError):
+        return Response({'error': 'application_ids must be integers'}, status=400)
+    max_ids = getattr(settings, 'APPLICATION_BULK_UPDATE_MAX', 1000)
+    if len(application_ids) > max_ids:
+        return Response({'error': f'At most {max_ids} applications can be updated at once'}, status=400)
+    
+    notes = request.data.get('notes')
+    
+    with transaction.atomic():
+        # Ownership, current status and everything the emails need, in one query
+        rows = Application.objects.filter(id__in=application_ids).values(
+            'id', 'status', 'applied_date', 'job_id', 'job__posted_by_id', 'job__title', 'applicant__email'
         )
-    except Exception as e:
-        print(f"Email sending failed: {e}")
+        if connection.features.has_select_for_update:
+            # Other status changes to these rows wait for this transaction; the job and user rows stay unlocked
+            rows = rows.select_for_update(of=('self',) if connection.features.has_select_for_update_of else ())
+        rows = list(rows)
+        if request.user.is_admin:
+            allowed = {row['id'] for row in rows}
+        else:
+            allowed = {row['id'] for row in rows if row['job__posted_by_id'] == request.user.id}
+        denied = sorted(application_ids - allowed)
+        if denied:
+            # Missing and foreign ids look the same to non-admins
+            return Response({
+                'error': 'You do not have permission to update these applications',
+                'application_ids': denied,
+            }, status=404 if request.user.is_admin else 403)
+        
+        now = timezone.now()
+        by_status = defaultdict(list)
+        for row in rows:
+            if row['status'] != new_status:
+                by_status[row['status']].append(row)
+        changed = []
+        for old_status, group in by_status.items():
+            ids = [row['id'] for row in group]
+            # Only rows still in old_status move, so a concurrent change is never counted twice
+            moved = Application.objects.filter(id__in=ids, status=old_status).update(status=new_status, updated_at=now)
+            if moved < len(group):
+                ours = set(
+                    Application.objects.filter(id__in=ids, status=new_status, updated_at=now)
+                    .values_list('id', flat=True)
+                )
+                group = [row for row in group if row['id'] in ours]
+            changed.extend(group)
+        if notes is not None:
+            updated = Application.objects.filter(id__in=application_ids).update(notes=notes, updated_at=now)
+        else:
+            updated = len(changed)
+        
+        OutboxEmail.objects.bulk_create([
+            status_update_email(row['job__title'], row['status'], new_status, row['applicant__email'])
+            for row in changed
+        ])
+        
+        # update() sends no signals; keep the job and admin stat counters in step
+        job_deltas = application_deltas()
+        for row in changed:
+            merge_deltas(job_deltas, application_deltas(
+                (row['job_id'], row['status']), (row['job_id'], new_status)
+            ))
+        apply_job_counter_deltas(job_deltas)
+        if counters_enabled():
+            deltas = {}
+            for row in changed:
+                old_values = row_values(Application, row)
+                new_values = dict(old_values, status=new_status)
+                for name, delta in counter_deltas(Application, old_values, new_values).items():
+                    deltas[name] = deltas.get(name, 0) + delta
+            apply_deltas(deltas)
+        transaction.on_commit(invalidate_admin_stats)
     
-    return Response(ApplicationSerializer(application).data)
+    return Response({
+        'status': new_status,
+        'updated': updated,
+        'status_changed': len(changed),
+    })
 
 
 @api_view(['GET'])
@@ -118,13 +234,14 @@ def job_applications(request, job_id):
         return Response({'error': 'Job not found'}, status=404)
     
     # Check permissions
-    if not (request.user.is_employer and job.posted_by == request.user) and not request.user.is_admin:
+    if not (request.user.is_employer and job.posted_by_id == request.user.id) and not request.user.is_admin:
         return Response(
             {'error': 'You do not have permission to view these applications'},
             status=403
         )
     
-    applications = Application.objects.filter(job=job).order_by('-applied_date')
-    serializer = ApplicationSerializer(applications, many=True)
+    applications = Application.objects.for_listing().filter(job=job).order_by('-applied_date')
+    serializer_class = list_serializer_class(request)
+    serializer = serializer_class(applications, many=True, context={'request': request})
     return Response(serializer.data)
 
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobportal.settings')
+# Each request's ORM calls run in a fresh thread under ASGI, so per-thread
+# persistent connections would leak; share a bounded pool instead
+os.environ.setdefault('DB_CONNECTION_MODE', 'pool')
 
 application = get_asgi_application()
@@ -0,0 +1,163 @@
+"""
+Concurrent load runners for the benchmark commands.
+
+``run_scenario()`` (``manage.py benchmark_api``) gives each client a thread
+with its own test ``Client`` (and so its own database connection) sending
+requests through the full middleware and URL stack in-process, with no
+server or network in the way. Latency is wall time per request; query
+counts come from ``CaptureQueriesContext``.
+
+``drive_wsgi()`` and ``drive_asgi()`` call a real WSGI or ASGI application
+the way a server would: from a pool of threads, or from tasks on one event
+loop.
+"""
+import asyncio
+import math
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of already sorted ``samples``"""
+    if not samples:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_scenario(send, clients, requests):
+    """
+    Call ``send(client, number)`` ``requests`` times spread over ``clients``
+    threads. ``send`` returns a response; any status >= 400 is an error.
+    """
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+
+    def next_number():
+        with counter_lock:
+            return next(counter, None)
+
+    def worker():
+        client = Client()
+        latencies, queries, errors = [], [], 0
+        try:
+            while (number := next_number()) is not None:
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = send(client, number)
+                    latencies.append(time.perf_counter() - started)
+                queries.append(len(captured))
+                errors += response.status_code >= 400
+        finally:
+            connection.close()
+        return latencies, queries, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = [future.result() for future in [executor.submit(worker) for _ in range(clients)]]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(sample * 1000 for result in results for sample in result[0])
+    queries = [count for result in results for count in result[1]]
+    return {
+        'requests': len(latencies),
+        'errors': sum(result[2] for result in results),
+        'clients': clients,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'mean': round(statistics.mean(latencies), 2),
+            'max': round(latencies[-1], 2),
+        } if latencies else {},
+        'queries': {
+            'mean': round(statistics.mean(queries), 2),
+            'max': max(queries),
+        } if queries else {},
+    }
+
+
+def drive_wsgi(application, paths, headers, requests, clients):
+    """
+    ``requests`` GETs of ``paths`` (taken in turn) from ``clients`` threads;
+    returns the latencies in seconds, the error count and the elapsed time
+    """
+    factory = RequestFactory()
+    extra = {'HTTP_' + name.upper().replace('-', '_'): value for name, value in headers.items()}
+
+    def send(number):
+        environ = factory.get(paths[number % len(paths)], **extra).environ
+        statuses = []
+        started = time.perf_counter()
+        body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        b''.join(body)
+        # What the WSGI server does after each response; fires request_finished
+        body.close()
+        return time.perf_counter() - started, int(statuses[0].split()[0]) >= 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+    return [latency for latency, failed in results], sum(failed for latency, failed in results), elapsed
+
+
+async def drive_asgi(application, paths, headers, requests, clients):
+    """drive_wsgi() for an ASGI application, with ``clients`` tasks on the running loop"""
+    numbers = iter(range(requests))
+    header_list = [(b'host', b'testserver')] + [
+        (name.lower().encode(), value.encode()) for name, value in headers.items()
+    ]
+    latencies, errors = [], 0
+
+    async def send_one(number):
+        path, _, query = paths[number % len(paths)].partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+            'root_path': '', 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+            'headers': header_list,
+        }
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        statuses = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        started = time.perf_counter()
+        await application(scope, receive, send)
+        return time.perf_counter() - started, statuses[0] >= 400
+
+    async def worker():
+        nonlocal errors
+        for number in numbers:
+            latency, failed = await send_one(number)
+            latencies.append(latency)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return latencies, errors, time.perf_counter() - started
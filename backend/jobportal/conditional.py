@@ -0,0 +1,65 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 responses.
+
+Views compute validators from a cheap query on ``updated_at`` columns and
+call ``conditional_response()``, which answers 304 before any serialization
+when the client's copy is still current.
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+
+def make_etag(*parts):
+    """Strong ETag over everything the representation depends on"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def to_timestamp(*stamps):
+    """Newest of the given datetimes as a Unix timestamp, ignoring None"""
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return int(max(stamps).timestamp()) if stamps else None
+
+
+def not_modified(request, etag, modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if if_none_match.strip() == '*':
+            return True
+        return etag in [tag.strip() for tag in if_none_match.split(',')]
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return bool(modified and if_modified_since and modified <= if_modified_since)
+
+
+def validator_headers(etag, modified):
+    headers = {'ETag': etag}
+    if modified:
+        headers['Last-Modified'] = http_date(modified)
+    return headers
+
+
+def set_validators(response, etag, modified, vary=('Authorization',)):
+    for header, value in validator_headers(etag, modified).items():
+        response[header] = value
+    patch_vary_headers(response, vary)
+    return response
+
+
+def conditional_response(request, etag, modified, build):
+    """
+    304 if the client already has this version, otherwise ``build()`` with
+    the validators attached. ``etag`` None (e.g. the object is missing)
+    skips the check.
+    """
+    if request.method not in ('GET', 'HEAD') or etag is None:
+        return build()
+    if not_modified(request, etag, modified):
+        return set_validators(HttpResponseNotModified(), etag, modified)
+    response = build()
+    if response.status_code == 200:
+        set_validators(response, etag, modified)
+    return response
@@ -0,0 +1,41 @@
+"""
+Database connection modes, picked with ``DB_CONNECTION_MODE``:
+
+- ``'none'``: a new connection for every request (Django's default).
+- ``'persistent'``: each thread keeps its connection for ``CONN_MAX_AGE``
+  seconds and checks it before reuse (``CONN_HEALTH_CHECKS``).
+- ``'pool'``: the backends in ``jobportal.db.backends`` hand out
+  connections from a bounded, process-wide pool (``jobportal.db.pool``).
+  Django still closes the connection at the end of every request, but the
+  close returns it to the pool. This is the mode for ASGI, where each
+  request runs its ORM calls in a fresh thread and persistent per-thread
+  connections would leak.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+CONNECTION_MODES = ('none', 'persistent', 'pool')
+
+
+def check_mode(mode):
+    if mode not in CONNECTION_MODES:
+        raise ImproperlyConfigured(
+            f'DB_CONNECTION_MODE must be one of {", ".join(CONNECTION_MODES)}; got {mode!r}'
+        )
+    return mode
+
+
+def database_engine(vendor, mode):
+    """ENGINE for a 'mysql' or 'sqlite3' database in the given mode"""
+    if check_mode(mode) == 'pool':
+        return f'jobportal.db.backends.{vendor}'
+    return f'django.db.backends.{vendor}'
+
+
+def connection_settings(mode, max_age, pool):
+    """The DATABASES entry keys that depend on the mode"""
+    persistent = check_mode(mode) == 'persistent'
+    return {
+        'CONN_MAX_AGE': max_age if persistent else 0,
+        'CONN_HEALTH_CHECKS': persistent,
+        'POOL': pool,
+    }
@@ -0,0 +1,7 @@
+from django.db.backends.mysql import base
+
+from jobportal.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
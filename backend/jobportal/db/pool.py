@@ -0,0 +1,138 @@
+"""
+A bounded pool of DB-API connections shared by every thread of a process.
+
+At most ``SIZE`` connections are checked out at once; further requests wait
+up to ``TIMEOUT`` seconds and then fail with ``OperationalError``. Returned
+connections are kept idle and handed out last-in first-out. A connection
+idle for longer than ``CHECK_AFTER`` seconds is pinged before reuse, and one
+older than ``RECYCLE`` seconds is closed instead of being reused.
+"""
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+
+DEFAULTS = {'SIZE': 10, 'TIMEOUT': 10, 'RECYCLE': 3600, 'CHECK_AFTER': 30}
+
+
+class ConnectionPool:
+    def __init__(self, alias, options=None):
+        options = {**DEFAULTS, **(options or {})}
+        self.alias = alias
+        self.size = options['SIZE']
+        self.timeout = options['TIMEOUT']
+        self.recycle = options['RECYCLE']
+        self.check_after = options['CHECK_AFTER']
+        self.slots = threading.BoundedSemaphore(self.size)
+        self.lock = threading.Lock()
+        self.idle = deque()
+        self.opened_at = {}
+        self.in_use = 0
+        self.opened = 0
+
+    def acquire(self, create, usable):
+        """A pooled connection, or a new one from ``create()``; ``usable(conn)`` checks stale ones"""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f'No database connection free in the {self.alias!r} pool after {self.timeout}s '
+                f'({self.size} in use)'
+            )
+        try:
+            connection = self.take_idle(usable)
+            if connection is None:
+                connection = create()
+                with self.lock:
+                    self.opened_at[id(connection)] = time.monotonic()
+                    self.opened += 1
+        except BaseException:
+            self.slots.release()
+            raise
+        with self.lock:
+            self.in_use += 1
+        return connection
+
+    def take_idle(self, usable):
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                connection, returned_at = self.idle.pop()
+            now = time.monotonic()
+            if now - self.opened_at.get(id(connection), now) > self.recycle:
+                self.discard(connection)
+            elif now - returned_at > self.check_after and not usable(connection):
+                self.discard(connection)
+            else:
+                return connection
+
+    def release(self, connection, reusable=True):
+        try:
+            if reusable:
+                with self.lock:
+                    self.idle.append((connection, time.monotonic()))
+            else:
+                self.discard(connection)
+        finally:
+            with self.lock:
+                self.in_use -= 1
+            self.slots.release()
+
+    def discard(self, connection):
+        with self.lock:
+            self.opened_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self.lock:
+            idle, self.idle = list(self.idle), deque()
+        for connection, returned_at in idle:
+            self.discard(connection)
+
+    def stats(self):
+        with self.lock:
+            return {'size': self.size, 'in_use': self.in_use, 'idle': len(self.idle), 'opened': self.opened}
+
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(alias, options=None):
+    pool = pools.get(alias)
+    if pool is None:
+        with pools_lock:
+            pool = pools.get(alias)
+            if pool is None:
+                pool = pools[alias] = ConnectionPool(alias, options)
+    return pool
+
+
+class PooledDatabaseWrapperMixin:
+    """Mixed into a backend's DatabaseWrapper: connect takes from the pool, close gives back"""
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict.get('POOL'))
+
+    def get_new_connection(self, conn_params):
+        create = super().get_new_connection
+        return self.pool.acquire(lambda: create(conn_params), self.raw_connection_usable)
+
+    def raw_connection_usable(self, connection):
+        current, self.connection = self.connection, connection
+        try:
+            return self.is_usable()
+        finally:
+            self.connection = current
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # A connection mid-transaction or after a database error is not reused
+        reusable = not self.errors_occurred and not self.in_atomic_block and self.autocommit
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, reusable=reusable)
@@ -0,0 +1,277 @@
+"""
+Per-request instrumentation: SQL query count and time, serializer time and
+response size.
+
+``RequestMetricsMiddleware`` is active when ``REQUEST_METRICS`` is on. For
+views in ``REQUEST_METRICS_APPS`` it adds a ``Server-Timing`` header and
+records the request in ``registry``, which keeps rolling histograms per
+route for ``/api/admin/metrics/``. Queries are counted with database
+``execute_wrapper``s. Serializer time is the time spent producing the
+top-level ``serializer.data``, which includes any queries run on the way.
+The same SQL issued ``REQUEST_METRICS_DUPLICATE_THRESHOLD`` times in one
+request is logged as a likely N+1.
+
+Figures are per worker process. Streamed responses are measured up to the
+point their body starts streaming.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLICES = 10
+
+current = ContextVar('request_metrics', default=None)
+
+
+def metrics_enabled():
+    return getattr(settings, 'REQUEST_METRICS', False)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = Counter()
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+def timed_data(fget):
+    def data(serializer):
+        metrics = current.get()
+        # Only the outermost .data is timed; nested serializers are part of it
+        if metrics is None or metrics.serializer_depth:
+            return fget(serializer)
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return fget(serializer)
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+            metrics.serializer_depth -= 1
+    data.instrumented = True
+    return data
+
+
+def instrument_serializers():
+    """Time ``BaseSerializer.data``; Serializer and ListSerializer reach it through super()"""
+    if not getattr(BaseSerializer.data.fget, 'instrumented', False):
+        BaseSerializer.data = property(timed_data(BaseSerializer.data.fget))
+
+
+def bucket_index(buckets, value):
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets)
+
+
+def histogram_percentile(buckets, counts, p):
+    """Upper bound of the bucket holding the ``p``th percentile; None past the last bound"""
+    total = sum(counts)
+    if not total:
+        return None
+    threshold, running = total * p / 100, 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= threshold:
+            return buckets[index] if index < len(buckets) else None
+    return None
+
+
+def histogram(buckets, counts):
+    labels = [f'<={bound}' for bound in buckets] + [f'>{buckets[-1]}']
+    return dict(zip(labels, counts))
+
+
+class RouteWindow:
+    """One time slice of samples for one route"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.queries = [0] * (len(QUERY_BUCKETS) + 1)
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.query_count = 0
+        self.max_queries = 0
+        self.response_bytes = 0
+        self.duplicate_requests = 0
+
+    def add(self, sample):
+        self.requests += 1
+        self.errors += sample['status'] >= 500
+        self.latency[bucket_index(LATENCY_BUCKETS_MS, sample['total_ms'])] += 1
+        self.queries[bucket_index(QUERY_BUCKETS, sample['queries'])] += 1
+        self.total_ms += sample['total_ms']
+        self.db_ms += sample['db_ms']
+        self.serializer_ms += sample['serializer_ms']
+        self.query_count += sample['queries']
+        self.max_queries = max(self.max_queries, sample['queries'])
+        self.response_bytes += sample['response_bytes'] or 0
+        self.duplicate_requests += bool(sample['duplicates'])
+
+    def merge(self, other):
+        for name in ('requests', 'errors', 'total_ms', 'db_ms', 'serializer_ms', 'query_count',
+                     'response_bytes', 'duplicate_requests'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_queries = max(self.max_queries, other.max_queries)
+        self.latency = [a + b for a, b in zip(self.latency, other.latency)]
+        self.queries = [a + b for a, b in zip(self.queries, other.queries)]
+
+
+class MetricsRegistry:
+    """
+    Rolling per-route histograms over the last ``REQUEST_METRICS_WINDOW_SECONDS``.
+
+    The window is split into ``SLICES`` slices; samples go into the current
+    one and slices older than the window are dropped.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slices = deque()
+
+    def slice_seconds(self):
+        return max(1, getattr(settings, 'REQUEST_METRICS_WINDOW_SECONDS', 300) // SLICES)
+
+    def expire(self, now):
+        oldest = now // self.slice_seconds() - SLICES + 1
+        while self.slices and self.slices[0][0] < oldest:
+            self.slices.popleft()
+
+    def record(self, route, sample):
+        now = int(time.time())
+        key = now // self.slice_seconds()
+        with self.lock:
+            if not self.slices or self.slices[-1][0] != key:
+                self.slices.append((key, {}))
+                self.expire(now)
+            routes = self.slices[-1][1]
+            routes.setdefault(route, RouteWindow()).add(sample)
+
+    def snapshot(self):
+        with self.lock:
+            self.expire(int(time.time()))
+            merged = {}
+            for key, routes in self.slices:
+                for route, window in routes.items():
+                    merged.setdefault(route, RouteWindow()).merge(window)
+        return {route: self.summary(window) for route, window in sorted(merged.items())}
+
+    def summary(self, window):
+        requests = window.requests or 1
+        return {
+            'requests': window.requests,
+            'errors': window.errors,
+            'latency_ms': {
+                'mean': round(window.total_ms / requests, 2),
+                'p50': histogram_percentile(LATENCY_BUCKETS_MS, window.latency, 50),
+                'p95': histogram_percentile(LATENCY_BUCKETS_MS, window.latency, 95),
+                'p99': histogram_percentile(LATENCY_BUCKETS_MS, window.latency, 99),
+                'histogram': histogram(LATENCY_BUCKETS_MS, window.latency),
+            },
+            'queries': {
+                'mean': round(window.query_count / requests, 2),
+                'max': window.max_queries,
+                'histogram': histogram(QUERY_BUCKETS, window.queries),
+            },
+            'db_ms_mean': round(window.db_ms / requests, 2),
+            'serializer_ms_mean': round(window.serializer_ms / requests, 2),
+            'response_bytes_mean': round(window.response_bytes / requests),
+            'duplicate_query_requests': window.duplicate_requests,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.slices.clear()
+
+
+registry = MetricsRegistry()
+
+
+def route_name(request):
+    """``'GET api/jobs/<int:pk>/'`` for views in the instrumented apps, else None"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    apps = getattr(settings, 'REQUEST_METRICS_APPS', ('jobs', 'applications', 'accounts'))
+    if view.__module__.split('.')[0] not in apps:
+        return None
+    return f'{request.method} {match.route}'
+
+
+def server_timing(metrics, total_ms):
+    return ', '.join([
+        f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"',
+        f'serialize;dur={metrics.serializer_time * 1000:.2f}',
+        f'total;dur={total_ms:.2f}',
+    ])
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute))
+                response = self.get_response(request)
+        finally:
+            current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        route = route_name(request)
+        if route is None:
+            return response
+        response['Server-Timing'] = server_timing(metrics, total_ms)
+
+        threshold = getattr(settings, 'REQUEST_METRICS_DUPLICATE_THRESHOLD', 3)
+        duplicates = metrics.duplicates(threshold)
+        for sql, count in duplicates:
+            logger.warning('Possible N+1 on %s: query ran %d times: %s', route, count, sql)
+        registry.record(route, {
+            'status': response.status_code,
+            'total_ms': total_ms,
+            'db_ms': metrics.db_time * 1000,
+            'serializer_ms': metrics.serializer_time * 1000,
+            'queries': metrics.queries,
+            'response_bytes': None if response.streaming else len(response.content),
+            'duplicates': duplicates,
+        })
+        return response
@@ -0,0 +1,219 @@
+"""
+Keyset (seek) pagination shared by the API list endpoints.
+"""
+import asyncio
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+
+from django.core.paginator import Page
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on a descending (timestamp, id) key instead of OFFSET.
+
+    Each page is a single index range scan no matter how deep the client
+    has paged. Querysets ordered by anything other than the key (e.g. a
+    client-chosen ``ordering`` or relevance) fall back to page numbers.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    fallback_class = PageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+
+        if not self.is_keyset_ordering(queryset):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        queryset, cursor = self.seek(queryset, request)
+        return self.build_page(list(queryset), cursor)
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset() for async views; the queryset must be in keyset order"""
+        self.request = request
+        self.fallback = None
+        queryset, cursor = self.seek(queryset, request)
+        return self.build_page([obj async for obj in queryset.aiterator()], cursor)
+
+    def read_cursor(self, request):
+        """
+        Page size and decoded ``(value, id, reverse)`` cursor, for callers that
+        seek an in-memory index in key order themselves and hand the first
+        ``page_size + 1`` objects past the cursor to build_page()
+        """
+        self.request = request
+        self.fallback = None
+        self.page_size = self.get_page_size(request)
+        return self.decode_cursor(request)
+
+    def seek(self, queryset, request):
+        """The query for the requested page, plus the decoded cursor"""
+        field = self.ordering[0].lstrip('-')
+        cursor = self.read_cursor(request)
+
+        if cursor is None:
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            value, pk, reverse = cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk})
+                ).order_by(field, 'id')
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk})
+                ).order_by(*self.ordering)
+
+        # Fetch one extra row to find out whether there is a further page
+        return queryset[:self.page_size + 1], cursor
+
+    def build_page(self, results, cursor):
+        reverse = cursor is not None and cursor[2]
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if results:
+            first, last = results[0], results[-1]
+            if reverse:
+                self.next_cursor = self.encode_cursor(last, reverse=False)
+                if has_more:
+                    self.previous_cursor = self.encode_cursor(first, reverse=True)
+            else:
+                if has_more:
+                    self.next_cursor = self.encode_cursor(last, reverse=False)
+                if cursor is not None:
+                    self.previous_cursor = self.encode_cursor(first, reverse=True)
+
+        return results
+
+    def is_keyset_ordering(self, queryset):
+        order_by = tuple(queryset.query.order_by)
+        return order_by in ((), self.ordering[:1], self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            value = parse_datetime(tokens['v'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, reverse
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.ordering[0].lstrip('-'))
+        tokens = {'v': value.isoformat(), 'i': obj.pk}
+        if reverse:
+            tokens['r'] = 1
+        querystring = parse.urlencode(tokens, doseq=True)
+        return b64encode(querystring.encode('ascii')).decode('ascii')
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self.get_link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self.get_link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """PageNumberPagination for async views; the total count is queried alongside the page rows"""
+
+    async def apaginate_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Not get_page_number(), which counts the rows to resolve 'last'
+        page_number = request.query_params.get(self.page_query_param) or 1
+
+        if page_number in self.last_page_strings:
+            # The last page's offset depends on the count
+            paginator.count = await queryset.acount()
+            number = paginator.num_pages
+            results = await self.fetch(queryset, number, page_size)
+        else:
+            try:
+                number = int(page_number)
+            except (TypeError, ValueError):
+                raise self.invalid_page(page_number, _('That page number is not an integer'))
+            if number < 1:
+                raise self.invalid_page(page_number, _('That page number is less than 1'))
+            # Setting the cached_property spares Paginator its own count()
+            paginator.count, results = await asyncio.gather(
+                queryset.acount(), self.fetch(queryset, number, page_size)
+            )
+        if not results and number > 1:
+            raise self.invalid_page(page_number, _('That page contains no results'))
+
+        self.page = Page(results, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return results
+
+    async def fetch(self, queryset, number, page_size):
+        bottom = (number - 1) * page_size
+        return [obj async for obj in queryset[bottom:bottom + page_size].aiterator()]
+
+    def invalid_page(self, page_number, message):
+        return NotFound(self.invalid_page_message.format(page_number=page_number, message=message))
@@ -0,0 +1,272 @@
+"""
+In-process metrics in the Prometheus text exposition format, served at
+``/metrics``.
+
+The hot path takes no locks. Each thread records into its own
+``ThreadStats``, and a lock is taken only when a thread registers itself.
+A scrape copies and sums every thread's figures. The stats of finished
+threads are folded into a retired total, so counters never go backwards.
+
+Series:
+- request counts and latency histograms per URL name, method and status
+- requests in flight
+- queries run, database connections opened and currently held, and pool usage
+- cache lookups by cache and result, with a derived hit ratio
+- email outbox depth by status
+
+Each worker process keeps its own figures, as with the search index; scrape
+every worker or run a single one behind the scraper.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from jobportal.db.pool import pools
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def prometheus_enabled():
+    return getattr(settings, 'PROMETHEUS_METRICS', False)
+
+
+class ThreadStats:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.requests = defaultdict(int)
+        # (route, method) -> per-bucket counts (not cumulative), then sum and count
+        self.latency = {}
+        self.in_flight = 0
+        self.queries = defaultdict(int)
+        self.connections_opened = defaultdict(int)
+        self.connections_held = {}
+        self.cache = defaultdict(int)
+
+    def observe(self, route, method, status, seconds):
+        self.requests[(route, method, str(status))] += 1
+        series = self.latency.get((route, method))
+        if series is None:
+            series = self.latency[(route, method)] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0]
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                series[index] += 1
+                break
+        else:
+            series[len(LATENCY_BUCKETS)] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+
+class Registry:
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.retired = ThreadStats()
+
+    def stats(self):
+        """This thread's stats, registering them on first use"""
+        stats = getattr(self.local, 'stats', None)
+        if stats is None:
+            stats = self.local.stats = ThreadStats()
+            with self.lock:
+                # With a thread per request, waiting for a scrape would let this grow unbounded
+                self.retire_finished()
+                self.threads.append(stats)
+        return stats
+
+    def retire_finished(self):
+        """Fold the stats of finished threads into ``retired``; call with the lock held"""
+        live = []
+        for stats in self.threads:
+            if stats.thread.is_alive():
+                live.append(stats)
+            else:
+                self.merge(self.retired, stats, gauges=False)
+        self.threads = live
+
+    def collect(self):
+        """Totals over every thread; finished threads are folded into ``retired``"""
+        with self.lock:
+            self.retire_finished()
+            total = ThreadStats()
+            self.merge(total, self.retired, gauges=False)
+            for stats in self.threads:
+                self.merge(total, stats, gauges=True)
+        return total
+
+    def merge(self, target, source, gauges):
+        # dict.copy() runs under the GIL, so a writer cannot change a dict mid-copy
+        for name in ('requests', 'queries', 'connections_opened', 'cache'):
+            counts = getattr(target, name)
+            for key, value in getattr(source, name).copy().items():
+                counts[key] += value
+        for key, series in source.latency.copy().items():
+            series = list(series)
+            current = target.latency.get(key)
+            target.latency[key] = series if current is None else [a + b for a, b in zip(current, series)]
+        if gauges:
+            target.in_flight += source.in_flight
+            for alias, held in source.connections_held.copy().items():
+                target.connections_held[alias] = target.connections_held.get(alias, 0) + held
+
+    def reset(self):
+        with self.lock:
+            self.threads = []
+            self.retired = ThreadStats()
+            self.local = threading.local()
+
+
+registry = Registry()
+
+
+def record_cache(name, hit):
+    """Count a lookup in one of the application caches"""
+    if not prometheus_enabled():
+        return
+    registry.stats().cache[(name, 'hit' if hit else 'miss')] += 1
+
+
+def count_connection(sender, connection, **kwargs):
+    # connection_created fires on every pool checkout; the pool counts real connects
+    if connection.alias in pools:
+        return
+    registry.stats().connections_opened[connection.alias] += 1
+
+
+def count_query(execute, sql, params, many, context):
+    registry.stats().queries[context['connection'].alias] += 1
+    return execute(sql, params, many, context)
+
+
+class PrometheusMiddleware:
+    def __init__(self, get_response):
+        if not prometheus_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        connection_created.connect(count_connection, dispatch_uid='prometheus_connections')
+
+    def __call__(self, request):
+        stats = registry.stats()
+        stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_query))
+                response = self.get_response(request)
+        finally:
+            stats.in_flight -= 1
+        match = getattr(request, 'resolver_match', None)
+        route = match.url_name if match is not None and match.url_name else 'unmatched'
+        stats.observe(route, request.method, response.status_code, time.perf_counter() - started)
+        for connection in connections.all():
+            stats.connections_held[connection.alias] = int(connection.connection is not None)
+        return response
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def labels(**values):
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in values.items()) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def family(lines, name, kind, help_text, samples):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {kind}')
+    for suffix, label_text, value in samples:
+        lines.append(f'{name}{suffix}{label_text} {format_value(value)}')
+
+
+def outbox_depth():
+    from notifications.models import OutboxEmail
+
+    depth = {status: 0 for status, label in OutboxEmail.STATUS_CHOICES}
+    for row in OutboxEmail.objects.exclude(status='sent').values('status').annotate(emails=Count('id')):
+        depth[row['status']] = row['emails']
+    del depth['sent']
+    return depth
+
+
+def render():
+    total = registry.collect()
+    lines = []
+
+    family(lines, 'jobportal_http_requests_total', 'counter', 'HTTP requests by URL name, method and status.', [
+        ('', labels(route=route, method=method, status=status), count)
+        for (route, method, status), count in sorted(total.requests.items())
+    ])
+
+    samples = []
+    for (route, method), series in sorted(total.latency.items()):
+        running = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), series):
+            running += count
+            samples.append(('_bucket', labels(route=route, method=method, le=bound), running))
+        samples.append(('_sum', labels(route=route, method=method), series[-2]))
+        samples.append(('_count', labels(route=route, method=method), series[-1]))
+    family(lines, 'jobportal_http_request_duration_seconds', 'histogram',
+           'Request latency by URL name and method.', samples)
+
+    family(lines, 'jobportal_http_requests_in_flight', 'gauge', 'Requests being handled.', [
+        ('', '', total.in_flight),
+    ])
+    family(lines, 'jobportal_db_queries_total', 'counter', 'SQL queries run by requests.', [
+        ('', labels(alias=alias), count) for alias, count in sorted(total.queries.items())
+    ])
+    opened = dict(total.connections_opened)
+    for alias, pool in pools.items():
+        opened[alias] = opened.get(alias, 0) + pool.stats()['opened']
+    family(lines, 'jobportal_db_connections_opened_total', 'counter', 'Database connections opened.', [
+        ('', labels(alias=alias), count) for alias, count in sorted(opened.items())
+    ])
+    family(lines, 'jobportal_db_connections_held', 'gauge',
+           'Request threads holding an open database connection.', [
+               ('', labels(alias=alias), count) for alias, count in sorted(total.connections_held.items())
+           ])
+
+    family(lines, 'jobportal_db_pool_connections', 'gauge',
+           'Pooled connections by state (DB_CONNECTION_MODE=pool).', [
+               ('', labels(alias=alias, state=state), pool.stats()[state])
+               for alias, pool in sorted(pools.items()) for state in ('in_use', 'idle')
+           ])
+
+    family(lines, 'jobportal_cache_requests_total', 'counter', 'Application cache lookups by result.', [
+        ('', labels(cache=cache, result=result), count) for (cache, result), count in sorted(total.cache.items())
+    ])
+    ratios = []
+    for cache in sorted({cache for cache, result in total.cache}):
+        hits, misses = total.cache[(cache, 'hit')], total.cache[(cache, 'miss')]
+        ratios.append(('', labels(cache=cache), round(hits / (hits + misses), 4)))
+    family(lines, 'jobportal_cache_hit_ratio', 'gauge', 'Share of cache lookups that were hits.', ratios)
+
+    family(lines, 'jobportal_email_outbox_depth', 'gauge', 'Unsent outbox emails by status.', [
+        ('', labels(status=status), count) for status, count in outbox_depth().items()
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint; PROMETHEUS_METRICS_TOKEN, when set, is required as a bearer token"""
+    if not prometheus_enabled():
+        return HttpResponse(status=404)
+    token = getattr(settings, 'PROMETHEUS_METRICS_TOKEN', '')
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
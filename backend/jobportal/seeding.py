@@ -0,0 +1,124 @@
+"""
+Synthetic data for benchmarks and load testing (``manage.py seed``).
+
+``jobportal.synthetic`` generates the rows in a multiprocessing pool, one
+chunk per task. This process inserts each chunk with ``bulk_create`` in its
+own transaction, in chunk order, so on an empty database a given ``seed``
+always produces the same rows and ids. Every user shares one precomputed
+password hash. Bulk inserts send no signals, so the per-job application
+counters, admin stat counters and response cache are refreshed at the end.
+"""
+import multiprocessing
+import os
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import EmployerProfile, JobSeekerProfile, User
+from accounts.stats import counters_enabled, invalidate_admin_stats, rebuild_counters
+from applications.models import Application
+from jobs.bulk import chunked
+from jobs.cache import bump_version
+from jobs.counters import backfill_counters
+from jobs.models import Job, SavedJob
+from . import synthetic
+
+SCALES = {
+    'small': {'users': 10_000, 'jobs': 10_000, 'applications': 50_000, 'saved_jobs': 20_000},
+    'medium': {'users': 50_000, 'jobs': 100_000, 'applications': 500_000, 'saved_jobs': 200_000},
+    'large': {'users': 200_000, 'jobs': 1_000_000, 'applications': 2_000_000, 'saved_jobs': 500_000},
+}
+
+
+def tasks(kind, count, per_chunk):
+    per_chunk = max(1, per_chunk)
+    return [
+        (kind, number, start, min(start + per_chunk, count))
+        for number, start in enumerate(range(0, count, per_chunk))
+    ]
+
+
+def generated(task_list, context, workers):
+    """Rows for each task, in task order"""
+    if workers <= 1:
+        synthetic.init_worker(context)
+        yield from map(synthetic.generate, task_list)
+        return
+    with multiprocessing.Pool(workers, synthetic.init_worker, (context,)) as pool:
+        # A few tasks per worker at a time, so finished chunks cannot pile up
+        # in memory while inserts are the bottleneck
+        for window in chunked(task_list, workers * 4):
+            yield from pool.imap(synthetic.generate, window)
+
+
+def insert(model, task_list, context, workers, log):
+    started = time.perf_counter()
+    total = 0
+    for rows in generated(task_list, context, workers):
+        with transaction.atomic():
+            model.objects.bulk_create([model(**row) for row in rows])
+        total += len(rows)
+    elapsed = time.perf_counter() - started
+    log(f'  {total} {model._meta.verbose_name_plural} in {elapsed:.1f}s ({total / (elapsed or 1):,.0f} rows/s)')
+    return total
+
+
+def ensure_admin(password_hash):
+    if not User.objects.filter(email=synthetic.ADMIN_EMAIL).exists():
+        User.objects.create(
+            email=synthetic.ADMIN_EMAIL, username='bench-admin', password=password_hash,
+            role='admin', is_staff=True, is_superuser=True,
+        )
+
+
+def seed_dataset(counts, seed=0, batch_size=5000, workers=None, log=print):
+    """
+    Insert ``counts['users']`` users (a tenth of them employers, each with a
+    profile) and the given numbers of ``jobs``, ``applications`` and
+    ``saved_jobs``. Returns the rows created per model.
+    """
+    workers = workers or os.cpu_count() or 1
+    users = counts.get('users', 0)
+    context = {
+        'seed': seed,
+        'password_hash': make_password(synthetic.SEED_PASSWORD),
+        'employers': max(1, users // 10),
+        # Numbering continues after earlier runs so emails stay unique
+        'user_offset': User.objects.filter(email__endswith=f'@{synthetic.EMAIL_DOMAIN}').count(),
+    }
+    ensure_admin(context['password_hash'])
+    created = {}
+
+    first_user = User.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    created['users'] = insert(User, tasks('users', users, batch_size), context, workers, log)
+    new_users = User.objects.filter(id__gt=first_user).order_by('id')
+    context['employer_ids'] = list(new_users.filter(role='employer').values_list('id', flat=True))
+    context['seeker_ids'] = list(new_users.filter(role='job_seeker').values_list('id', flat=True))
+    insert(EmployerProfile, tasks('employer_profiles', len(context['employer_ids']), batch_size), context, workers, log)
+    insert(JobSeekerProfile, tasks('seeker_profiles', len(context['seeker_ids']), batch_size), context, workers, log)
+    if not context['employer_ids']:
+        return created
+
+    first_job = Job.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    created['jobs'] = insert(Job, tasks('jobs', counts.get('jobs', 0), batch_size), context, workers, log)
+    context['job_ids'] = list(
+        Job.objects.filter(id__gt=first_job, status='active').order_by('id').values_list('id', flat=True)
+    )
+
+    seekers = len(context['seeker_ids'])
+    if context['job_ids'] and seekers:
+        # Both are generated per seeker, which keeps (job, seeker) pairs unique across chunks
+        for kind, model in (('applications', Application), ('saved_jobs', SavedJob)):
+            context[kind] = counts.get(kind, 0)
+            per_seeker = max(1, context[kind] // seekers)
+            created[kind] = insert(model, tasks(kind, seekers, batch_size // per_seeker), context, workers, log)
+
+    started = time.perf_counter()
+    backfill_counters()
+    if counters_enabled():
+        rebuild_counters()
+    invalidate_admin_stats()
+    bump_version()
+    log(f'  Counters rebuilt in {time.perf_counter() - started:.1f}s')
+    return created
@@ -15,6 +15,9 @@ from datetime import timedelta
 import os
 from decouple import config
 
+from accounts.hashers import password_hashers
+from jobportal.db import connection_settings, database_engine
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +48,7 @@ INSTALLED_APPS = [
     # Third party apps
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
     "django_filters",
     "allauth",
@@ -57,9 +61,13 @@ INSTALLED_APPS = [
     "accounts",
     "jobs",
     "applications",
+    "notifications",
 ]
 
 MIDDLEWARE = [
+    # Inactive unless PROMETHEUS_METRICS / REQUEST_METRICS are on
+    "jobportal.prometheus.PrometheusMiddleware",
+    "jobportal.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -95,10 +103,28 @@ WSGI_APPLICATION = "jobportal.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Database connections. DB_CONNECTION_MODE is 'none' (a new connection per
+# request), 'persistent' (each thread reuses its connection for
+# DB_CONN_MAX_AGE seconds, health-checked before reuse) or 'pool' (a bounded
+# pool per process, see jobportal.db). ASGI defaults to 'pool'.
+DB_CONNECTION_MODE = config('DB_CONNECTION_MODE', default='persistent')
+DB_CONNECTION_SETTINGS = connection_settings(
+    DB_CONNECTION_MODE,
+    max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+    pool={
+        # Connections checked out at once, and how long a request waits for one
+        'SIZE': config('DB_POOL_SIZE', default=10, cast=int),
+        'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        # Close connections older than this; ping idle ones before reuse
+        'RECYCLE': config('DB_POOL_RECYCLE', default=3600, cast=int),
+        'CHECK_AFTER': config('DB_POOL_CHECK_AFTER', default=30, cast=int),
+    },
+)
+
 # MySQL Database Configuration
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": database_engine("mysql", DB_CONNECTION_MODE),
         "NAME": config('DB_NAME', default='jobportal_db'),
         "USER": config('DB_USER', default='root'),
         "PASSWORD": config('DB_PASSWORD'),
@@ -107,6 +133,7 @@ DATABASES = {
         "OPTIONS": {
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
         },
+        **DB_CONNECTION_SETTINGS,
     }
 }
 
@@ -119,6 +146,92 @@ DATABASES = {
 # }
 
 
+# Job search backend: 'auto' picks MySQL FULLTEXT or SQLite FTS5 from the
+# database vendor, 'icontains' forces substring scans and 'memory' uses the
+# per-worker inverted index in jobs.search_index.
+JOB_SEARCH_BACKEND = config('JOB_SEARCH_BACKEND', default='auto')
+
+# InnoDB ignores shorter words (innodb_ft_min_token_size)
+JOB_SEARCH_MYSQL_MIN_TOKEN_SIZE = config('JOB_SEARCH_MYSQL_MIN_TOKEN_SIZE', default=3, cast=int)
+
+# In-memory index: snapshot written by `manage.py rebuild_search_index`, how
+# often workers pick up writes made elsewhere, and the cap on ranked hits.
+JOB_SEARCH_INDEX_PATH = config('JOB_SEARCH_INDEX_PATH', default=str(BASE_DIR / 'search_index.pickle'))
+JOB_SEARCH_INDEX_REFRESH_SECONDS = config('JOB_SEARCH_INDEX_REFRESH_SECONDS', default=60, cast=int)
+JOB_SEARCH_INDEX_MAX_RESULTS = config('JOB_SEARCH_INDEX_MAX_RESULTS', default=1000, cast=int)
+
+# Per-worker bitmap index for the job_search filters (jobs.filter_index);
+# off by default, when filters run as SQL
+JOB_FILTER_INDEX = config('JOB_FILTER_INDEX', default=False, cast=bool)
+JOB_FILTER_INDEX_REFRESH_SECONDS = config('JOB_FILTER_INDEX_REFRESH_SECONDS', default=60, cast=int)
+
+
+# Caches. RESPONSE_CACHE_BACKEND picks the store for anonymous job responses:
+# 'locmem' (per worker), 'file' (LOCATION is a directory) or 'redis'
+# (LOCATION is a redis:// URL; any Redis-compatible server works).
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+RESPONSE_CACHE_BACKEND = config('RESPONSE_CACHE_BACKEND', default='locmem')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': CACHE_BACKENDS.get(RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_BACKEND),
+        'LOCATION': config('RESPONSE_CACHE_LOCATION', default='job-responses'),
+    },
+}
+
+# Anonymous job list/detail/search responses; 0 disables the cache
+JOB_RESPONSE_CACHE_ALIAS = 'responses'
+JOB_RESPONSE_CACHE_TTL = config('JOB_RESPONSE_CACHE_TTL', default=300, cast=int)
+
+# Search facet counts (?facets=true): cache lifetime and values listed per facet
+JOB_FACETS_CACHE_TTL = config('JOB_FACETS_CACHE_TTL', default=300, cast=int)
+JOB_FACETS_LIMIT = config('JOB_FACETS_LIMIT', default=50, cast=int)
+
+
+# Bulk job import: rows validated and inserted per transaction, and how many
+# row errors a response lists
+JOB_IMPORT_BATCH_SIZE = config('JOB_IMPORT_BATCH_SIZE', default=500, cast=int)
+JOB_IMPORT_MAX_ERRORS = config('JOB_IMPORT_MAX_ERRORS', default=100, cast=int)
+
+
+# Largest batch accepted by applications/bulk-update-status/
+APPLICATION_BULK_UPDATE_MAX = config('APPLICATION_BULK_UPDATE_MAX', default=1000, cast=int)
+
+
+# Admin dashboard statistics: 'aggregate' runs one conditional COUNT query per
+# table, 'counters' reads rows maintained by model signals (run
+# `manage.py rebuild_stat_counters` after switching to it).
+ADMIN_STATS_SOURCE = config('ADMIN_STATS_SOURCE', default='aggregate')
+ADMIN_STATS_CACHE_TTL = config('ADMIN_STATS_CACHE_TTL', default=60, cast=int)
+
+# Authenticated requests take the token's user from a per-process LRU
+# (accounts.authentication). A save drops the entry in the saving worker at
+# once; other workers keep serving it for up to AUTH_USER_CACHE_TTL seconds.
+# 0 turns the cache off.
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=30, cast=int)
+AUTH_USER_CACHE_SIZE = config('AUTH_USER_CACHE_SIZE', default=10000, cast=int)
+
+# Request instrumentation (jobportal.metrics): query count, DB and serializer
+# time as Server-Timing headers, rolling per-route histograms at
+# /api/admin/metrics/ and a log warning when one SQL statement repeats
+# REQUEST_METRICS_DUPLICATE_THRESHOLD times in a request.
+REQUEST_METRICS = config('REQUEST_METRICS', default=False, cast=bool)
+REQUEST_METRICS_APPS = ['jobs', 'applications', 'accounts']
+REQUEST_METRICS_WINDOW_SECONDS = config('REQUEST_METRICS_WINDOW_SECONDS', default=300, cast=int)
+REQUEST_METRICS_DUPLICATE_THRESHOLD = config('REQUEST_METRICS_DUPLICATE_THRESHOLD', default=3, cast=int)
+
+# Prometheus text exposition at /metrics (jobportal.prometheus). When a token
+# is set the scraper must send it as "Authorization: Bearer <token>".
+PROMETHEUS_METRICS = config('PROMETHEUS_METRICS', default=False, cast=bool)
+PROMETHEUS_METRICS_TOKEN = config('PROMETHEUS_METRICS_TOKEN', default='')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -138,6 +251,30 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing (accounts.hashers). PASSWORD_HASHER picks the algorithm for
+# new hashes: 'scrypt', 'argon2' (needs argon2-cffi) or 'pbkdf2'. Hashes made
+# with another algorithm or cost still verify and are replaced on the user's
+# next login. Higher costs slow every login and registration.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='scrypt')
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASHER)
+PASSWORD_SCRYPT_WORK_FACTOR = config('PASSWORD_SCRYPT_WORK_FACTOR', default=2**14, cast=int)
+PASSWORD_SCRYPT_BLOCK_SIZE = config('PASSWORD_SCRYPT_BLOCK_SIZE', default=8, cast=int)
+PASSWORD_SCRYPT_PARALLELISM = config('PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=600000, cast=int)
+
+# Login and registration hash in a pool of PASSWORD_POOL_WORKERS processes
+# per web worker (accounts.password_pool); 0 hashes in the request thread.
+# Beyond PASSWORD_POOL_QUEUE waiting requests they get 429 Too Many Requests,
+# and a hash taking longer than PASSWORD_POOL_TIMEOUT seconds gets 503.
+PASSWORD_POOL_WORKERS = config('PASSWORD_POOL_WORKERS', default=0, cast=int)
+PASSWORD_POOL_QUEUE = config('PASSWORD_POOL_QUEUE', default=32, cast=int)
+PASSWORD_POOL_TIMEOUT = config('PASSWORD_POOL_TIMEOUT', default=10, cast=int)
+PASSWORD_POOL_NICE = config('PASSWORD_POOL_NICE', default=10, cast=int)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -171,7 +308,7 @@ AUTH_USER_MODEL = 'accounts.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -194,8 +331,17 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RoleTokenRefreshSerializer',
 }
 
+# Refresh token blacklist (accounts.blacklist): each worker checks a Bloom
+# filter first and catches up with other workers' blacklistings every
+# JWT_BLACKLIST_SYNC_SECONDS. Run `manage.py compact_tokens` to delete
+# expired tokens.
+JWT_BLACKLIST_SYNC_SECONDS = config('JWT_BLACKLIST_SYNC_SECONDS', default=5, cast=int)
+JWT_BLACKLIST_BLOOM_CAPACITY = config('JWT_BLACKLIST_BLOOM_CAPACITY', default=1000000, cast=int)
+JWT_BLACKLIST_BLOOM_ERROR_RATE = 0.01
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -252,3 +398,12 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@jobportal.com')
+
+# Notification emails are queued in notifications.OutboxEmail and sent by
+# `manage.py process_outbox`
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS = config('EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS', default=30, cast=int)
+EMAIL_OUTBOX_RETRY_BACKOFF_MAX_SECONDS = config('EMAIL_OUTBOX_RETRY_BACKOFF_MAX_SECONDS', default=3600, cast=int)
+# Rows left in 'sending' this long (the sender died mid-batch) are claimed again
+EMAIL_OUTBOX_STALE_SECONDS = config('EMAIL_OUTBOX_STALE_SECONDS', default=600, cast=int)
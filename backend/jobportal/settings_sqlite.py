@@ -1,11 +1,23 @@
-# Temporary SQLite Configuration
-# Use this if MySQL is not set up yet
-# To use: Copy this content to replace the DATABASES section in settings.py
+# SQLite Configuration
+# Use this if MySQL is not set up yet:
+#   python manage.py runserver --settings=jobportal.settings_sqlite
+# SQLITE_NAME points it at another file, e.g. a throwaway benchmark database.
+
+import os
+
+from decouple import config
+
+# The MySQL connection is replaced below, so its password need not be set
+os.environ.setdefault('DB_PASSWORD', '')
+
+from jobportal.db import database_engine  # noqa: E402
+from .settings import *  # noqa: E402,F401,F403
+from .settings import BASE_DIR, DB_CONNECTION_MODE, DB_CONNECTION_SETTINGS  # noqa: E402
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": database_engine("sqlite3", DB_CONNECTION_MODE),
+        "NAME": config("SQLITE_NAME", default=str(BASE_DIR / "db.sqlite3")),
+        **DB_CONNECTION_SETTINGS,
     }
 }
-
@@ -0,0 +1,97 @@
+"""
+Streamed (chunked) serialization of large querysets.
+"""
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+CSV_CONTENT_TYPE = 'text/csv'
+DEFAULT_CHUNK_SIZE = 500
+
+
+def iter_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of at most ``chunk_size`` objects without caching the queryset"""
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_ndjson(queryset, serializer_class, context=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Serialize a queryset chunk by chunk as newline-delimited JSON"""
+    for chunk in iter_chunks(queryset, chunk_size):
+        serializer = serializer_class(chunk, many=True, context=context or {})
+        yield ''.join(json.dumps(item, cls=JSONEncoder) + '\n' for item in serializer.data)
+
+
+def ndjson_response(queryset, serializer_class, context=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    return StreamingHttpResponse(
+        iter_ndjson(queryset, serializer_class, context, chunk_size),
+        content_type=NDJSON_CONTENT_TYPE,
+    )
+
+
+def flatten(item, prefix=''):
+    """Flatten nested serializer output into ``parent.child`` columns"""
+    row = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            row.update(flatten(value, f'{prefix}{key}.'))
+        elif isinstance(value, list):
+            row[f'{prefix}{key}'] = json.dumps(value, cls=JSONEncoder)
+        else:
+            row[f'{prefix}{key}'] = value
+    return row
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the generator"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset, serializer_class, context=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Serialize a queryset chunk by chunk as CSV, with a header from the first row"""
+    writer = None
+    for chunk in iter_chunks(queryset, chunk_size):
+        serializer = serializer_class(chunk, many=True, context=context or {})
+        rows = [flatten(item) for item in serializer.data]
+        lines = []
+        if writer is None:
+            writer = csv.DictWriter(Echo(), fieldnames=list(rows[0]), extrasaction='ignore')
+            lines.append(writer.writeheader())
+        lines.extend(writer.writerow(row) for row in rows)
+        yield ''.join(lines)
+
+
+def csv_response(queryset, serializer_class, context=None, filename='export.csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    response = StreamingHttpResponse(
+        iter_csv(queryset, serializer_class, context, chunk_size),
+        content_type=CSV_CONTENT_TYPE,
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def wants_stream(request, stream_format='ndjson'):
+    return request.query_params.get('stream') == stream_format
+
+
+def export_response(request, queryset, serializer_class, context=None, basename='export'):
+    """Stream a full dump for ?export=csv or ?export=ndjson; None otherwise"""
+    export_format = request.query_params.get('export')
+    if export_format == 'csv':
+        return csv_response(queryset, serializer_class, context, filename=f'{basename}.csv')
+    if export_format == 'ndjson':
+        response = ndjson_response(queryset, serializer_class, context)
+        response['Content-Disposition'] = f'attachment; filename="{basename}.ndjson"'
+        return response
+    return None
@@ -0,0 +1,232 @@
+"""
+Row generators for the synthetic dataset used by ``manage.py seed``.
+
+Nothing here imports Django, so the generators can run in worker processes.
+They return plain field dicts; ``jobportal.seeding`` turns them into model
+instances and inserts them. Each chunk draws from its own ``Random`` seeded
+with ``(seed, kind, chunk)``, so the rows do not depend on the number of
+workers or on the order in which they finish.
+
+Popularity is Zipfian: a few categories, locations, employers and jobs get
+most of the postings, applications and saves, as on a real job board.
+"""
+import random
+from bisect import bisect
+from itertools import accumulate
+from math import gcd
+
+EMAIL_DOMAIN = 'bench.example.com'
+ADMIN_EMAIL = f'admin@{EMAIL_DOMAIN}'
+SEED_PASSWORD = 'benchmark-password'
+
+# Most popular first
+CATEGORIES = [
+    'Engineering', 'Sales', 'Marketing', 'Data', 'Operations', 'Support', 'Design',
+    'Finance', 'Product', 'Human Resources', 'Education', 'Legal',
+]
+LOCATIONS = [
+    'Bangalore', 'Remote', 'Hyderabad', 'Chennai', 'Pune', 'Mumbai', 'Delhi', 'London',
+    'New York', 'Berlin', 'San Francisco', 'Singapore', 'Toronto', 'Amsterdam', 'Dubai',
+    'Sydney', 'Paris',
+]
+# Median salary_min per category
+CATEGORY_SALARIES = {
+    'Engineering': 90_000, 'Data': 95_000, 'Product': 100_000, 'Design': 75_000,
+    'Legal': 85_000, 'Finance': 70_000, 'Sales': 55_000, 'Marketing': 60_000,
+    'Operations': 50_000, 'Human Resources': 55_000, 'Support': 40_000, 'Education': 45_000,
+}
+TITLE_LEVELS = ['Junior', 'Senior', 'Lead', 'Staff', 'Principal', 'Associate', 'Intern']
+LEVEL_PAY = {'Intern': 0.3, 'Junior': 0.7, 'Associate': 0.85, 'Senior': 1.3, 'Lead': 1.5, 'Staff': 1.7, 'Principal': 2.0}
+TITLE_ROLES = [
+    'Python Developer', 'Django Engineer', 'Frontend Developer', 'React Engineer',
+    'Data Scientist', 'Data Engineer', 'DevOps Engineer', 'QA Analyst', 'Product Manager',
+    'UX Designer', 'Mobile Developer', 'Security Engineer', 'Support Specialist',
+    'Sales Executive', 'Marketing Manager', 'Content Writer', 'Accountant', 'Recruiter',
+]
+SKILLS = [
+    'python', 'django', 'react', 'javascript', 'sql', 'mysql', 'aws', 'docker', 'kubernetes',
+    'pandas', 'figma', 'excel', 'communication', 'leadership', 'testing', 'linux', 'git',
+]
+FIRST_NAMES = ['Asha', 'Ravi', 'Priya', 'Arjun', 'Meera', 'Sam', 'Lena', 'Omar', 'Chen', 'Ana', 'Tom', 'Nia']
+LAST_NAMES = ['Kumar', 'Iyer', 'Shah', 'Patel', 'Smith', 'Garcia', 'Muller', 'Khan', 'Wang', 'Silva']
+COMPANY_SIZES = ['1-10', '11-50', '51-200', '201-500', '500+']
+JOB_TYPE_WEIGHTS = {'full_time': 70, 'part_time': 8, 'contract': 12, 'internship': 6, 'freelance': 4}
+JOB_STATUS_WEIGHTS = {'active': 88, 'closed': 9, 'draft': 3}
+APPLICATION_STATUS_WEIGHTS = {
+    'pending': 45, 'reviewing': 18, 'shortlisted': 10, 'interview': 7, 'rejected': 17, 'accepted': 3,
+}
+
+# Set by init_worker() in each process
+context = {}
+
+
+class Zipf:
+    """Draw ranks ``0..n-1`` with probability proportional to ``1 / (rank + 1) ** exponent``"""
+
+    def __init__(self, n, exponent=1.0):
+        self.n = n
+        self.cum_weights = list(accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+        self.total = self.cum_weights[-1] if n else 0
+
+    def rank(self, rng):
+        return min(bisect(self.cum_weights, rng.random() * self.total), self.n - 1)
+
+
+class Popularity:
+    """
+    Zipf over ``items``, most popular first. With ``scatter`` the ranks are
+    spread over the list, so the popular items are not just the first ids.
+    """
+
+    def __init__(self, items, exponent=1.0, scatter=False):
+        self.items = items
+        self.zipf = Zipf(len(items), exponent)
+        self.stride = 7919 if scatter else 1
+        while gcd(self.stride, len(items) or 1) != 1:
+            self.stride += 1
+
+    def choice(self, rng):
+        return self.items[self.zipf.rank(rng) * self.stride % len(self.items)]
+
+    def sample(self, rng, count):
+        """``count`` distinct items (fewer if there are not that many)"""
+        count = min(count, len(self.items))
+        if count > len(self.items) // 4:
+            return rng.sample(self.items, count)
+        chosen = set()
+        while len(chosen) < count:
+            chosen.add(self.choice(rng))
+        return list(chosen)
+
+
+def weighted(weights):
+    return list(weights), list(accumulate(weights.values()))
+
+
+def init_worker(values):
+    """Per-process setup: the shared inputs plus the samplers built from them"""
+    context.clear()
+    context.update(values)
+    context['categories'] = Popularity(CATEGORIES, 1.1)
+    context['locations'] = Popularity(LOCATIONS, 1.1)
+    for key in ('employer_ids', 'job_ids'):
+        if values.get(key):
+            context[key.replace('_ids', 's')] = Popularity(values[key], scatter=True)
+
+
+def chunk_rng(kind, chunk):
+    return random.Random(f'{context["seed"]}:{kind}:{chunk}')
+
+
+def generate(task):
+    """Rows for one ``(kind, chunk, start, stop)`` task"""
+    kind, chunk, start, stop = task
+    return GENERATORS[kind](chunk_rng(kind, chunk), start, stop)
+
+
+def users(rng, start, stop):
+    rows = []
+    employers, offset = context['employers'], context['user_offset']
+    for number in range(start, stop):
+        prefix = 'employer' if number < employers else 'seeker'
+        handle = f'{prefix}{offset + number}'
+        rows.append({
+            'email': f'{handle}@{EMAIL_DOMAIN}',
+            'username': handle,
+            'password': context['password_hash'],
+            'role': 'employer' if number < employers else 'job_seeker',
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+        })
+    return rows
+
+
+def employer_profiles(rng, start, stop):
+    return [
+        {
+            'user_id': user_id,
+            'company_name': f'{rng.choice(LAST_NAMES)} {rng.choice(["Labs", "Systems", "Group", "Works"])} {user_id}',
+            'company_description': f'A {rng.choice(CATEGORIES).lower()} company.',
+            'company_size': rng.choice(COMPANY_SIZES),
+            'industry': context['categories'].choice(rng),
+            'location': context['locations'].choice(rng),
+        }
+        for user_id in context['employer_ids'][start:stop]
+    ]
+
+
+def seeker_profiles(rng, start, stop):
+    return [
+        {
+            'user_id': user_id,
+            'skills': ', '.join(rng.sample(SKILLS, rng.randint(2, 6))),
+            'location': context['locations'].choice(rng),
+            'experience': f'{rng.randint(0, 15)} years',
+        }
+        for user_id in context['seeker_ids'][start:stop]
+    ]
+
+
+def jobs(rng, start, stop):
+    job_types, job_type_weights = weighted(JOB_TYPE_WEIGHTS)
+    statuses, status_weights = weighted(JOB_STATUS_WEIGHTS)
+    rows = []
+    for _ in range(start, stop):
+        category = context['categories'].choice(rng)
+        level, role = rng.choice(TITLE_LEVELS), rng.choice(TITLE_ROLES)
+        skills = rng.sample(SKILLS, 4)
+        salary_min = int(round(CATEGORY_SALARIES[category] * LEVEL_PAY[level] * rng.lognormvariate(0, 0.25), -3))
+        rows.append({
+            'title': f'{level} {role}',
+            'description': f'We are hiring a {level.lower()} {role.lower()} to work with {", ".join(skills)}.',
+            'requirements': f'Experience with {skills[0]} and {skills[1]}.',
+            'category': category,
+            'location': context['locations'].choice(rng),
+            'job_type': 'internship' if level == 'Intern' else rng.choices(job_types, cum_weights=job_type_weights)[0],
+            'salary_min': salary_min,
+            'salary_max': int(round(salary_min * rng.uniform(1.1, 1.6), -3)),
+            'is_internship': level == 'Intern',
+            'remote': rng.random() < 0.25,
+            'status': rng.choices(statuses, cum_weights=status_weights)[0],
+            'posted_by_id': context['employers'].choice(rng),
+        })
+    return rows
+
+
+def quota(total, people, index):
+    """Spread ``total`` rows as evenly as possible over ``people``"""
+    return total // people + (index < total % people)
+
+
+def applications(rng, start, stop):
+    statuses, weights = weighted(APPLICATION_STATUS_WEIGHTS)
+    seeker_ids = context['seeker_ids']
+    rows = []
+    for index in range(start, stop):
+        for job_id in context['jobs'].sample(rng, quota(context['applications'], len(seeker_ids), index)):
+            rows.append({
+                'job_id': job_id,
+                'applicant_id': seeker_ids[index],
+                'status': rng.choices(statuses, cum_weights=weights)[0],
+                'cover_letter': 'Please consider my application.',
+            })
+    return rows
+
+
+def saved_jobs(rng, start, stop):
+    seeker_ids = context['seeker_ids']
+    return [
+        {'user_id': seeker_ids[index], 'job_id': job_id}
+        for index in range(start, stop)
+        for job_id in context['jobs'].sample(rng, quota(context['saved_jobs'], len(seeker_ids), index))
+    ]
+
+
+GENERATORS = {
+    'users': users,
+    'employer_profiles': employer_profiles,
+    'seeker_profiles': seeker_profiles,
+    'jobs': jobs,
+    'applications': applications,
+    'saved_jobs': saved_jobs,
+}
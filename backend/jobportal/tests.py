@@ -0,0 +1,46 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from jobportal.db.pool import ConnectionPool, pools
+from jobportal.prometheus import count_connection, record_cache, registry, render
+
+
+def in_threads(function, count):
+    for number in range(count):
+        thread = threading.Thread(target=function)
+        thread.start()
+        thread.join()
+
+
+class PrometheusRegistryTests(SimpleTestCase):
+    def setUp(self):
+        registry.reset()
+
+    def tearDown(self):
+        registry.reset()
+
+    @override_settings(PROMETHEUS_METRICS=False)
+    def test_cache_lookups_not_recorded_when_disabled(self):
+        in_threads(lambda: record_cache('responses', True), 50)
+        self.assertEqual(registry.threads, [])
+
+    @override_settings(PROMETHEUS_METRICS=True)
+    def test_finished_threads_are_retired_without_a_scrape(self):
+        in_threads(lambda: record_cache('responses', True), 50)
+        self.assertLessEqual(len(registry.threads), 1)
+        self.assertEqual(registry.collect().cache[('responses', 'hit')], 50)
+
+
+class PrometheusConnectionTests(SimpleTestCase):
+    def test_pool_checkouts_are_not_counted_as_connects(self):
+        pool = ConnectionPool('metrics-test')
+        for number in range(5):
+            pool.release(pool.acquire(mock.Mock, lambda connection: True))
+        registry.reset()
+        with mock.patch.dict(pools, {'metrics-test': pool}), mock.patch('jobportal.prometheus.outbox_depth', dict):
+            for number in range(5):
+                count_connection(None, mock.Mock(alias='metrics-test'))
+            text = render()
+        self.assertIn('jobportal_db_connections_opened_total{alias="metrics-test"} 1\n', text)
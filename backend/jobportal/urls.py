@@ -6,6 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenRefreshView
+from jobportal.prometheus import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,8 +14,10 @@ urlpatterns = [
     path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/profiles/', include('accounts.urls')),
     path('api/jobs/', include('jobs.urls')),
+    path('api/async/jobs/', include('jobs.async_urls')),
     path('api/applications/', include('applications.urls')),
     path('api/admin/', include('accounts.admin_urls')),
+    path('metrics', metrics_view, name='prometheus-metrics'),
 ]
 
 if settings.DEBUG:
@@ -1,7 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
-
+    
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import repair_sqlite_fts
+        post_migrate.connect(repair_sqlite_fts, sender=self)
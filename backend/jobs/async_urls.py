@@ -0,0 +1,8 @@
+from django.urls import path
+from .async_views import job_detail, job_list, job_search
+
+urlpatterns = [
+    path('', job_list, name='async-job-list'),
+    path('<int:pk>/', job_detail, name='async-job-detail'),
+    path('search/', job_search, name='async-job-search'),
+]
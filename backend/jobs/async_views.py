@@ -0,0 +1,196 @@
+"""
+Async-native read endpoints for job listing, detail and search, served
+under ``/api/async/jobs/``.
+
+They take the same query parameters and return the same bodies as the DRF
+views in ``jobs.views``, but run as coroutines under ASGI. ORM calls go
+through ``aiterator()``/``aget()``/``acount()``, and the lookups a page
+needs that do not depend on each other (the rows, the total count, the
+user's saved jobs, facets) are awaited together with ``asyncio.gather``.
+Django 4.2 still executes each query on the request's sync thread, which
+allauth's sync-only AccountMiddleware holds for the whole request anyway,
+so gathered queries are issued back to back rather than in parallel. The
+gain over the DRF views under ASGI is that the view itself, serialization
+included, runs on the event loop instead of hopping to that thread and
+back for every sync layer. ``manage.py benchmark_async_views`` measures it.
+
+Left to the DRF views: the anonymous response cache, ``?stream=ndjson``
+and the browsable API.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Exists, OuterRef, Subquery
+from django.http import HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+
+from accounts.authentication import AsyncJWTAuthentication
+from applications.models import Application
+from jobportal.conditional import make_etag, not_modified, set_validators, to_timestamp
+from jobportal.pagination import AsyncPageNumberPagination, KeysetPagination
+from .facets import job_facets, wants_facets
+from .filter_index import filter_index_enabled, job_filter_index
+from .filters import filter_jobs, has_job_filters
+from .models import Job, SavedJob
+from .search import get_search_backend
+from .serializers import JobSerializer
+from .views import JobListCreateView
+
+authentication = AsyncJWTAuthentication()
+
+
+def error_response(request, exc):
+    """The body and status DRF's exception handler would give"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = authentication.authenticate_header(request)
+    return response
+
+
+def async_read_view(view):
+    """GET-only async view with JWT authentication; API exceptions become JSON error responses"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+        # For query_params and the paginators' absolute links
+        request = Request(request)
+        try:
+            request.user = await authentication.aauthenticate(request)
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            return error_response(request, exc)
+    return wrapper
+
+
+async def saved_job_ids(user):
+    # All of them rather than the page's, so the lookup need not wait for the page
+    if not user.is_authenticated:
+        return set()
+    saved = SavedJob.objects.filter(user=user).values_list('job_id', flat=True)
+    return {job_id async for job_id in saved.aiterator()}
+
+
+def serialize(jobs, saved_ids):
+    return JobSerializer(jobs, many=True, context={'saved_job_ids': saved_ids}).data
+
+
+async def queryset_page(request, queryset):
+    """Keyset page when the queryset is in keyset order, otherwise a numbered page"""
+    paginator = KeysetPagination()
+    if not paginator.is_keyset_ordering(queryset):
+        paginator = AsyncPageNumberPagination()
+    jobs, saved_ids = await asyncio.gather(
+        paginator.apaginate_queryset(queryset, request), saved_job_ids(request.user)
+    )
+    return paginator.get_paginated_response(serialize(jobs, saved_ids)).data
+
+
+async def id_page(request, ids):
+    """Numbered page over an ordered list of job ids, loading only the returned page"""
+    paginator = AsyncPageNumberPagination()
+    page_ids = paginator.paginate_queryset(ids, request)
+    jobs, saved_ids = await asyncio.gather(
+        Job.objects.filter(status='active').for_listing().ain_bulk(page_ids),
+        saved_job_ids(request.user),
+    )
+    page = [jobs[pk] for pk in page_ids if pk in jobs]
+    return paginator.get_paginated_response(serialize(page, saved_ids)).data
+
+
+async def index_page(request):
+    """Keyset page of the jobs matching the filters, found in the filter index"""
+    paginator = KeysetPagination()
+    cursor = paginator.read_cursor(request)
+    page_ids = await sync_to_async(job_filter_index.page_ids)(
+        request.query_params, cursor, paginator.page_size + 1
+    )
+    jobs, saved_ids = await asyncio.gather(
+        Job.objects.filter(status='active').for_listing().ain_bulk(page_ids),
+        saved_job_ids(request.user),
+    )
+    page = paginator.build_page([jobs[pk] for pk in page_ids if pk in jobs], cursor)
+    return paginator.get_paginated_response(serialize(page, saved_ids)).data
+
+
+@async_read_view
+async def job_list(request):
+    """Active jobs, with the filters and ordering of GET /api/jobs/"""
+    view = JobListCreateView(request=request, args=(), kwargs={}, format_kwarg=None)
+    queryset = view.get_queryset()
+    if request.query_params.get('search'):
+        # The search backend may check the schema or rank in memory
+        queryset = await sync_to_async(view.filter_queryset)(queryset)
+    else:
+        queryset = view.filter_queryset(queryset)
+    return JsonResponse(await queryset_page(request, queryset))
+
+
+@async_read_view
+async def job_detail(request, pk):
+    """One job, with the ETag and Last-Modified of GET /api/jobs/<pk>/"""
+    user = request.user
+    saved = SavedJob.objects.filter(job=OuterRef('pk'), user_id=user.id if user.is_authenticated else None)
+    last_applied = Application.objects.filter(job=OuterRef('pk')).order_by('-applied_date').values('applied_date')
+    try:
+        # The validators come with the row, so this is the only query
+        job = await Job.objects.for_listing().annotate(
+            last_applied=Subquery(last_applied[:1]),
+            saved=Exists(saved),
+        ).aget(pk=pk)
+    except Job.DoesNotExist:
+        raise NotFound()
+
+    poster_updated_at = job.posted_by.updated_at
+    etag = make_etag(
+        'job', pk, job.updated_at.isoformat(), poster_updated_at.isoformat(), job.applications_total, job.saved, 'json',
+    )
+    modified = to_timestamp(job.updated_at, job.last_applied, poster_updated_at)
+    if not_modified(request, etag, modified):
+        return set_validators(HttpResponseNotModified(), etag, modified)
+    data = JobSerializer(job, context={'saved_job_ids': {job.id} if job.saved else set()}).data
+    return set_validators(JsonResponse(data), etag, modified)
+
+
+@async_read_view
+async def job_search(request):
+    """Same parameters as GET /api/jobs/search/; facets are counted alongside the page"""
+    if not wants_facets(request):
+        return JsonResponse(await search_results(request))
+    facets = sync_to_async(job_facets)(request.query_params)
+    if request.query_params.get('facets').lower() == 'only':
+        return JsonResponse(await facets)
+    facets, data = await asyncio.gather(facets, search_results(request))
+    data['facets'] = facets['facets']
+    return JsonResponse(data)
+
+
+async def search_results(request):
+    params = request.query_params
+    queryset = Job.objects.filter(status='active').for_listing()
+
+    search = params.get('search', '')
+    if search:
+        backend = await sync_to_async(get_search_backend)()
+        if getattr(backend, 'ranks_in_memory', False):
+            return await ranked_search_page(request, await sync_to_async(backend.ranked_ids)(search))
+        queryset = backend.search(queryset, search)
+    elif filter_index_enabled():
+        return await index_page(request)
+
+    return await queryset_page(request, filter_jobs(queryset, params))
+
+
+async def ranked_search_page(request, ranked_ids):
+    params = request.query_params
+    if has_job_filters(params):
+        if filter_index_enabled():
+            ranked_ids = await sync_to_async(job_filter_index.filter_ids)(ranked_ids, params)
+        else:
+            matching = filter_jobs(Job.objects.filter(id__in=ranked_ids), params).values_list('id', flat=True)
+            matching = {pk async for pk in matching.aiterator()}
+            ranked_ids = [pk for pk in ranked_ids if pk in matching]
+    return await id_page(request, ranked_ids)
@@ -0,0 +1,158 @@
+"""
+Bulk job import from CSV or NDJSON streams.
+
+Rows are validated with ``JobCreateSerializer`` a chunk at a time and the
+valid ones inserted with ``bulk_create``, one transaction per chunk. Invalid
+rows are reported with their row number and do not stop the import.
+
+``bulk_create`` sends no model signals, so ``import_jobs()`` does what the
+``Job`` receivers would: bump the response cache version, update the
+in-memory search and filter indexes and, when enabled, the admin stat
+counters.
+"""
+import codecs
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from accounts.stats import (
+    apply_deltas, counted_values, counter_deltas, counters_enabled, invalidate_admin_stats,
+)
+from .cache import bump_version
+from .filter_index import job_filter_index
+from .models import Job
+from .search_index import job_search_index
+from .serializers import JobCreateSerializer
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class RowError(Exception):
+    """A line that could not be parsed into a row"""
+
+
+def detect_format(name='', content_type=''):
+    """'csv' or 'ndjson' from a file name or content type, else None"""
+    name = (name or '').lower()
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if name.endswith('.csv') or content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')) or content_type in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    return None
+
+
+def text_lines(stream):
+    """Decode a binary upload or request body line by line; a UTF-8 BOM is dropped"""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return codecs.iterdecode(stream, 'utf-8-sig')
+
+
+def read_rows(stream, import_format):
+    """
+    Yield ``(row_number, row)`` pairs, with ``row`` a dict or a RowError.
+
+    Empty CSV cells are left out so model defaults apply, as when the field
+    is omitted from a JSON POST.
+    """
+    lines = text_lines(stream)
+    if import_format == 'csv':
+        reader = csv.DictReader(lines)
+        for number, row in enumerate(reader, start=1):
+            if None in row:
+                yield number, RowError('Row has more values than the header')
+                continue
+            yield number, {key: value for key, value in row.items() if value not in ('', None)}
+    elif import_format == 'ndjson':
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, RowError(f'Invalid JSON: {exc}')
+                continue
+            if not isinstance(row, dict):
+                yield number, RowError('Each line must be a JSON object')
+                continue
+            yield number, row
+    else:
+        raise ValueError(f'Unsupported import format: {import_format!r}')
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_chunk(chunk, posted_by):
+    """Split a chunk into unsaved Jobs and ``{'row', 'errors'}`` dicts"""
+    jobs, errors = [], []
+    for number, row in chunk:
+        if isinstance(row, RowError):
+            errors.append({'row': number, 'errors': {'non_field_errors': [str(row)]}})
+            continue
+        serializer = JobCreateSerializer(data=row)
+        if serializer.is_valid():
+            # Same defaults as JobCreateSerializer.create()
+            jobs.append(Job(**serializer.validated_data, posted_by=posted_by, status='active'))
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+    return jobs, errors
+
+
+def imported(jobs):
+    """What the post_save receivers would have done for each created job"""
+    if counters_enabled():
+        deltas = {}
+        for job in jobs:
+            for name, delta in counter_deltas(Job, None, counted_values(Job, job)).items():
+                deltas[name] = deltas.get(name, 0) + delta
+        apply_deltas(deltas)
+
+    def on_commit():
+        bump_version()
+        invalidate_admin_stats()
+        for job in jobs:
+            # MySQL does not return ids from bulk_create; the periodic refresh picks those up
+            if job.pk is not None:
+                job_search_index.update_job(job)
+                job_filter_index.update_job(job)
+
+    transaction.on_commit(on_commit)
+
+
+def import_jobs(rows, posted_by, batch_size=None):
+    """
+    Validate and insert ``(row_number, row)`` pairs from ``read_rows()``.
+
+    Returns ``{'created': int, 'failed': int, 'errors': [...]}``; at most
+    JOB_IMPORT_MAX_ERRORS errors are listed.
+    """
+    batch_size = batch_size or getattr(settings, 'JOB_IMPORT_BATCH_SIZE', 500)
+    max_errors = getattr(settings, 'JOB_IMPORT_MAX_ERRORS', 100)
+    created = failed = 0
+    errors = []
+
+    for chunk in chunked(rows, batch_size):
+        jobs, chunk_errors = validate_chunk(chunk, posted_by)
+        if jobs:
+            with transaction.atomic():
+                jobs = Job.objects.bulk_create(jobs, batch_size=batch_size)
+                imported(jobs)
+            created += len(jobs)
+        failed += len(chunk_errors)
+        errors.extend(chunk_errors[:max(0, max_errors - len(errors))])
+
+    return {'created': created, 'failed': failed, 'errors': errors}
@@ -0,0 +1,134 @@
+"""
+Response cache for anonymous job browsing.
+
+Anonymous GETs of the job list, job detail and search endpoints are the same
+for everyone with the same query string, so their response data is cached in
+the ``JOB_RESPONSE_CACHE_ALIAS`` cache under a key built from the endpoint and
+the normalized query parameters. Every key also carries a namespace version
+that ``bump_version()`` increments whenever a job is saved or deleted, an
+application is created or deleted, or a job poster's account changes; old
+entries are never read again and simply expire.
+
+Cached responses carry an ETag and a Last-Modified date, so clients
+revalidating with If-None-Match / If-Modified-Since get a 304 without a
+body. Last-Modified is the time of the latest version bump, the same event
+the ETag's key changes with: a job closing or deleted off the page, or an
+application count moving through an ``F()`` update, leaves no newer
+``updated_at`` among the returned jobs.
+
+With the default local-memory cache each worker has its own entries and only
+sees version bumps made by its own requests; use a shared backend (file or
+Redis) when several workers serve traffic.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from rest_framework.response import Response
+
+from jobportal.conditional import make_etag, not_modified, validator_headers
+from jobportal.prometheus import record_cache
+
+VERSION_KEY = 'jobs:responses:version'
+MODIFIED_KEY = 'jobs:responses:modified'
+
+
+def response_cache():
+    return caches[getattr(settings, 'JOB_RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def cache_enabled():
+    return getattr(settings, 'JOB_RESPONSE_CACHE_TTL', 0) > 0
+
+
+def get_version():
+    cache = response_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost version key never revives old entries
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY, time.time_ns())
+    return version
+
+
+def get_modified():
+    """When the version was last bumped, as a Unix timestamp"""
+    cache = response_cache()
+    modified = cache.get(MODIFIED_KEY)
+    if modified is None:
+        # Unknown (evicted, or never bumped): only "now" is safe to claim
+        cache.add(MODIFIED_KEY, int(time.time()), None)
+        modified = cache.get(MODIFIED_KEY, int(time.time()))
+    return modified
+
+
+def get_state():
+    """``(version, modified)`` in one cache round trip"""
+    state = response_cache().get_many([VERSION_KEY, MODIFIED_KEY])
+    version = state[VERSION_KEY] if VERSION_KEY in state else get_version()
+    modified = state[MODIFIED_KEY] if MODIFIED_KEY in state else get_modified()
+    return version, modified
+
+
+def bump_version():
+    """Invalidate every cached job response"""
+    cache = response_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+    cache.set(MODIFIED_KEY, int(time.time()), None)
+
+
+def normalize_query(query_params):
+    """Sorted, blank-free query string, so equivalent URLs share one entry"""
+    items = []
+    for key in sorted(query_params):
+        values = sorted(value for value in query_params.getlist(key) if value != '')
+        items.extend((key, value) for value in values)
+    return urlencode(items)
+
+
+def cache_key(name, request, version):
+    digest = hashlib.sha1(normalize_query(request.query_params).encode()).hexdigest()
+    return f'jobs:responses:{version}:{name}:{digest}'
+
+
+def cached_response(request, name, build):
+    """
+    Serve ``build()`` (a view returning a DRF Response) from the cache for
+    anonymous GETs; everyone else gets ``build()`` unchanged.
+    """
+    if request.method != 'GET' or request.user.is_authenticated or not cache_enabled():
+        return build()
+
+    cache = response_cache()
+    version, modified = get_state()
+    key = cache_key(name, request, version)
+    entry = cache.get(key)
+    record_cache('responses', entry is not None)
+    if entry is None:
+        response = build()
+        if response.status_code != 200 or not isinstance(response, Response):
+            return response
+        entry = {
+            'data': response.data,
+            'etag': make_etag(key),
+            'modified': modified,
+        }
+        cache.set(key, entry, settings.JOB_RESPONSE_CACHE_TTL)
+
+    headers = validator_headers(entry['etag'], entry['modified'])
+    if not_modified(request, entry['etag'], entry['modified']):
+        response = HttpResponseNotModified()
+        for header, value in headers.items():
+            response[header] = value
+    else:
+        response = Response(entry['data'], headers=headers)
+    # Signed-in users see per-user fields (is_saved); keep shared caches apart
+    patch_vary_headers(response, ['Authorization'])
+    return response
@@ -0,0 +1,131 @@
+"""
+Per-job application counters stored on ``Job``.
+
+``applications_total`` and one ``applications_<status>`` field per
+``Application.STATUS_CHOICES`` entry are adjusted with ``F()`` updates in the
+same transaction as the application write, so listings read the counts
+straight from the job row. ``reconcile_counters()`` (``manage.py
+reconcile_job_counters``) recounts from the applications table and repairs
+any drift, e.g. after raw SQL writes.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Job
+
+TOTAL_FIELD = 'applications_total'
+
+
+def status_field(status):
+    return f'applications_{status}'
+
+
+def counter_fields():
+    from applications.models import Application
+    return [TOTAL_FIELD] + [status_field(status) for status, label in Application.STATUS_CHOICES]
+
+
+def application_deltas(old=None, new=None):
+    """
+    ``{job_id: {field: delta}}`` for an application moving from ``old`` to
+    ``new``, each a ``(job_id, status)`` pair or None (created / deleted)
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    if old is not None:
+        job_id, status = old
+        deltas[job_id][TOTAL_FIELD] -= 1
+        deltas[job_id][status_field(status)] -= 1
+    if new is not None:
+        job_id, status = new
+        deltas[job_id][TOTAL_FIELD] += 1
+        deltas[job_id][status_field(status)] += 1
+    return deltas
+
+
+def merge_deltas(target, deltas):
+    for job_id, fields in deltas.items():
+        for field, delta in fields.items():
+            target[job_id][field] += delta
+    return target
+
+
+def counter_expression(field, delta):
+    if delta < 0:
+        # A drifted counter must not fail the application write; reconcile fixes it
+        return Greatest(F(field) + delta, Value(0))
+    return F(field) + delta
+
+
+def apply_deltas(deltas):
+    """One UPDATE per job, adding each delta atomically with F()"""
+    for job_id, fields in deltas.items():
+        changes = {field: counter_expression(field, delta) for field, delta in fields.items() if delta}
+        if changes:
+            Job.objects.filter(id=job_id).update(**changes)
+
+
+def recount(job_ids):
+    """Actual counts for ``job_ids`` from the applications table"""
+    from applications.models import Application
+    counts = {job_id: dict.fromkeys(counter_fields(), 0) for job_id in job_ids}
+    rows = Application.objects.filter(job_id__in=job_ids).values('job_id', 'status').annotate(
+        rows=Count('id')
+    ).order_by()
+    for row in rows:
+        counts[row['job_id']][TOTAL_FIELD] += row['rows']
+        counts[row['job_id']][status_field(row['status'])] += row['rows']
+    return counts
+
+
+def backfill_counters():
+    """Recount every job with one set-based UPDATE per counter field (after bulk loads)"""
+    from applications.models import Application
+
+    def count(**filters):
+        rows = Application.objects.filter(job=OuterRef('pk'), **filters).order_by().values('job')
+        return Coalesce(
+            Subquery(rows.annotate(rows=Count('id')).values('rows'), output_field=IntegerField()),
+            Value(0),
+        )
+
+    Job.objects.update(**{TOTAL_FIELD: count()})
+    for status, label in Application.STATUS_CHOICES:
+        Job.objects.update(**{status_field(status): count(status=status)})
+
+
+def reconcile_batch(job_ids):
+    """Recount a batch of jobs and fix the drifted ones; returns the jobs fixed"""
+    fields = counter_fields()
+    jobs = Job.objects.filter(id__in=job_ids).only('id', *fields)
+    if connection.features.has_select_for_update:
+        # Application writes to these jobs wait until the recount is stored
+        jobs = jobs.select_for_update()
+
+    with transaction.atomic():
+        jobs = list(jobs)
+        counts = recount([job.id for job in jobs])
+        drifted = []
+        for job in jobs:
+            actual = counts[job.id]
+            if any(getattr(job, field) != actual[field] for field in fields):
+                for field in fields:
+                    setattr(job, field, actual[field])
+                drifted.append(job)
+        Job.objects.bulk_update(drifted, fields)
+    return drifted
+
+
+def reconcile_counters(batch_size=500):
+    """Walk every job in id order, ``batch_size`` at a time; yields (checked, fixed) per batch"""
+    last_id = 0
+    while True:
+        job_ids = list(
+            Job.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not job_ids:
+            return
+        yield len(job_ids), len(reconcile_batch(job_ids))
+        last_id = job_ids[-1]
@@ -0,0 +1,83 @@
+"""
+Facet counts for the job search filters.
+
+All facets come from one GROUP BY over every facet column at once; the
+per-facet counts are then folded together in Python. With
+``JOB_FILTER_INDEX`` on they are popcounts over the in-memory bitmaps
+instead. Counts describe the jobs matching the whole current filter set,
+including the facet's own filter. Results are cached per filter signature
+under the response cache's namespace version, so any job write invalidates
+them.
+"""
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Count
+
+from jobportal.prometheus import record_cache
+
+from .cache import get_version, normalize_query, response_cache
+from .filter_index import filter_index_enabled, job_filter_index
+from .filters import JOB_FILTER_PARAMS, filter_jobs
+from .models import Job
+from .search import get_search_backend
+
+FACET_FIELDS = ('category', 'location', 'job_type', 'remote', 'is_internship')
+SIGNATURE_PARAMS = ('search',) + JOB_FILTER_PARAMS
+
+
+def wants_facets(request):
+    return request.query_params.get('facets', '').lower() in ('1', 'true', 'only')
+
+
+def facet_signature(params):
+    """The parameters that change facet counts, normalized"""
+    relevant = params.copy()
+    for key in list(relevant):
+        if key not in SIGNATURE_PARAMS:
+            del relevant[key]
+    return hashlib.sha1(normalize_query(relevant).encode()).hexdigest()
+
+
+def compute_facets(queryset):
+    """``{'count': n, 'facets': {field: [{'value', 'count'}, ...]}}`` from one query"""
+    rows = queryset.order_by().values(*FACET_FIELDS).annotate(jobs=Count('id'))
+    counters = {field: Counter() for field in FACET_FIELDS}
+    total = 0
+    for row in rows:
+        total += row['jobs']
+        for field in FACET_FIELDS:
+            counters[field][row[field]] += row['jobs']
+    return format_facets(total, counters)
+
+
+def format_facets(total, counters):
+    limit = getattr(settings, 'JOB_FACETS_LIMIT', 50)
+    facets = {}
+    for field in FACET_FIELDS:
+        values = sorted(counters.get(field, {}).items(), key=lambda item: (-item[1], str(item[0])))
+        facets[field] = [{'value': value, 'count': count} for value, count in values[:limit]]
+    return {'count': total, 'facets': facets}
+
+
+def job_facets(params):
+    """Facet counts for active jobs matching the search and filter parameters"""
+    cache = response_cache()
+    key = f'jobs:facets:{get_version()}:{facet_signature(params)}'
+    facets = cache.get(key)
+    record_cache('facets', facets is not None)
+    if facets is None:
+        search = params.get('search', '')
+        backend = get_search_backend()
+        if filter_index_enabled() and (not search or getattr(backend, 'ranks_in_memory', False)):
+            # Popcounts over the filter index instead of a GROUP BY
+            ids = backend.ranked_ids(search) if search else None
+            facets = format_facets(*job_filter_index.facet_counts(params, ids))
+        else:
+            queryset = Job.objects.filter(status='active')
+            if search:
+                queryset = backend.search(queryset, search, rank=False)
+            facets = compute_facets(filter_jobs(queryset, params))
+        cache.set(key, facets, getattr(settings, 'JOB_FACETS_CACHE_TTL', 300))
+    return facets
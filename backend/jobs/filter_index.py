@@ -0,0 +1,362 @@
+"""
+In-process bitmap index over active jobs for the ``job_search`` filters.
+
+Each indexed job gets a slot, a dense position that is handed back when the
+job leaves the index and reused by the next one, so positions run up to the
+number of active jobs however high the ids go. Every categorical filter
+value maps to a ``Bitset`` of slots, stored roaring-style as chunks of
+``CHUNK_SIZE`` slots, each chunk a Python int and empty chunks left out.
+Adding or removing a job rewrites one chunk per posting list it touches,
+and a filter combination is a handful of chunk-wise ANDs. ``location`` is a
+substring filter: each distinct location has a bitset and a query ORs
+together the ones containing the text. Salaries get a bitset per distinct
+amount next to a sorted list of the amounts, so a range is two bisects and
+an OR over the amounts inside it (or the ones outside, whichever is fewer).
+
+Results come back a keyset page at a time. The index keeps every job's
+``(created_at, id)`` key in a sorted list, so a page of a broad match is
+read by walking that list from the cursor and keeping the first jobs whose
+slots match; a narrow match is ranked directly with ``heapq``.
+
+Like the search index it is per worker, built lazily, updated by ``Job``
+signals and refreshed every ``JOB_FILTER_INDEX_REFRESH_SECONDS``.
+"""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+
+from .live_index import LiveJobIndex
+
+CATEGORICAL_FIELDS = ('category', 'job_type', 'is_internship', 'remote')
+BOOLEAN_FIELDS = ('is_internship', 'remote')
+SALARY_FIELDS = ('salary_min', 'salary_max')
+
+
+def filter_index_enabled():
+    return getattr(settings, 'JOB_FILTER_INDEX', False)
+
+
+# Slots per chunk; an update rewrites at most one chunk (512 bytes) per bitset
+CHUNK_BITS = 12
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Matches with fewer than 1/SPARSE_MATCH of the jobs are ranked, not walked to
+SPARSE_MATCH = 32
+
+
+def bit_positions(bits):
+    """Set bit positions of a non-negative int, highest first"""
+    binary = bin(bits)[2:]
+    top = len(binary) - 1
+    positions = []
+    position = binary.find('1')
+    while position != -1:
+        positions.append(top - position)
+        position = binary.find('1', position + 1)
+    return positions
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+class Bitset:
+    """Set of slots as ``{slot >> CHUNK_BITS: chunk bits}``, without empty chunks"""
+    __slots__ = ('chunks',)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks if chunks is not None else {}
+
+    @classmethod
+    def of(cls, slots):
+        chunks = defaultdict(int)
+        for slot in slots:
+            chunks[slot >> CHUNK_BITS] |= 1 << (slot & CHUNK_MASK)
+        return cls(dict(chunks))
+
+    @classmethod
+    def union(cls, bitsets):
+        chunks = {}
+        for bits in bitsets:
+            for key, chunk in bits.chunks.items():
+                chunks[key] = chunks.get(key, 0) | chunk
+        return cls(chunks)
+
+    def copy(self):
+        return Bitset(dict(self.chunks))
+
+    def add(self, slot):
+        key = slot >> CHUNK_BITS
+        self.chunks[key] = self.chunks.get(key, 0) | 1 << (slot & CHUNK_MASK)
+
+    def discard(self, slot):
+        key = slot >> CHUNK_BITS
+        chunk = self.chunks.get(key, 0) & ~(1 << (slot & CHUNK_MASK))
+        if chunk:
+            self.chunks[key] = chunk
+        else:
+            self.chunks.pop(key, None)
+
+    def __contains__(self, slot):
+        return bool(self.chunks.get(slot >> CHUNK_BITS, 0) >> (slot & CHUNK_MASK) & 1)
+
+    def __and__(self, other):
+        smaller, larger = sorted((self.chunks, other.chunks), key=len)
+        chunks = {}
+        for key, chunk in smaller.items():
+            both = chunk & larger.get(key, 0)
+            if both:
+                chunks[key] = both
+        return Bitset(chunks)
+
+    def __or__(self, other):
+        return Bitset.union((self, other))
+
+    def __sub__(self, other):
+        chunks = {}
+        for key, chunk in self.chunks.items():
+            rest = chunk & ~other.chunks.get(key, 0)
+            if rest:
+                chunks[key] = rest
+        return Bitset(chunks)
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __len__(self):
+        return sum(popcount(chunk) for chunk in self.chunks.values())
+
+    def __iter__(self):
+        for key, chunk in self.chunks.items():
+            base = key << CHUNK_BITS
+            for position in bit_positions(chunk):
+                yield base + position
+
+
+def parse_amount(value):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+class BitmapIndex:
+    def __init__(self):
+        self.all = Bitset()
+        self.values = defaultdict(lambda: defaultdict(Bitset))
+        self.locations = defaultdict(Bitset)
+        # Per salary field: {amount: slots}, the amounts sorted, and every slot with an amount
+        self.amounts = {field: defaultdict(Bitset) for field in SALARY_FIELDS}
+        self.sorted_amounts = {field: [] for field in SALARY_FIELDS}
+        self.salaried = {field: Bitset() for field in SALARY_FIELDS}
+        # (created_at, id) of every job, ascending
+        self.order = []
+        self.created = {}
+        self.docs = {}
+        # Job id <-> dense slot; freed slots are reused before new ones
+        self.slots = {}
+        self.jobs = []
+        self.free_slots = []
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, values):
+        job_id = values['id']
+        self.remove(job_id)
+        slot = self.free_slots.pop() if self.free_slots else len(self.jobs)
+        if slot == len(self.jobs):
+            self.jobs.append(job_id)
+        else:
+            self.jobs[slot] = job_id
+        self.slots[job_id] = slot
+        self.all.add(slot)
+        for field in CATEGORICAL_FIELDS:
+            self.values[field][values[field]].add(slot)
+        location = values['location'] or ''
+        self.locations[location].add(slot)
+        salaries = tuple(parse_amount(values[field]) for field in SALARY_FIELDS)
+        for field, amount in zip(SALARY_FIELDS, salaries):
+            if amount is not None:
+                if amount not in self.amounts[field]:
+                    insort(self.sorted_amounts[field], amount)
+                self.amounts[field][amount].add(slot)
+                self.salaried[field].add(slot)
+        insort(self.order, (values['created_at'], job_id))
+        self.created[job_id] = values['created_at']
+        self.docs[job_id] = (tuple(values[field] for field in CATEGORICAL_FIELDS), location, salaries)
+
+    def remove(self, job_id):
+        doc = self.docs.pop(job_id, None)
+        if doc is None:
+            return
+        categorical, location, salaries = doc
+        slot = self.slots.pop(job_id)
+        self.all.discard(slot)
+        for field, value in zip(CATEGORICAL_FIELDS, categorical):
+            self.values[field][value].discard(slot)
+            if not self.values[field][value]:
+                del self.values[field][value]
+        self.locations[location].discard(slot)
+        if not self.locations[location]:
+            del self.locations[location]
+        # The amounts stored with the job, so the slot leaves the bitsets it is in
+        for field, amount in zip(SALARY_FIELDS, salaries):
+            if amount is not None:
+                self.salaried[field].discard(slot)
+                self.amounts[field][amount].discard(slot)
+                if not self.amounts[field][amount]:
+                    del self.amounts[field][amount]
+                    amounts = self.sorted_amounts[field]
+                    del amounts[bisect_left(amounts, amount)]
+        order = self.order
+        del order[bisect_left(order, (self.created.pop(job_id), job_id))]
+        self.jobs[slot] = None
+        self.free_slots.append(slot)
+
+    def bits_of(self, ids):
+        """Slots of the indexed jobs among ``ids``"""
+        slots = self.slots
+        return Bitset.of(slots[job_id] for job_id in ids if job_id in slots)
+
+    def range_bits(self, field, low=None, high=None):
+        """Slots of the jobs whose ``field`` amount lies in [low, high]"""
+        amounts = self.sorted_amounts[field]
+        start = 0 if low is None else bisect_left(amounts, low)
+        end = len(amounts) if high is None else bisect_right(amounts, high)
+        bitsets = self.amounts[field]
+        if (end - start) * 2 <= len(amounts):
+            return Bitset.union(bitsets[amount] for amount in amounts[start:end])
+        outside = amounts[:start] + amounts[end:]
+        return self.salaried[field] - Bitset.union(bitsets[amount] for amount in outside)
+
+    def match(self, params):
+        """Slots of the active jobs passing every filter in ``params`` (filter_jobs semantics)"""
+        bits = self.all
+        for field in CATEGORICAL_FIELDS:
+            value = params.get(field)
+            if not value:
+                continue
+            if field in BOOLEAN_FIELDS:
+                value = value.lower() == 'true'
+            bits &= self.values[field].get(value, Bitset())
+
+        location = (params.get('location') or '').lower()
+        if location:
+            location_bits = Bitset()
+            for name, name_bits in self.locations.items():
+                if location in name.lower():
+                    location_bits |= name_bits
+            bits &= location_bits
+
+        # A job matches when its range overlaps the requested one
+        salary_min = parse_amount(params.get('salary_min') or None)
+        if salary_min is not None:
+            bits &= self.range_bits('salary_max', low=salary_min)
+        salary_max = parse_amount(params.get('salary_max') or None)
+        if salary_max is not None:
+            bits &= self.range_bits('salary_min', high=salary_max)
+        # Without filters this is self.all itself; callers get their own copy
+        return bits.copy() if bits is self.all else bits
+
+    def seek(self, bits, after=None, count=10, reverse=False):
+        """
+        Up to ``count`` ids in ``bits`` past the ``(created_at, id)`` key
+        ``after``, newest first like the listing, or oldest first if ``reverse``
+        """
+        order, slots = self.order, self.slots
+        if len(bits) * SPARSE_MATCH < len(order):
+            created, jobs = self.created, self.jobs
+            keys = ((created[jobs[slot]], jobs[slot]) for slot in bits)
+            if reverse:
+                if after is not None:
+                    keys = (key for key in keys if key > after)
+                return [job_id for created_at, job_id in heapq.nsmallest(count, keys)]
+            if after is not None:
+                keys = (key for key in keys if key < after)
+            return [job_id for created_at, job_id in heapq.nlargest(count, keys)]
+
+        if reverse:
+            start = 0 if after is None else bisect_right(order, after)
+            keys = (order[position] for position in range(start, len(order)))
+        else:
+            end = len(order) if after is None else bisect_left(order, after)
+            keys = (order[position] for position in range(end - 1, -1, -1))
+        ids = []
+        for created_at, job_id in keys:
+            if slots[job_id] in bits:
+                ids.append(job_id)
+                if len(ids) == count:
+                    break
+        return ids
+
+    def keep(self, ids, bits):
+        """``ids`` (in their given order) whose slots are in ``bits``"""
+        slots = self.slots
+        return [job_id for job_id in ids if job_id in slots and slots[job_id] in bits]
+
+    def facet_counts(self, bits):
+        """``{field: {value: count}}`` for the jobs in ``bits``, zero counts left out"""
+        groups = dict(self.values, location=self.locations)
+        counts = {}
+        for field, values in groups.items():
+            counts[field] = {}
+            for value, value_bits in values.items():
+                count = len(bits & value_bits)
+                if count:
+                    counts[field][value] = count
+        return counts
+
+
+class JobFilterIndex(LiveJobIndex):
+    fields = CATEGORICAL_FIELDS + ('location', 'salary_min', 'salary_max', 'created_at')
+    refresh_setting = 'JOB_FILTER_INDEX_REFRESH_SECONDS'
+
+    def new_index(self):
+        return BitmapIndex()
+
+    def add(self, values):
+        self.index.add(values)
+
+    def remove(self, job_id):
+        self.index.remove(job_id)
+
+    def indexed_ids(self):
+        return self.index.docs
+
+    def page_ids(self, params, cursor, count):
+        """Up to ``count`` ids of active jobs passing the filters, from a decoded KeysetPagination cursor"""
+        self.ensure_built()
+        with self.lock:
+            bits = self.index.match(params)
+            if cursor is None:
+                return self.index.seek(bits, count=count)
+            created_at, pk, reverse = cursor
+            return self.index.seek(bits, (created_at, pk), count, reverse)
+
+    def filter_ids(self, ids, params):
+        """Keep the ids (in their given order) that pass the filters"""
+        self.ensure_built()
+        with self.lock:
+            return self.index.keep(ids, self.index.match(params))
+
+    def facet_counts(self, params, ids=None):
+        self.ensure_built()
+        with self.lock:
+            bits = self.index.match(params)
+            if ids is not None:
+                bits &= self.index.bits_of(ids)
+            return len(bits), self.index.facet_counts(bits)
+
+    def stats(self):
+        with self.lock:
+            if not self.index:
+                return {'documents': 0}
+            return {'documents': len(self.index), 'slots': len(self.index.jobs)}
+
+
+job_filter_index = JobFilterIndex()
@@ -0,0 +1,56 @@
+from rest_framework import filters
+from .search import search_jobs
+
+JOB_FILTER_PARAMS = (
+    'category', 'location', 'job_type', 'is_internship', 'remote', 'salary_min', 'salary_max',
+)
+
+
+def has_job_filters(params):
+    return any(params.get(name) for name in JOB_FILTER_PARAMS)
+
+
+def filter_jobs(queryset, params):
+    """Apply the job_search query parameters other than the search text"""
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category=category)
+    
+    location = params.get('location')
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    
+    job_type = params.get('job_type')
+    if job_type:
+        queryset = queryset.filter(job_type=job_type)
+    
+    is_internship = params.get('is_internship')
+    if is_internship:
+        queryset = queryset.filter(is_internship=is_internship.lower() == 'true')
+    
+    remote = params.get('remote')
+    if remote:
+        queryset = queryset.filter(remote=remote.lower() == 'true')
+    
+    # Salary range
+    salary_min = params.get('salary_min')
+    salary_max = params.get('salary_max')
+    if salary_min:
+        queryset = queryset.filter(salary_max__gte=salary_min)
+    if salary_max:
+        queryset = queryset.filter(salary_min__lte=salary_max)
+    
+    return queryset
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """SearchFilter backed by the configured full-text search backend"""
+    
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        
+        # Rank by relevance unless the client asked for an explicit ordering
+        rank = not request.query_params.get(filters.OrderingFilter.ordering_param)
+        return search_jobs(queryset, ' '.join(search_terms), rank=rank)
@@ -0,0 +1,112 @@
+"""
+Base class for per-worker in-memory indexes over active jobs.
+
+Each worker keeps its own copy. It is built lazily on first use, kept
+current by ``Job`` signals for writes made in this process, and caught up
+periodically for writes made by other workers by re-reading rows whose
+``updated_at`` passed the last watermark.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+
+from .models import Job
+
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+class LiveJobIndex:
+    """Subclasses set ``fields`` and ``refresh_setting`` and implement ``new_index``/``add``/``remove``"""
+    fields = ()
+    refresh_setting = None
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index = None
+        self.watermark = None
+        self.refreshed_at = 0.0
+
+    @property
+    def is_built(self):
+        return self.index is not None
+
+    def new_index(self):
+        raise NotImplementedError
+
+    def add(self, values):
+        """Index one active job from a dict of ``fields`` plus ``id``"""
+        raise NotImplementedError
+
+    def remove(self, job_id):
+        raise NotImplementedError
+
+    def indexed_ids(self):
+        raise NotImplementedError
+
+    def active_jobs(self):
+        return Job.objects.filter(status='active')
+
+    def build(self):
+        with self.lock:
+            self.load_database()
+            self.refreshed_at = time.monotonic()
+
+    def load_database(self):
+        self.index = self.new_index()
+        self.watermark = None
+        for values in self.active_jobs().values('id', 'updated_at', *self.fields).iterator():
+            self.add(values)
+            self.advance_watermark(values['updated_at'])
+
+    def ensure_built(self):
+        if self.index is None:
+            self.build()
+        else:
+            self.refresh()
+
+    def refresh(self, force=False):
+        """Apply writes made by other workers since the last refresh"""
+        interval = getattr(settings, self.refresh_setting, 60)
+        if not force and time.monotonic() - self.refreshed_at < interval:
+            return
+
+        with self.lock:
+            changed = Job.objects.all()
+            if self.watermark is not None:
+                # Re-read a short overlap: a row can commit after a newer one
+                changed = changed.filter(updated_at__gte=self.watermark - REFRESH_OVERLAP)
+            for values in changed.values('id', 'status', 'updated_at', *self.fields).iterator():
+                if values['status'] == 'active':
+                    self.add(values)
+                else:
+                    self.remove(values['id'])
+                self.advance_watermark(values['updated_at'])
+
+            # Deletions leave no updated_at behind
+            active_ids = set(self.active_jobs().values_list('id', flat=True))
+            for job_id in set(self.indexed_ids()) - active_ids:
+                self.remove(job_id)
+
+            self.refreshed_at = time.monotonic()
+
+    def advance_watermark(self, updated_at):
+        if self.watermark is None or updated_at > self.watermark:
+            self.watermark = updated_at
+
+    # Signal hooks; before the first build there is nothing to update
+
+    def update_job(self, job):
+        with self.lock:
+            if self.index is None:
+                return
+            if job.status == 'active':
+                self.add({'id': job.id, **{field: getattr(job, field) for field in self.fields}})
+            else:
+                self.remove(job.id)
+
+    def remove_job(self, job_id):
+        with self.lock:
+            if self.index is not None:
+                self.remove(job_id)
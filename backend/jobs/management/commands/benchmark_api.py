@@ -0,0 +1,219 @@
+import json
+import platform
+import random
+import subprocess
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import override_settings
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from applications.models import Application
+from jobportal.benchmarking import peak_rss_mb, run_scenario
+from jobportal.seeding import SCALES, seed_dataset
+from jobportal.synthetic import (
+    ADMIN_EMAIL, CATEGORIES, EMAIL_DOMAIN, LOCATIONS, SEED_PASSWORD, SKILLS, TITLE_ROLES,
+)
+from jobs.models import Job
+
+SCENARIOS = ('jobs_list', 'job_search', 'applications', 'admin_stats', 'login', 'token_refresh')
+# Deepest page the jobs_list scenario reads before starting over
+LIST_PAGES = 20
+SEARCH_TERMS = SKILLS + [word.lower() for role in TITLE_ROLES for word in role.split()]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bearer(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset and load-test the main API endpoints with concurrent clients. '
+        'Run it against a throwaway database, e.g. SQLITE_NAME=/tmp/bench.sqlite3 with '
+        '--settings=jobportal.settings_sqlite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Dataset size preset')
+        parser.add_argument('--jobs', type=int, help='Jobs to seed (overrides --scale)')
+        parser.add_argument('--users', type=int, help='Users to seed (overrides --scale)')
+        parser.add_argument('--applications', type=int, help='Applications to seed (overrides --scale)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for data and requests')
+        parser.add_argument('--reuse', action='store_true', help='Benchmark the data already in the database')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per scenario')
+        parser.add_argument('--login-requests', type=int, default=40, help='Requests for the login scenario')
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Scenarios to run (repeatable)')
+        parser.add_argument('--label', default='', help='Name stored with the results')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Print changes against a previous --output file')
+
+    def handle(self, *args, **options):
+        if not options['reuse']:
+            counts = dict(SCALES[options['scale']])
+            for name in ('jobs', 'users', 'applications'):
+                if options[name] is not None:
+                    counts[name] = options[name]
+            self.stdout.write('Seeding ' + ', '.join(f'{count} {name}' for name, count in counts.items()))
+            seed_dataset(counts, seed=options['seed'], log=self.stdout.write)
+
+        actors = self.actors()
+        results = {
+            'label': options['label'],
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'dataset': {
+                'users': User.objects.count(),
+                'jobs': Job.objects.count(),
+                'active_jobs': Job.objects.filter(status='active').count(),
+                'applications': Application.objects.count(),
+            },
+            'config': {key: options[key] for key in ('clients', 'requests', 'login_requests', 'seed')},
+            'scenarios': {},
+        }
+        self.stdout.write('Dataset: ' + ', '.join(f'{k}={v}' for k, v in results['dataset'].items()))
+
+        for name in options['scenario'] or SCENARIOS:
+            send = getattr(self, f'send_{name}')(actors, options['seed'])
+            requests = options['login_requests'] if name == 'login' else options['requests']
+            result = self.run(send, options['clients'], requests)
+            results['scenarios'][name] = result
+            self.report(name, result)
+        results['peak_rss_mb'] = peak_rss_mb()
+        self.stdout.write(f'Peak RSS: {results["peak_rss_mb"]} MB')
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+        if options['compare']:
+            with open(options['compare']) as previous:
+                self.compare(json.load(previous), results)
+
+    def actors(self):
+        """The users requests are made as, with their access tokens"""
+        admin = User.objects.filter(email=ADMIN_EMAIL).first()
+        seeker = User.objects.filter(role='job_seeker', email__endswith=f'@{EMAIL_DOMAIN}').order_by('id').first()
+        # The employer with the most applications makes the heaviest listing
+        employer = (
+            User.objects.filter(role='employer', email__endswith=f'@{EMAIL_DOMAIN}')
+            .annotate(received=Count('posted_jobs__applications')).order_by('-received', 'id').first()
+        )
+        if not (admin and seeker and employer):
+            raise CommandError('No benchmark users found; run without --reuse to seed them.')
+        seekers = list(
+            User.objects.filter(role='job_seeker', email__endswith=f'@{EMAIL_DOMAIN}')
+            .order_by('id').values_list('email', flat=True)[:1000]
+        )
+        return {
+            'admin': bearer(admin), 'seeker': bearer(seeker), 'employer': bearer(employer),
+            'seeker_emails': seekers, 'seeker_user': seeker,
+        }
+
+    # ALLOWED_HOSTS may not include the test client's host
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def run(self, send, clients, requests):
+        return run_scenario(send, clients, requests)
+
+    # Each send_* returns send(client, number); requests are authenticated,
+    # so the anonymous response cache never answers them
+
+    def send_jobs_list(self, actors, seed):
+        def send(client, number):
+            # The listing is keyset paginated, so ?page is ignored; each client
+            # follows the next links and starts over after LIST_PAGES pages
+            if getattr(client, 'pages_read', LIST_PAGES) >= LIST_PAGES or not client.next_page:
+                client.next_page, client.pages_read = '/api/jobs/', 0
+            response = client.get(client.next_page, **actors['seeker'])
+            client.next_page = response.data.get('next') if response.status_code == 200 else None
+            client.pages_read += 1
+            return response
+        return send
+
+    def send_job_search(self, actors, seed):
+        def send(client, number):
+            rng = random.Random(seed + number)
+            params = {'search': rng.choice(SEARCH_TERMS)}
+            if rng.random() < 0.5:
+                params['category'] = rng.choice(CATEGORIES)
+            if rng.random() < 0.3:
+                params['location'] = rng.choice(LOCATIONS)
+            return client.get('/api/jobs/search/', params, **actors['seeker'])
+        return send
+
+    def send_applications(self, actors, seed):
+        def send(client, number):
+            return client.get('/api/applications/', **actors['employer'])
+        return send
+
+    def send_admin_stats(self, actors, seed):
+        def send(client, number):
+            return client.get('/api/admin/stats/', **actors['admin'])
+        return send
+
+    def send_login(self, actors, seed):
+        emails = actors['seeker_emails']
+
+        def send(client, number):
+            email = emails[random.Random(seed + number).randrange(len(emails))]
+            return client.post(
+                '/api/auth/login/', {'email': email, 'password': SEED_PASSWORD}, content_type='application/json',
+            )
+        return send
+
+    def send_token_refresh(self, actors, seed):
+        def send(client, number):
+            # Each client follows its own rotation chain; every refresh blacklists the token it used
+            if not hasattr(client, 'refresh_token'):
+                client.refresh_token = str(RoleRefreshToken.for_user(actors['seeker_user']))
+            response = client.post(
+                '/api/auth/token/refresh/', {'refresh': client.refresh_token}, content_type='application/json',
+            )
+            if response.status_code == 200:
+                client.refresh_token = response.json()['refresh']
+            return response
+        return send
+
+    def report(self, name, result):
+        latency, queries = result['latency_ms'], result['queries']
+        if not latency:
+            self.stdout.write(f'{name:>13}: no requests completed | {result["errors"]} errors')
+            return
+        self.stdout.write(
+            f'{name:>13}: {result["throughput_rps"]:8.1f} req/s | '
+            f'p50 {latency["p50"]:7.2f} p95 {latency["p95"]:7.2f} p99 {latency["p99"]:7.2f} ms | '
+            f'{queries["mean"]:.1f} queries | {result["errors"]} errors'
+        )
+
+    def compare(self, before, after):
+        self.stdout.write(f'Compared with {before.get("label") or before.get("commit") or "previous run"}:')
+        for name, result in after['scenarios'].items():
+            previous = before.get('scenarios', {}).get(name)
+            if not previous or not previous['latency_ms'] or not result['latency_ms']:
+                continue
+            self.stdout.write(
+                f'{name:>13}: throughput {self.change(previous["throughput_rps"], result["throughput_rps"])}, '
+                f'p95 {self.change(previous["latency_ms"]["p95"], result["latency_ms"]["p95"])}, '
+                f'queries {previous["queries"]["mean"]} -> {result["queries"]["mean"]}'
+            )
+
+    def change(self, before, after):
+        if not before:
+            return f'{before} -> {after}'
+        return f'{before} -> {after} ({(after - before) / before:+.1%})'
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from jobportal.benchmarking import drive_asgi, drive_wsgi, percentile
+from jobs.models import Job
+
+# (name, server interface, URL prefix)
+TARGETS = (
+    ('wsgi', 'wsgi', '/api/jobs/'),
+    ('asgi-sync', 'asgi', '/api/jobs/'),
+    ('asgi-async', 'asgi', '/api/async/jobs/'),
+)
+ENDPOINTS = ('list', 'detail', 'search')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF job views behind jobportal.wsgi with the async views in jobs.async_views '
+        'behind jobportal.asgi, at increasing concurrency. Each run is a separate process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', choices=[name for name, *rest in TARGETS],
+                            help='Targets to compare (repeatable; default all)')
+        parser.add_argument('--endpoint', action='append', choices=ENDPOINTS, help='Endpoints (repeatable)')
+        parser.add_argument('--clients', action='append', type=int,
+                            help='Concurrent threads (WSGI) or tasks (ASGI) (repeatable; default 16, 64 and 256)')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--child', action='store_true', help='Internal: run one target in this process')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            result = self.measure(options['target'][0], options['endpoint'][0], options['requests'],
+                                  options['clients'][0])
+            self.stdout.write(json.dumps(result))
+            return
+
+        self.stdout.write(f'{options["requests"]} signed-in requests per run')
+        for endpoint in options['endpoint'] or ENDPOINTS:
+            for clients in options['clients'] or [16, 64, 256]:
+                for target in options['target'] or [name for name, *rest in TARGETS]:
+                    result = self.run_child(target, endpoint, clients, options['requests'])
+                    self.stdout.write(
+                        f'{endpoint:>6} {clients:>4} clients {target:>10}: {result["throughput_rps"]:8.1f} req/s | '
+                        f'mean {result["mean_ms"]:8.2f} ms, p95 {result["p95_ms"]:8.2f} ms | '
+                        f'{result["errors"]} errors'
+                    )
+
+    def run_child(self, target, endpoint, clients, requests):
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_async_views', '--child',
+            '--target', target, '--endpoint', endpoint, '--clients', str(clients), '--requests', str(requests),
+        ]
+        env = dict(os.environ)
+        if self.target(target)[1] == 'asgi':
+            # As jobportal/asgi.py would; it is imported after settings here
+            env.setdefault('DB_CONNECTION_MODE', 'pool')
+        finished = subprocess.run(command, env=env, capture_output=True, text=True)
+        if finished.returncode:
+            raise CommandError(f'{target} ({endpoint}, {clients} clients) failed:\n{finished.stderr}')
+        return json.loads(finished.stdout.strip().splitlines()[-1])
+
+    def target(self, name):
+        return next(target for target in TARGETS if target[0] == name)
+
+    def paths(self, endpoint, prefix):
+        if endpoint == 'list':
+            return [prefix, f'{prefix}?remote=true', f'{prefix}?ordering=-salary_max']
+        if endpoint == 'search':
+            return [f'{prefix}search/?search=python', f'{prefix}search/?category=Engineering&facets=true']
+        job_ids = list(Job.objects.filter(status='active').order_by('-id').values_list('id', flat=True)[:50])
+        return [f'{prefix}{job_id}/' for job_id in job_ids]
+
+    def measure(self, target, endpoint, requests, clients):
+        name, interface, prefix = self.target(target)
+        user = User.objects.filter(is_active=True, saved_jobs__isnull=False).first()
+        if user is None or not Job.objects.filter(status='active').exists():
+            raise CommandError('Needs active jobs and a user with saved jobs; run manage.py seed first.')
+        # Signed in, so the anonymous response cache does not answer
+        headers = {'Authorization': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+        paths = self.paths(endpoint, prefix)
+        connection.close()
+
+        with override_settings(ALLOWED_HOSTS=['*']):
+            if interface == 'wsgi':
+                from jobportal.wsgi import application
+                latencies, errors, elapsed = drive_wsgi(application, paths, headers, requests, clients)
+            else:
+                from jobportal.asgi import application
+                latencies, errors, elapsed = asyncio.run(drive_asgi(application, paths, headers, requests, clients))
+
+        latencies.sort()
+        return {
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'errors': errors,
+        }
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from jobportal.benchmarking import drive_asgi, drive_wsgi, percentile
+from jobportal.db import CONNECTION_MODES
+from jobportal.db.pool import pools
+from jobs.models import Job
+
+INTERFACES = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare per-request cost across DB_CONNECTION_MODE settings, through the real WSGI and '
+        'ASGI handlers. Each mode runs in its own process against the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', action='append', choices=CONNECTION_MODES, help='Modes to compare (repeatable)')
+        parser.add_argument('--interface', action='append', choices=INTERFACES, help='Handlers to drive (repeatable)')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent threads (WSGI) or tasks (ASGI)')
+        parser.add_argument('--child', action='store_true', help='Internal: run one mode in this process')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            interface = (options['interface'] or ['wsgi'])[0]
+            self.stdout.write(json.dumps(self.measure(interface, options['requests'], options['clients'])))
+            return
+
+        self.stdout.write(f'{options["requests"]} requests, {options["clients"]} concurrent clients')
+        for interface in options['interface'] or INTERFACES:
+            for mode in options['mode'] or CONNECTION_MODES:
+                result = self.run_child(mode, interface, options)
+                self.stdout.write(
+                    f'{interface:>5} {mode:>10}: {result["throughput_rps"]:8.1f} req/s | '
+                    f'mean {result["mean_ms"]:6.2f} ms, p95 {result["p95_ms"]:6.2f} ms | '
+                    f'{result["connections_opened"]} connections opened | {result["errors"]} errors'
+                )
+
+    def run_child(self, mode, interface, options):
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_db_connections', '--child',
+            '--interface', interface, '--requests', str(options['requests']), '--clients', str(options['clients']),
+        ]
+        env = {**os.environ, 'DB_CONNECTION_MODE': mode}
+        finished = subprocess.run(command, env=env, capture_output=True, text=True)
+        if finished.returncode:
+            raise CommandError(f'{mode} ({interface}) failed:\n{finished.stderr}')
+        return json.loads(finished.stdout.strip().splitlines()[-1])
+
+    def measure(self, interface, requests, clients):
+        job = Job.objects.filter(status='active').first()
+        user = User.objects.filter(is_active=True).first()
+        if job is None or user is None:
+            raise CommandError('Needs an active job and a user; run manage.py seed first.')
+        # Signed in, so the anonymous response cache does not answer
+        path = f'/api/jobs/{job.id}/'
+        token = str(RoleRefreshToken.for_user(user).access_token)
+        connection.close()
+
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+        headers = {'Authorization': f'Bearer {token}'}
+        with override_settings(ALLOWED_HOSTS=['*']):
+            if interface == 'wsgi':
+                latencies, errors, elapsed = drive_wsgi(get_wsgi_application(), [path], headers, requests, clients)
+            else:
+                latencies, errors, elapsed = asyncio.run(
+                    drive_asgi(get_asgi_application(), [path], headers, requests, clients)
+                )
+
+        pool = pools.get('default')
+        latencies.sort()
+        return {
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'errors': errors,
+            # connection_created fires on every pool checkout; the pool knows the real number
+            'connections_opened': pool.stats()['opened'] if pool else len(opened),
+        }
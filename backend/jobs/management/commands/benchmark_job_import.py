@@ -0,0 +1,91 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from jobs.models import Job
+
+BENCHMARK_EMAIL = 'import-benchmark@example.com'
+
+
+def sample_rows(count):
+    return [
+        {
+            'title': f'Benchmark engineer {number}',
+            'description': 'Build and run services for the import benchmark.',
+            'category': ('Engineering', 'Design', 'Marketing', 'Sales')[number % 4],
+            'location': ('Berlin', 'Remote', 'Chennai', 'London')[number % 4],
+            'job_type': 'full_time',
+            'salary_min': 1000 + number % 50 * 100,
+            'salary_max': 6000 + number % 50 * 100,
+            'requirements': 'Python, Django',
+            'remote': number % 2 == 0,
+        }
+        for number in range(count)
+    ]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare job creation throughput: one POST per job vs the bulk import endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Jobs created per run')
+        parser.add_argument('--batch-size', type=int, action='append', help='Bulk batch sizes to try (repeatable)')
+        parser.add_argument('--keep', action='store_true', help='Keep the created jobs instead of rolling back')
+
+    def handle(self, *args, **options):
+        rows = sample_rows(options['rows'])
+        employer, _ = User.objects.get_or_create(
+            email=BENCHMARK_EMAIL, defaults={'username': 'import-benchmark', 'role': 'employer'}
+        )
+        client = APIClient()
+        client.force_authenticate(employer)
+
+        self.report('single POST', len(rows), self.run(options['keep'], lambda: self.post_each(client, rows)))
+        body = ''.join(json.dumps(row) + '\n' for row in rows).encode()
+        for batch_size in options['batch_size'] or [100, 500]:
+            elapsed = self.run(options['keep'], lambda: self.post_bulk(client, body, batch_size))
+            self.report(f'bulk ({batch_size}/batch)', len(rows), elapsed)
+
+    # ALLOWED_HOSTS may not include the test client's host
+    @override_settings(ALLOWED_HOSTS=['*'])
+    def run(self, keep, create):
+        """Time ``create()``, rolling its writes back unless --keep"""
+        before = Job.objects.count()
+        elapsed = None
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                create()
+                elapsed = time.perf_counter() - started
+                if not keep:
+                    raise Rollback
+        except Rollback:
+            pass
+        if keep:
+            self.stdout.write(f'  {Job.objects.count() - before} jobs kept')
+        return elapsed
+
+    def post_each(self, client, rows):
+        for row in rows:
+            response = client.post('/api/jobs/', row, format='json')
+            assert response.status_code == 201, response.content
+
+    def post_bulk(self, client, body, batch_size):
+        response = client.generic(
+            'POST', f'/api/jobs/bulk/import/?batch_size={batch_size}', body, content_type='application/x-ndjson',
+        )
+        assert response.status_code == 201, response.content
+
+    def report(self, label, count, elapsed):
+        self.stdout.write(
+            f'{label:>20}: {count} jobs in {elapsed:.2f}s ({count / elapsed:,.0f} jobs/s)'
+        )
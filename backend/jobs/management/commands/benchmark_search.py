@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.pagination import PageNumberPagination
+
+from jobs.models import Job
+from jobs.search import FALLBACK_BACKEND, FULLTEXT_BACKENDS, MEMORY_BACKEND
+from jobs.search_index import job_search_index
+
+
+class Command(BaseCommand):
+    help = 'Compare job search latency across the available search backends'
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='*', help='Search terms (default: sampled from the index)')
+        parser.add_argument('--queries', type=int, default=20, help='Number of sampled terms')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per term and backend')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        job_search_index.build()
+        self.stdout.write(
+            f'Built in-memory index over {job_search_index.stats()["documents"]} jobs '
+            f'in {(time.perf_counter() - started) * 1000:.1f} ms'
+        )
+
+        terms = options['terms'] or self.sample_terms(options['queries'], options['seed'])
+        if not terms:
+            self.stdout.write(self.style.WARNING('No active jobs to search.'))
+            return
+
+        backends = [MEMORY_BACKEND, FALLBACK_BACKEND]
+        backends += [backend for backend in FULLTEXT_BACKENDS if backend.is_available(connection)]
+
+        page_size = PageNumberPagination.page_size or 10
+        for backend in backends:
+            ranking, total = [], []
+            for term in terms:
+                for _ in range(options['repeat']):
+                    ranking.append(self.time_ranking(backend, term))
+                    total.append(self.time_first_page(backend, term, page_size))
+            self.stdout.write(
+                f'{backend.name:>10}: match {self.summary(ranking)} | '
+                f'first page {self.summary(total)}'
+            )
+
+    def sample_terms(self, count, seed):
+        vocabulary = sorted(job_search_index.index.postings)
+        return random.Random(seed).sample(vocabulary, min(count, len(vocabulary)))
+
+    def time_ranking(self, backend, term):
+        """Time to find the matching ids (ranked where the backend ranks)"""
+        started = time.perf_counter()
+        if backend is MEMORY_BACKEND:
+            backend.ranked_ids(term)
+        else:
+            list(backend.search(Job.objects.filter(status='active'), term).values_list('id', flat=True))
+        return time.perf_counter() - started
+
+    def time_first_page(self, backend, term, page_size):
+        """Time to produce a count and the first page of jobs, as job_search does"""
+        started = time.perf_counter()
+        if backend is MEMORY_BACKEND:
+            ids = backend.ranked_ids(term)
+            len(ids)
+            list(Job.objects.for_listing().in_bulk(ids[:page_size]).values())
+        else:
+            queryset = backend.search(Job.objects.filter(status='active').for_listing(), term)
+            queryset.count()
+            list(queryset[:page_size])
+        return time.perf_counter() - started
+
+    def summary(self, samples):
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return f'mean {statistics.mean(samples) * 1000:8.3f} ms, p95 {p95 * 1000:8.3f} ms'
@@ -0,0 +1,52 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from jobs.bulk import IMPORT_FORMATS, detect_format, import_jobs, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import jobs from a CSV or NDJSON file on behalf of an employer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input")
+        parser.add_argument('--employer', required=True, help='Email of the employer the jobs are posted by')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Default: from the file extension')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows validated and inserted per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.get(email=options['employer'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['employer']}")
+        if not (employer.is_employer or employer.is_admin):
+            raise CommandError(f'{employer.email} is not an employer')
+
+        import_format = options['format'] or detect_format(options['path'])
+        if import_format is None:
+            raise CommandError('Cannot tell the format from the file name; pass --format')
+
+        started = time.perf_counter()
+        if options['path'] == '-':
+            result = import_jobs(read_rows(sys.stdin.buffer, import_format), employer, options['batch_size'])
+        else:
+            try:
+                source = open(options['path'], 'rb')
+            except OSError as exc:
+                raise CommandError(str(exc))
+            with source:
+                result = import_jobs(read_rows(source, import_format), employer, options['batch_size'])
+        elapsed = time.perf_counter() - started
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        if result['failed'] > len(result['errors']):
+            self.stderr.write(f"... and {result['failed'] - len(result['errors'])} more invalid rows")
+        rate = result['created'] / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} jobs, {result['failed']} rows failed "
+            f"in {elapsed:.2f}s ({rate:.0f} jobs/s)"
+        ))
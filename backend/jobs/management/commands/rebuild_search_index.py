@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.search_index import job_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the in-memory job search index and write its snapshot'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        job_search_index.rebuild()
+        stats = job_search_index.stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {stats['documents']} jobs ({stats['terms']} terms) "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
+        if settings.JOB_SEARCH_INDEX_PATH:
+            self.stdout.write(f'Snapshot written to {settings.JOB_SEARCH_INDEX_PATH}')
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from jobs.search import (
+    create_mysql_fulltext_index, drop_mysql_fulltext_index,
+    install_sqlite_fts, sqlite_fts5_supported, uninstall_sqlite_fts,
+)
+
+
+def create_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        create_mysql_fulltext_index(schema_editor)
+    elif connection.vendor == 'sqlite' and sqlite_fts5_supported(connection):
+        install_sqlite_fts(connection)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        drop_mysql_fulltext_index(schema_editor)
+    elif connection.vendor == 'sqlite':
+        uninstall_sqlite_fts(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
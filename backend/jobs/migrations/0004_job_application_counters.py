@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:54
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+STATUSES = ('pending', 'reviewing', 'shortlisted', 'interview', 'rejected', 'accepted')
+
+
+def backfill_counters(apps, schema_editor):
+    """One set-based UPDATE per counter field"""
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('applications', 'Application')
+
+    def count(**filters):
+        rows = Application.objects.filter(job=OuterRef('pk'), **filters).order_by().values('job')
+        return Coalesce(
+            Subquery(rows.annotate(rows=Count('id')).values('rows'), output_field=IntegerField()),
+            Value(0),
+        )
+
+    Job.objects.update(applications_total=count())
+    for status in STATUSES:
+        Job.objects.update(**{f'applications_{status}': count(status=status)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_fulltext_index'),
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_accepted',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_interview',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_pending',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_rejected',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_reviewing',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_shortlisted',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,12 @@ from django.core.validators import MinValueValidator
 from accounts.models import User
 
 
+class JobQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Join the poster for serialization; application counts are stored on the row"""
+        return self.select_related('posted_by')
+
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
@@ -47,6 +53,22 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Application counters, one per Application.STATUS_CHOICES entry, kept
+    # current by applications.signals (see jobs.counters)
+    applications_total = models.PositiveIntegerField(default=0, editable=False)
+    applications_pending = models.PositiveIntegerField(default=0, editable=False)
+    applications_reviewing = models.PositiveIntegerField(default=0, editable=False)
+    applications_shortlisted = models.PositiveIntegerField(default=0, editable=False)
+    applications_interview = models.PositiveIntegerField(default=0, editable=False)
+    applications_rejected = models.PositiveIntegerField(default=0, editable=False)
+    applications_accepted = models.PositiveIntegerField(default=0, editable=False)
+    COUNTER_FIELDS = (
+        'applications_total', 'applications_pending', 'applications_reviewing', 'applications_shortlisted',
+        'applications_interview', 'applications_rejected', 'applications_accepted',
+    )
+    
+    objects = JobQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -55,11 +77,23 @@ class Job(models.Model):
             models.Index(fields=['location']),
             models.Index(fields=['job_type']),
             models.Index(fields=['status']),
+            # Keyset pagination over active jobs
+            models.Index(fields=['status', '-created_at', '-id'], name='jobs_job_status_keyset_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.posted_by.email}"
     
+    def save(self, *args, **kwargs):
+        # Counters only change through F() updates; writing back the values
+        # loaded with this instance would undo increments made since
+        if not self._state.adding and not kwargs.get('force_insert') and not args:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [field.name for field in self._meta.concrete_fields if not field.primary_key]
+            kwargs['update_fields'] = [name for name in update_fields if name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+    
     @property
     def salary_range(self):
         if self.salary_min and self.salary_max:
@@ -0,0 +1,256 @@
+"""
+Pluggable full-text search backends for jobs.
+
+``get_search_backend()`` picks MySQL FULLTEXT or SQLite FTS5 depending on the
+database in use and falls back to ``icontains`` scans when neither index is
+available (or when ``JOB_SEARCH_BACKEND = 'icontains'``).
+``JOB_SEARCH_BACKEND = 'memory'`` uses the in-process index instead.
+"""
+import re
+import sqlite3
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Case, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Job
+
+SEARCH_FIELDS = ('title', 'description', 'requirements', 'category', 'location')
+
+FULLTEXT_INDEX_NAME = 'jobs_job_fulltext_idx'
+FTS_TABLE_NAME = 'jobs_job_fts'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(term):
+    return TOKEN_RE.findall(term.lower())
+
+
+class IContainsSearchBackend:
+    """Substring match on every search field; no ranking"""
+    name = 'icontains'
+
+    def is_available(self, connection):
+        return True
+
+    def search(self, queryset, term, rank=True):
+        query = reduce(or_, (Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS))
+        return queryset.filter(query)
+
+
+class MySQLFullTextSearchBackend:
+    """MATCH ... AGAINST over the FULLTEXT index from migration 0003"""
+    name = 'mysql'
+    vendor = 'mysql'
+
+    def is_available(self, connection):
+        return connection.vendor == self.vendor
+
+    def reset(self):
+        pass
+
+    def build_query(self, term):
+        min_size = settings.JOB_SEARCH_MYSQL_MIN_TOKEN_SIZE
+        tokens = [token for token in tokenize(term) if len(token) >= min_size]
+        # Every word is required; trailing * makes each one a prefix match
+        return ' '.join(f'+{token}*' for token in tokens)
+
+    def search(self, queryset, term, rank=True):
+        query = self.build_query(term)
+        if not query:
+            # Only words InnoDB does not index
+            return IContainsSearchBackend().search(queryset, term, rank)
+
+        table = Job._meta.db_table
+        columns = ', '.join(f'{table}.{field}' for field in SEARCH_FIELDS)
+        relevance = RawSQL(f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', [query])
+        queryset = queryset.annotate(search_rank=relevance).filter(search_rank__gt=0)
+        if rank:
+            queryset = queryset.order_by('-search_rank', '-created_at', '-id')
+        return queryset
+
+
+class SQLiteFTS5SearchBackend:
+    """MATCH against the FTS5 shadow table maintained by triggers"""
+    name = 'sqlite'
+    vendor = 'sqlite'
+
+    def __init__(self):
+        self._available = {}
+
+    def is_available(self, connection):
+        if connection.vendor != self.vendor:
+            return False
+        if connection.alias not in self._available:
+            self._available[connection.alias] = (
+                FTS_TABLE_NAME in connection.introspection.table_names()
+            )
+        return self._available[connection.alias]
+
+    def reset(self):
+        self._available.clear()
+
+    def build_query(self, term):
+        # Quote each token so user input cannot inject FTS5 operators
+        return ' AND '.join(f'"{token}"*' for token in tokenize(term))
+
+    def search(self, queryset, term, rank=True):
+        query = self.build_query(term)
+        if not query:
+            return IContainsSearchBackend().search(queryset, term, rank)
+
+        # A join with jobs_job would let SQLite scan the jobs and probe the FTS
+        # index once per row, which the paginator's COUNT(*) pays in full
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH %s', [query])
+        queryset = queryset.filter(id__in=matches)
+        if rank:
+            # FTS5 rank is bm25(), where lower is better. The CTE is materialized
+            # (SQLite 3.35+) so the MATCH runs once, not once per job; COUNT(*)
+            # leaves the annotation out
+            materialized = 'MATERIALIZED' if sqlite3.sqlite_version_info >= (3, 35) else ''
+            relevance = RawSQL(
+                f'WITH matches AS {materialized} ('
+                f'SELECT rowid AS job_id, -rank AS relevance FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH %s'
+                f') SELECT relevance FROM matches WHERE job_id = {Job._meta.db_table}.id',
+                [query],
+            )
+            queryset = queryset.annotate(search_rank=relevance).order_by('-search_rank', '-created_at', '-id')
+        return queryset
+
+
+class InMemorySearchBackend:
+    """BM25 over the per-worker inverted index in jobs.search_index"""
+    name = 'memory'
+    ranks_in_memory = True
+
+    def is_available(self, connection):
+        return True
+
+    def ranked_ids(self, term):
+        from .search_index import job_search_index
+        return job_search_index.ranked_ids(term, settings.JOB_SEARCH_INDEX_MAX_RESULTS)
+
+    def search(self, queryset, term, rank=True):
+        ids = self.ranked_ids(term)
+        queryset = queryset.filter(id__in=ids)
+        if rank and ids:
+            position = Case(*[When(id=pk, then=Value(index)) for index, pk in enumerate(ids)])
+            queryset = queryset.order_by(position)
+        return queryset
+
+
+FULLTEXT_BACKENDS = [MySQLFullTextSearchBackend(), SQLiteFTS5SearchBackend()]
+FALLBACK_BACKEND = IContainsSearchBackend()
+MEMORY_BACKEND = InMemorySearchBackend()
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Return the search backend configured by ``JOB_SEARCH_BACKEND``"""
+    choice = getattr(settings, 'JOB_SEARCH_BACKEND', 'auto')
+    if choice == FALLBACK_BACKEND.name:
+        return FALLBACK_BACKEND
+    if choice == MEMORY_BACKEND.name:
+        return MEMORY_BACKEND
+
+    connection = connections[using]
+    for backend in FULLTEXT_BACKENDS:
+        if backend.is_available(connection):
+            return backend
+    return FALLBACK_BACKEND
+
+
+def search_jobs(queryset, term, rank=True):
+    return get_search_backend(queryset.db).search(queryset, term, rank)
+
+
+def reset_search_backends():
+    """Forget cached index availability, e.g. after migrations ran"""
+    for backend in FULLTEXT_BACKENDS:
+        backend.reset()
+
+
+# Schema management, shared by migration 0003 and the post_migrate hook
+
+def create_mysql_fulltext_index(schema_editor):
+    table = Job._meta.db_table
+    schema_editor.execute(
+        f'CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} ON {table} ({", ".join(SEARCH_FIELDS)})'
+    )
+
+
+def drop_mysql_fulltext_index(schema_editor):
+    schema_editor.execute(f'DROP INDEX {FULLTEXT_INDEX_NAME} ON {Job._meta.db_table}')
+
+
+def sqlite_fts5_supported(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        options = {row[0] for row in cursor.fetchall()}
+    return 'ENABLE_FTS5' in options
+
+
+def install_sqlite_fts(connection):
+    """
+    Create the FTS5 table and its sync triggers if they are missing.
+
+    Safe to call repeatedly. SQLite drops triggers when Django rebuilds the
+    jobs table during a migration, so this also runs after every migrate.
+    Returns True if anything had to be (re)created.
+    """
+    table = Job._meta.db_table
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f'INSERT INTO {FTS_TABLE_NAME}(rowid, {columns}) VALUES (new.id, {new_values});'
+    statements = {
+        FTS_TABLE_NAME: (
+            f'CREATE VIRTUAL TABLE {FTS_TABLE_NAME} USING fts5('
+            f"{columns}, content='{table}', content_rowid='id')"
+        ),
+        f'{FTS_TABLE_NAME}_ai': (
+            f'CREATE TRIGGER {FTS_TABLE_NAME}_ai AFTER INSERT ON {table} BEGIN {insert_new} END'
+        ),
+        f'{FTS_TABLE_NAME}_ad': (
+            f'CREATE TRIGGER {FTS_TABLE_NAME}_ad AFTER DELETE ON {table} BEGIN {delete_old} END'
+        ),
+        f'{FTS_TABLE_NAME}_au': (
+            f'CREATE TRIGGER {FTS_TABLE_NAME}_au AFTER UPDATE ON {table} BEGIN '
+            f'{delete_old} {insert_new} END'
+        ),
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{FTS_TABLE_NAME}%'],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in statements if name not in existing]
+        for name in missing:
+            cursor.execute(statements[name])
+        if missing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES ('rebuild')")
+    return bool(missing)
+
+
+def uninstall_sqlite_fts(connection):
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE_NAME}_{suffix}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE_NAME}')
+
+
+def repair_sqlite_fts(using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver: restore FTS5 triggers dropped by table rebuilds"""
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and FTS_TABLE_NAME in connection.introspection.table_names():
+        install_sqlite_fts(connection)
+    reset_search_backends()
@@ -0,0 +1,186 @@
+"""
+In-process inverted index over active jobs with BM25 ranking.
+
+Each worker keeps its own copy. It is built lazily on first use (from the
+snapshot written by ``manage.py rebuild_search_index`` when one exists, then
+from the database), kept current by ``Job`` signals for writes made in this
+process, and caught up every ``JOB_SEARCH_INDEX_REFRESH_SECONDS`` for writes
+made by other workers.
+"""
+import math
+import pickle
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from .live_index import LiveJobIndex
+from .search import SEARCH_FIELDS, tokenize
+
+
+class InvertedIndex:
+    """Term -> {job id: term frequency} postings with Okapi BM25 scoring"""
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id, text):
+        self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        for term, frequency in counts.items():
+            if term not in self.postings:
+                self._vocabulary = None
+            self.postings[term][doc_id] = frequency
+        length = sum(counts.values())
+        self.doc_terms[doc_id] = tuple(counts)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+
+    def remove(self, doc_id):
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in self.doc_terms.pop(doc_id):
+            del self.postings[term][doc_id]
+            if not self.postings[term]:
+                del self.postings[term]
+                self._vocabulary = None
+
+    def expand(self, prefix):
+        """All indexed terms starting with ``prefix``"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, prefix)
+        terms = []
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            terms.append(vocabulary[position])
+            position += 1
+        return terms
+
+    def search(self, query, limit=None):
+        """
+        Return ``[(doc_id, score), ...]`` best first.
+
+        Like the database backends, every query word must match, and each
+        word also matches longer terms it is a prefix of.
+        """
+        words = tokenize(query)
+        if not words or not self.doc_lengths:
+            return []
+
+        doc_count = len(self.doc_lengths)
+        average_length = self.total_length / doc_count
+        scores = None
+        for word in words:
+            word_scores = defaultdict(float)
+            for term in self.expand(word):
+                docs = self.postings[term]
+                idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, frequency in docs.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    word_scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {
+                    doc_id: score + word_scores[doc_id]
+                    for doc_id, score in scores.items() if doc_id in word_scores
+                }
+            if not scores:
+                return []
+
+        # Newest first among equal scores, matching the SQL backends
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit] if limit else ranked
+
+
+def job_document(values):
+    return ' '.join(str(values[field] or '') for field in SEARCH_FIELDS)
+
+
+class JobSearchIndex(LiveJobIndex):
+    """Thread-safe, lazily built and periodically refreshed ``InvertedIndex``"""
+    fields = SEARCH_FIELDS
+    refresh_setting = 'JOB_SEARCH_INDEX_REFRESH_SECONDS'
+
+    def new_index(self):
+        return InvertedIndex()
+
+    def add(self, values):
+        self.index.add(values['id'], job_document(values))
+
+    def remove(self, job_id):
+        self.index.remove(job_id)
+
+    def indexed_ids(self):
+        return self.index.doc_lengths
+
+    def build(self):
+        """Load the snapshot if there is one, then catch up from the database"""
+        with self.lock:
+            if not self.load_snapshot():
+                self.load_database()
+            self.refresh(force=True)
+
+    def rebuild(self):
+        """Index every active job from scratch and rewrite the snapshot"""
+        with self.lock:
+            self.load_database()
+            self.refreshed_at = time.monotonic()
+            path = getattr(settings, 'JOB_SEARCH_INDEX_PATH', None)
+            if path:
+                self.save_snapshot(path)
+
+    def search(self, query, limit=None):
+        self.ensure_built()
+        with self.lock:
+            return self.index.search(query, limit)
+
+    def ranked_ids(self, query, limit=None):
+        return [doc_id for doc_id, score in self.search(query, limit)]
+
+    # Snapshots
+
+    def save_snapshot(self, path):
+        with self.lock:
+            with open(path, 'wb') as snapshot:
+                pickle.dump({'index': self.index, 'watermark': self.watermark}, snapshot)
+
+    def load_snapshot(self):
+        path = getattr(settings, 'JOB_SEARCH_INDEX_PATH', None)
+        if not path:
+            return False
+        try:
+            with open(path, 'rb') as snapshot:
+                state = pickle.load(snapshot)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        self.index = state['index']
+        self.watermark = state['watermark']
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                'documents': len(self.index) if self.index else 0,
+                'terms': len(self.index.postings) if self.index else 0,
+                'watermark': self.watermark.isoformat() if self.watermark else None,
+            }
+
+
+job_search_index = JobSearchIndex()
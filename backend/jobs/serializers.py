@@ -1,12 +1,32 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Job, SavedJob
 from accounts.serializers import UserSerializer
 
 
+class JobListSerializer(serializers.ListSerializer):
+    """Resolve the current user's saved jobs with one query per page"""
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        jobs = list(iterable)
+        
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            self.context['saved_job_ids'] = set(
+                SavedJob.objects.filter(
+                    user=request.user,
+                    job_id__in=[job.id for job in jobs]
+                ).values_list('job_id', flat=True)
+            )
+        
+        return [self.child.to_representation(job) for job in jobs]
+
+
 class JobSerializer(serializers.ModelSerializer):
     posted_by = UserSerializer(read_only=True)
     salary_range = serializers.ReadOnlyField()
-    application_count = serializers.SerializerMethodField()
+    application_count = serializers.IntegerField(source='applications_total', read_only=True)
     is_saved = serializers.SerializerMethodField()
     
     class Meta:
@@ -18,11 +38,12 @@ class JobSerializer(serializers.ModelSerializer):
             'remote', 'created_at', 'updated_at', 'application_count', 'is_saved'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'application_count']
-    
-    def get_application_count(self, obj):
-        return obj.applications.count()
+        list_serializer_class = JobListSerializer
     
     def get_is_saved(self, obj):
+        saved_job_ids = self.context.get('saved_job_ids')
+        if saved_job_ids is not None:
+            return obj.id in saved_job_ids
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return SavedJob.objects.filter(user=request.user, job=obj).exists()
@@ -44,6 +65,14 @@ class JobCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class JobExportSerializer(serializers.ModelSerializer):
+    """Flat rows that import_jobs accepts back (id and status are ignored on import)"""
+    
+    class Meta:
+        model = Job
+        fields = ['id', 'status'] + JobCreateSerializer.Meta.fields + ['created_at']
+
+
 class SavedJobSerializer(serializers.ModelSerializer):
     job = JobSerializer(read_only=True)
     
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from accounts.serializers import UserSerializer
+from applications.models import Application
+from .cache import bump_version
+from .filter_index import job_filter_index
+from .models import Job
+from .search_index import job_search_index
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, **kwargs):
+    """Keep this worker's search and filter indexes in step with committed job writes"""
+    transaction.on_commit(lambda: job_search_index.update_job(instance))
+    transaction.on_commit(lambda: job_filter_index.update_job(instance))
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    job_id = instance.id
+    transaction.on_commit(lambda: job_search_index.remove_job(job_id))
+    transaction.on_commit(lambda: job_filter_index.remove_job(job_id))
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_save, sender=Application)
+def application_created(sender, instance, created, **kwargs):
+    """Cached job responses include application counts"""
+    if created:
+        transaction.on_commit(bump_version)
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_save, sender=User)
+def poster_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Cached job responses nest the poster's public fields"""
+    if created or (update_fields is not None and not set(update_fields) & set(UserSerializer.Meta.fields)):
+        return
+    if Job.objects.filter(posted_by=instance).exists():
+        transaction.on_commit(bump_version)
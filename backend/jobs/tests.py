@@ -0,0 +1,559 @@
+import csv
+import io
+import json
+import time
+from base64 import b64encode
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import parse_http_date
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User
+from jobportal.streaming import iter_csv
+from applications.models import Application
+from .cache import response_cache
+from .counters import counter_fields
+from .filter_index import BitmapIndex, job_filter_index
+from .models import Job
+from .search import get_search_backend
+from .serializers import JobExportSerializer, JobSerializer
+
+
+def make_job(employer, **fields):
+    values = {
+        'title': 'Backend Engineer', 'description': 'Build APIs', 'category': 'Engineering',
+        'location': 'Remote', 'requirements': 'Python', 'status': 'active', 'posted_by': employer,
+    }
+    values.update(fields)
+    return Job.objects.create(**values)
+
+
+class JobCounterSaveTests(TestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.seeker = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.job = make_job(self.employer)
+
+    def test_counter_fields_match_model(self):
+        self.assertEqual(set(Job.COUNTER_FIELDS), set(counter_fields()))
+
+    def test_stale_save_keeps_counters(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        Application.objects.create(job=self.job, applicant=self.seeker)
+
+        stale.title = 'Senior Backend Engineer'
+        stale.save()
+
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.title, 'Senior Backend Engineer')
+        self.assertEqual(job.applications_total, 1)
+        self.assertEqual(job.applications_pending, 1)
+
+    def test_update_fields_cannot_write_counters(self):
+        Application.objects.create(job=self.job, applicant=self.seeker)
+        self.job.status = 'closed'
+        self.job.applications_total = 0
+        self.job.save(update_fields=['status', 'applications_total'])
+
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(job.status, 'closed')
+        self.assertEqual(job.applications_total, 1)
+
+    def test_edit_and_moderation_keep_counters(self):
+        Application.objects.create(job=self.job, applicant=self.seeker)
+        client = APIClient()
+
+        client.force_authenticate(self.employer)
+        response = client.patch(f'/api/jobs/{self.job.pk}/', {'title': 'Platform Engineer'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        admin = User.objects.create_superuser(email='admin@example.com', username='admin', password=None)
+        client.force_authenticate(admin)
+        response = client.put(f'/api/admin/jobs/{self.job.pk}/moderate/', {'action': 'reject'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual((job.title, job.status), ('Platform Engineer', 'closed'))
+        self.assertEqual(job.applications_total, 1)
+
+
+class JobListQueryTests(TestCase):
+    """JobSerializer pages cost the same queries however many jobs they hold"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.seeker = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.client.force_authenticate(self.seeker)
+
+    def test_job_list(self):
+        for size in (1, 5, 20):
+            for number in range(Job.objects.count(), size):
+                job = make_job(self.employer, title=f'Job {number}')
+                Application.objects.create(job=job, applicant=self.seeker)
+            # The page and the user's saved jobs among it
+            with self.subTest(jobs=size), self.assertNumQueries(2):
+                response = self.client.get('/api/jobs/')
+            self.assertEqual(len(response.data['results']), min(size, 10))
+            self.assertEqual(response.data['results'][0]['application_count'], 1)
+
+    def test_serializer_many(self):
+        request = APIRequestFactory().get('/api/jobs/')
+        request.user = self.seeker
+        for size in (1, 5, 20):
+            for number in range(Job.objects.count(), size):
+                make_job(self.employer, title=f'Job {number}')
+            # The jobs with their posters, and the user's saved jobs among them
+            with self.subTest(jobs=size), self.assertNumQueries(2):
+                data = JobSerializer(Job.objects.for_listing(), many=True, context={'request': request}).data
+            self.assertEqual(len(data), size)
+
+
+@override_settings(JOB_SEARCH_BACKEND='auto', JOB_RESPONSE_CACHE_TTL=0)
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.python = make_job(employer, title='Python Developer', requirements='Python, Python, Python')
+        self.mention = make_job(employer, title='Backend Engineer', requirements='Go and some Python')
+        make_job(employer, title='Designer', description='Figma', requirements='Figma')
+        self.backend = get_search_backend()
+
+    def test_matches_ranked_without_joining_for_count(self):
+        if self.backend.name != 'sqlite':
+            self.skipTest('SQLite FTS5 is not available')
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get('/api/jobs/search/?search=pyth')
+        self.assertEqual([job['id'] for job in response.data['results']], [self.python.id, self.mention.id])
+        self.assertEqual(response.data['count'], 2)
+        count = next(query['sql'] for query in queries if 'COUNT(*)' in query['sql'])
+        self.assertNotIn('rank', count)
+        self.assertNotIn('"jobs_job" ,', count)
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTL=60)
+class ResponseCacheValidatorTests(TestCase):
+    """Last-Modified on cached anonymous pages moves with every change the ETag sees"""
+
+    def setUp(self):
+        response_cache().clear()
+        self.addCleanup(response_cache().clear)
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.seeker = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.kept = make_job(self.employer, title='Kept')
+        self.closed = make_job(self.employer, title='Closed')
+        self.client = APIClient()
+        self.clock = int(time.time())
+
+    def change(self, write):
+        """Run ``write`` a minute after the previous change"""
+        self.clock += 60
+        with mock.patch('jobs.cache.time.time', return_value=self.clock):
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+
+    def test_if_modified_since_sees_changes_without_newer_updated_at(self):
+        for path in ('/api/jobs/', '/api/jobs/search/?search=Kept'):
+            with self.subTest(path=path):
+                modified = self.client.get(path)['Last-Modified']
+                self.assertEqual(self.client.get(path, HTTP_IF_MODIFIED_SINCE=modified).status_code, 304)
+
+        for write in (
+            lambda: Application.objects.create(job=self.kept, applicant=self.seeker),
+            lambda: Job.objects.filter(pk=self.closed.pk).get().delete(),
+        ):
+            before = self.client.get('/api/jobs/')['Last-Modified']
+            self.change(write)
+            response = self.client.get('/api/jobs/', HTTP_IF_MODIFIED_SINCE=before)
+            self.assertEqual(response.status_code, 200)
+            self.assertGreater(parse_http_date(response['Last-Modified']), parse_http_date(before))
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTL=60)
+class JobDetailValidatorTests(TestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.job = make_job(self.employer)
+
+    def test_poster_edit_changes_validators(self):
+        for path in (f'/api/jobs/{self.job.pk}/', f'/api/async/jobs/{self.job.pk}/'):
+            with self.subTest(path=path):
+                client = APIClient()
+                etag = client.get(path)['ETag']
+                self.assertEqual(client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.employer.phone_number = '+1 555 0100'
+                    self.employer.save()
+                response = client.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['posted_by']['phone_number'], '+1 555 0100')
+
+
+class BitmapIndexTests(SimpleTestCase):
+    def doc(self, job_id, category='Engineering', remote=False, salary_min=None, salary_max=None, created_at=0):
+        return {
+            'id': job_id, 'category': category, 'job_type': 'full_time', 'is_internship': False, 'remote': remote,
+            'location': 'Berlin', 'salary_min': salary_min, 'salary_max': salary_max,
+            'created_at': datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=created_at),
+        }
+
+    def test_slots_follow_active_jobs_not_ids(self):
+        index = BitmapIndex()
+        for job_id in (10, 5_000_000, 90_000_000):
+            index.add(self.doc(job_id))
+        self.assertEqual(sorted(index.slots.values()), [0, 1, 2])
+
+        index.remove(5_000_000)
+        index.add(self.doc(123_456_789, category='Design', remote=True))
+        self.assertEqual(len(index.jobs), 3)
+        self.assertEqual(index.seek(index.match(QueryDict('category=Engineering'))), [90_000_000, 10])
+        self.assertEqual(index.seek(index.match(QueryDict('remote=true'))), [123_456_789])
+        self.assertEqual(index.keep([5_000_000, 10, 123_456_789], index.match(QueryDict(''))), [10, 123_456_789])
+
+    def test_seek_pages_in_listing_order(self):
+        index = BitmapIndex()
+        for job_id in range(1, 101):
+            # Every four jobs share a timestamp, so ties fall back to the id
+            index.add(self.doc(job_id, category='Design' if job_id % 3 else 'Engineering', created_at=job_id // 4))
+        for query in ('', 'category=Engineering'):
+            with self.subTest(query=query):
+                bits = index.match(QueryDict(query))
+                newest_first = sorted(index.seek(bits, count=1000), key=lambda job_id: (job_id // 4, job_id))[::-1]
+                self.assertEqual(index.seek(bits, count=1000), newest_first)
+
+                after = newest_first[9]
+                key = (index.created[after], after)
+                self.assertEqual(index.seek(bits, key, count=5), newest_first[10:15])
+                self.assertEqual(index.seek(bits, key, count=5, reverse=True), newest_first[8:3:-1])
+
+    def test_salary_ranges_follow_updates(self):
+        index = BitmapIndex()
+        index.add(self.doc(1, salary_min=1500.0, salary_max=2500.0))
+        index.add(self.doc(2, salary_min=Decimal('3000'), salary_max=Decimal('4000')))
+        index.add(self.doc(1, salary_min=Decimal('5000'), salary_max=Decimal('6000')))
+
+        self.assertEqual(index.seek(index.match(QueryDict('salary_max=2000'))), [])
+        self.assertEqual(index.seek(index.match(QueryDict('salary_min=3500&salary_max=4500'))), [2])
+        self.assertEqual(index.seek(index.match(QueryDict('salary_min=4500'))), [1])
+        index.remove(1)
+        self.assertEqual(index.sorted_amounts, {'salary_min': [Decimal('3000')], 'salary_max': [Decimal('4000')]})
+
+
+def encode_cursor(querystring):
+    return b64encode(querystring.encode()).decode()
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTL=0)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        jobs = [make_job(employer, title=f'Job {number}') for number in range(8)]
+        # Three jobs share each timestamp, so the id has to break the ties
+        for number, job in enumerate(jobs):
+            Job.objects.filter(pk=job.pk).update(created_at=datetime(2024, 1, 1 + number // 3, tzinfo=timezone.utc))
+        self.newest_first = list(Job.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.client = APIClient()
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append([job['id'] for job in data['results']])
+            url, last = data[link], data
+        return pages, last
+
+    def test_cursor_round_trip(self):
+        forward, last = self.walk('/api/jobs/?page_size=3', 'next')
+        self.assertEqual(forward, [self.newest_first[0:3], self.newest_first[3:6], self.newest_first[6:8]])
+
+        # Back from the last page through the previous links, one page at a time
+        backward, first = self.walk(last['previous'], 'previous')
+        self.assertEqual(backward, [self.newest_first[3:6], self.newest_first[0:3]])
+        self.assertIsNone(first['previous'])
+        self.assertEqual(self.walk(first['next'], 'next')[0], forward[1:])
+
+    def test_ties_keep_their_order_across_page_boundaries(self):
+        for page_size in (1, 2, 4):
+            with self.subTest(page_size=page_size):
+                pages, _ = self.walk(f'/api/jobs/?page_size={page_size}', 'next')
+                self.assertEqual(sum(pages, []), self.newest_first)
+
+    def test_malformed_cursors_are_not_found(self):
+        job = Job.objects.get(pk=self.newest_first[0])
+        for cursor in (
+            'not base64!',
+            encode_cursor('i=1'),
+            encode_cursor(f'v={job.created_at.isoformat()}'),
+            encode_cursor(f'v={job.created_at.isoformat()}&i=one'),
+            encode_cursor('v=yesterday&i=1'),
+            b64encode('v=\u00e9&i=1'.encode()).decode(),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/jobs/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+    def test_edited_cursor_seeks_from_its_key(self):
+        # Cursors are positions, not credentials: a hand-made one is just another key
+        job = Job.objects.get(pk=self.newest_first[4])
+        cursor = encode_cursor(urlencode({'v': job.created_at.isoformat(), 'i': job.pk}))
+        response = self.client.get('/api/jobs/', {'cursor': cursor, 'page_size': 2})
+        self.assertEqual([job['id'] for job in response.json()['results']], self.newest_first[5:7])
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTL=0)
+class JobFilterIndexPageTests(TestCase):
+    """With JOB_FILTER_INDEX on, job_search pages keep the keyset cursor contract"""
+
+    def setUp(self):
+        employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        for number in range(25):
+            make_job(employer, title=f'Job {number}', remote=number % 2 == 0)
+        self.client = APIClient()
+
+    def tearDown(self):
+        # Signals kept the index in step with rows this test rolls back
+        job_filter_index.index = None
+
+    def walk(self, url, link='next'):
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(([job['id'] for job in data['results']], sorted(data)))
+            url = data[link]
+        return pages, data['previous']
+
+    def test_pages_match_database_filters(self):
+        for path in ('/api/jobs/search/?remote=true&page_size=4', '/api/async/jobs/search/?page_size=10'):
+            with self.subTest(path=path):
+                with override_settings(JOB_FILTER_INDEX=False):
+                    forward, last_previous = self.walk(path)
+                    backward = self.walk(last_previous, link='previous')
+                self.assertEqual(forward[0][1], ['next', 'previous', 'results'])
+                self.assertGreater(len(forward), 1)
+
+                job_filter_index.build()
+                with override_settings(JOB_FILTER_INDEX=True):
+                    self.assertEqual(self.walk(path), (forward, last_previous))
+                    self.assertEqual(self.walk(last_previous, link='previous'), backward)
+
+
+def ndjson(*rows):
+    return ''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows)
+
+
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def row(self, title, **fields):
+        return {
+            'title': title, 'description': 'Build APIs', 'category': 'Engineering',
+            'location': 'Remote', 'requirements': 'Python', **fields,
+        }
+
+    def post(self, body, content_type='application/x-ndjson', **params):
+        return self.client.post(f'/api/jobs/bulk/import/?{urlencode(params)}', body, content_type=content_type)
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        response = self.post(ndjson(
+            self.row('First'), '{"title": ', '', self.row('Second', job_type='weekends'), '["not", "a", "row"]',
+            self.row('Third', salary_min='85000'),
+        ))
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['created'], data['failed']), (2, 3))
+        # Blank lines are not counted as rows
+        self.assertEqual([error['row'] for error in data['errors']], [2, 3, 4])
+        self.assertIn('Invalid JSON', data['errors'][0]['errors']['non_field_errors'][0])
+        self.assertEqual(list(data['errors'][1]['errors']), ['job_type'])
+        self.assertEqual(data['errors'][2]['errors'], {'non_field_errors': ['Each line must be a JSON object']})
+
+        jobs = Job.objects.order_by('id')
+        self.assertEqual([job.title for job in jobs], ['First', 'Third'])
+        self.assertEqual({(job.status, job.posted_by_id) for job in jobs}, {('active', self.employer.pk)})
+        self.assertEqual(jobs[1].salary_min, Decimal('85000'))
+
+    def test_nothing_valid_is_a_bad_request(self):
+        response = self.post(ndjson({'title': 'No description'}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], 0)
+        self.assertEqual(response.json()['errors'][0]['row'], 1)
+
+    def test_error_list_is_capped(self):
+        with self.settings(JOB_IMPORT_MAX_ERRORS=2):
+            response = self.post(ndjson(*[{'title': f'Job {number}'} for number in range(5)]), batch_size=2)
+        self.assertEqual(response.json()['failed'], 5)
+        self.assertEqual([error['row'] for error in response.json()['errors']], [1, 2])
+
+    def test_rows_are_inserted_a_batch_at_a_time(self):
+        body = ndjson(*[self.row(f'Job {number}') for number in range(5)])
+        with mock.patch.object(Job.objects, 'bulk_create', wraps=Job.objects.bulk_create) as bulk_create:
+            response = self.post(body, batch_size=2)
+        self.assertEqual(response.json()['created'], 5)
+        self.assertEqual([len(call.args[0]) for call in bulk_create.call_args_list], [2, 2, 1])
+
+    def test_csv_upload_leaves_empty_cells_to_model_defaults(self):
+        upload = SimpleUploadedFile('jobs.csv', (
+            '\ufefftitle,description,category,location,requirements,job_type,salary_currency\n'
+            'Data Engineer,Pipelines,Data,Berlin,SQL,,\n'
+            'Designer,Screens,Design,Remote,Figma,contract,EUR\n'
+            'Extra,Cells,Design,Remote,Figma,contract,EUR,surplus\n'
+        ).encode(), content_type='text/csv')
+        response = self.client.post('/api/jobs/bulk/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['errors'], [
+            {'row': 3, 'errors': {'non_field_errors': ['Row has more values than the header']}},
+        ])
+        self.assertEqual(
+            list(Job.objects.order_by('id').values_list('title', 'job_type', 'salary_currency')),
+            [('Data Engineer', 'full_time', 'USD'), ('Designer', 'contract', 'EUR')],
+        )
+
+    def test_unknown_format_and_non_employers_are_refused(self):
+        upload = SimpleUploadedFile('jobs.txt', b'title\n', content_type='text/plain')
+        response = self.client.post('/api/jobs/bulk/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+        seeker = User.objects.create_user(email='seeker@example.com', username='seeker', role='job_seeker')
+        self.client.force_authenticate(seeker)
+        self.assertEqual(self.post(ndjson(self.row('First'))).status_code, 403)
+        self.assertEqual(self.client.get('/api/jobs/bulk/export/?export=csv').status_code, 403)
+
+    def export(self, export_format, **params):
+        response = self.client.get('/api/jobs/bulk/export/', {'export': export_format, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_exports_stream_the_employers_jobs(self):
+        other = User.objects.create_user(email='other@example.com', username='other', role='employer')
+        make_job(other, title='Not mine')
+        for number in range(3):
+            make_job(self.employer, title=f'Job {number}', salary_min=Decimal('1000') * (number + 1))
+        make_job(self.employer, title='Draft', status='draft')
+
+        lines = self.export('ndjson', status='active', salary_max='2000').splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Job 1', 'Job 0'])
+
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        self.assertEqual([row['title'] for row in rows], ['Draft', 'Job 2', 'Job 1', 'Job 0'])
+        self.assertEqual(rows[1]['salary_min'], '3000.00')
+
+        response = self.client.get('/api/jobs/bulk/export/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_streams_in_chunks(self):
+        for number in range(5):
+            make_job(self.employer, title=f'Job {number}')
+        chunks = list(iter_csv(Job.objects.order_by('id'), JobExportSerializer, chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(chunks[0].startswith('id,status,title,'))
+        self.assertEqual(sum(chunk.count('\r\n') for chunk in chunks), 6)
+
+    def test_export_imports_back(self):
+        make_job(self.employer, title='Round trip', job_type='contract', salary_min=Decimal('5000'), remote=True)
+        response = self.post(self.export('csv'), content_type='text/csv')
+        self.assertEqual(response.json(), {'created': 1, 'failed': 0, 'errors': []})
+        copy = Job.objects.order_by('id').last()
+        self.assertEqual(
+            (copy.title, copy.job_type, copy.salary_min, copy.remote), ('Round trip', 'contract', Decimal('5000'), True)
+        )
+
+
+def facet_values(facets, field):
+    return [(item['value'], item['count']) for item in facets['facets'][field]]
+
+
+@override_settings(JOB_RESPONSE_CACHE_TTL=0)
+class JobFacetTests(TestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(email='employer@example.com', username='employer', role='employer')
+        make_job(self.employer, title='API Engineer', remote=True)
+        make_job(self.employer, title='Platform Engineer', remote=True)
+        make_job(self.employer, title='Data Engineer', location='Berlin', job_type='contract')
+        make_job(self.employer, title='Design Intern', category='Design', location='Berlin', is_internship=True)
+        make_job(self.employer, title='Draft Designer', category='Design', status='draft')
+        make_job(self.employer, title='Closed Engineer', status='closed')
+        self.client = APIClient()
+        response_cache().clear()
+
+    def tearDown(self):
+        job_filter_index.index = None
+
+    def facets(self, path='/api/jobs/search/', **params):
+        """The facets=only response from the database and from the filter index, which must agree"""
+        results = []
+        for use_index in (False, True):
+            # Facets are cached by filter signature alone, whichever path computed them
+            response_cache().clear()
+            with override_settings(JOB_FILTER_INDEX=use_index):
+                response = self.client.get(path, {'facets': 'only', **params})
+            self.assertEqual(response.status_code, 200)
+            results.append(response.json())
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_counts_cover_active_jobs(self):
+        facets = self.facets()
+        self.assertEqual(facets['count'], 4)
+        self.assertEqual(facet_values(facets, 'category'), [('Engineering', 3), ('Design', 1)])
+        self.assertEqual(facet_values(facets, 'location'), [('Berlin', 2), ('Remote', 2)])
+        self.assertEqual(facet_values(facets, 'job_type'), [('full_time', 3), ('contract', 1)])
+        self.assertEqual(facet_values(facets, 'remote'), [(False, 2), (True, 2)])
+        self.assertEqual(facet_values(facets, 'is_internship'), [(False, 3), (True, 1)])
+
+    def test_counts_follow_every_active_filter(self):
+        facets = self.facets(category='Engineering')
+        self.assertEqual(facets['count'], 3)
+        # The facet's own filter applies too, so the other categories drop out
+        self.assertEqual(facet_values(facets, 'category'), [('Engineering', 3)])
+        self.assertEqual(facet_values(facets, 'location'), [('Remote', 2), ('Berlin', 1)])
+
+        facets = self.facets(location='berl', remote='false')
+        self.assertEqual(facets['count'], 2)
+        self.assertEqual(facet_values(facets, 'category'), [('Design', 1), ('Engineering', 1)])
+        self.assertEqual(facet_values(facets, 'remote'), [(False, 2)])
+
+        facets = self.facets(category='Engineering', is_internship='true')
+        self.assertEqual(facets['count'], 0)
+        self.assertEqual(facets['facets']['category'], [])
+
+    def test_facets_alongside_the_page(self):
+        for path in ('/api/jobs/search/', '/api/async/jobs/search/'):
+            with self.subTest(path=path):
+                response_cache().clear()
+                data = self.client.get(path, {'facets': 'true', 'category': 'Engineering'}).json()
+                self.assertEqual(len(data['results']), 3)
+                self.assertEqual(facet_values(data, 'category'), [('Engineering', 3)])
+                self.assertEqual(self.facets(path, category='Engineering')['facets'], data['facets'])
+
+        self.assertNotIn('facets', self.client.get('/api/jobs/search/', {'category': 'Engineering'}).json())
+
+    def test_page_parameters_share_the_cached_counts(self):
+        self.facets(category='Engineering')
+        with self.assertNumQueries(0):
+            self.client.get('/api/jobs/search/', {'facets': 'only', 'category': 'Engineering', 'page_size': 1})
+
+    @override_settings(JOB_FACETS_LIMIT=1)
+    def test_values_are_limited_per_facet(self):
+        facets = self.facets()
+        self.assertEqual(facet_values(facets, 'category'), [('Engineering', 3)])
+        self.assertEqual(facet_values(facets, 'location'), [('Berlin', 2)])
+
+    def test_job_writes_invalidate_cached_counts(self):
+        self.assertEqual(self.client.get('/api/jobs/search/', {'facets': 'only'}).json()['count'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.employer, title='Second Designer', category='Design')
+        facets = self.client.get('/api/jobs/search/', {'facets': 'only'}).json()
+        self.assertEqual(facet_values(facets, 'category'), [('Engineering', 3), ('Design', 2)])
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     JobListCreateView, JobDetailView, job_search,
-    saved_job_toggle, saved_jobs_list
+    saved_job_toggle, saved_jobs_list, bulk_import_jobs, bulk_export_jobs
 )
 
 urlpatterns = [
@@ -10,5 +10,7 @@ urlpatterns = [
     path('search/', job_search, name='job-search'),
     path('<int:job_id>/save/', saved_job_toggle, name='save-job'),
     path('saved/', saved_jobs_list, name='saved-jobs'),
+    path('bulk/import/', bulk_import_jobs, name='job-bulk-import'),
+    path('bulk/export/', bulk_export_jobs, name='job-bulk-export'),
 ]
 
@@ -1,22 +1,34 @@
 from rest_framework import generics, permissions, filters
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Exists, Max, OuterRef, Prefetch
+from jobportal.conditional import conditional_response, make_etag, to_timestamp
+from jobportal.pagination import KeysetPagination
+from jobportal.streaming import export_response, ndjson_response, wants_stream
+from .bulk import IMPORT_FORMATS, detect_format, import_jobs, read_rows
+from .cache import cached_response
+from .facets import job_facets, wants_facets
+from .filter_index import filter_index_enabled, job_filter_index
+from .filters import JobSearchFilter, filter_jobs, has_job_filters
 from .models import Job, SavedJob
-from .serializers import JobSerializer, JobCreateSerializer, SavedJobSerializer
+from .search import get_search_backend
+from .serializers import JobSerializer, JobCreateSerializer, JobExportSerializer, SavedJobSerializer
 
 
 class JobListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetPagination
+    # JobSearchFilter runs last so relevance ranking survives the default ordering
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, JobSearchFilter]
     filterset_fields = ['category', 'location', 'job_type', 'is_internship', 'remote', 'status']
-    search_fields = ['title', 'description', 'category', 'location', 'requirements']
     ordering_fields = ['created_at', 'salary_min', 'salary_max']
     ordering = ['-created_at']
     
     def get_queryset(self):
-        queryset = Job.objects.filter(status='active')
+        queryset = Job.objects.filter(status='active').for_listing()
         
         # Filter by salary range if provided
         salary_min = self.request.query_params.get('salary_min', None)
@@ -29,6 +41,14 @@ class JobListCreateView(generics.ListCreateAPIView):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        if wants_stream(request):
+            queryset = self.filter_queryset(self.get_queryset())
+            return ndjson_response(queryset, JobSerializer, self.get_serializer_context())
+        return cached_response(
+            request, 'job-list', lambda: super(JobListCreateView, self).list(request, *args, **kwargs)
+        )
+    
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return JobCreateSerializer
@@ -41,7 +61,7 @@ class JobListCreateView(generics.ListCreateAPIView):
 
 
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.all()
+    queryset = Job.objects.for_listing()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_serializer_class(self):
@@ -59,6 +79,30 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
     
+    def retrieve(self, request, *args, **kwargs):
+        etag, modified = self.get_validators(kwargs['pk'])
+        return conditional_response(request, etag, modified, lambda: cached_response(
+            request, f"job-detail:{kwargs['pk']}",
+            lambda: super(JobDetailView, self).retrieve(request, *args, **kwargs)
+        ))
+    
+    def get_validators(self, pk):
+        """ETag and Last-Modified from one single-row query, before any serialization"""
+        user = self.request.user
+        saved = SavedJob.objects.filter(job=OuterRef('pk'), user_id=user.id if user.is_authenticated else None)
+        row = Job.objects.filter(pk=pk).annotate(
+            last_applied=Max('applications__applied_date'),
+            saved=Exists(saved),
+        ).values('updated_at', 'applications_total', 'last_applied', 'saved', 'posted_by__updated_at').first()
+        if row is None:
+            return None, None
+        # The body nests the poster, so an edit to their account changes it too
+        etag = make_etag(
+            'job', pk, row['updated_at'].isoformat(), row['posted_by__updated_at'].isoformat(),
+            row['applications_total'], row['saved'], self.request.accepted_renderer.format,
+        )
+        return etag, to_timestamp(row['updated_at'], row['last_applied'], row['posted_by__updated_at'])
+    
     def perform_update(self, serializer):
         job = self.get_object()
         if job.posted_by != self.request.user and not self.request.user.is_admin:
@@ -75,48 +119,82 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
 @permission_classes([permissions.AllowAny])
 def job_search(request):
     """Advanced job search endpoint"""
-    queryset = Job.objects.filter(status='active')
+    # ?stream=ndjson returns every match without building a page in memory
+    if wants_stream(request):
+        return search_results(request)
+    return cached_response(request, 'job-search', lambda: search_with_facets(request))
+
+
+def search_with_facets(request):
+    """?facets=true adds per-filter counts to the page; ?facets=only returns just the counts"""
+    if not wants_facets(request):
+        return search_results(request)
+    facets = job_facets(request.query_params)
+    if request.query_params.get('facets').lower() == 'only':
+        return Response(facets)
+    response = search_results(request)
+    response.data['facets'] = facets['facets']
+    return response
+
+
+def search_results(request):
+    queryset = Job.objects.filter(status='active').for_listing()
     
     # Text search
     search = request.query_params.get('search', '')
+    backend = get_search_backend()
+    if search and getattr(backend, 'ranks_in_memory', False) and not wants_stream(request):
+        return ranked_search_response(request, backend.ranked_ids(search))
     if search:
-        queryset = queryset.filter(
-            Q(title__icontains=search) |
-            Q(description__icontains=search) |
-            Q(category__icontains=search)
-        )
-    
-    # Filters
-    category = request.query_params.get('category')
-    if category:
-        queryset = queryset.filter(category=category)
-    
-    location = request.query_params.get('location')
-    if location:
-        queryset = queryset.filter(location__icontains=location)
-    
-    job_type = request.query_params.get('job_type')
-    if job_type:
-        queryset = queryset.filter(job_type=job_type)
+        queryset = backend.search(queryset, search)
+    elif filter_index_enabled() and not wants_stream(request):
+        # Filters resolve in memory; the database only loads the page
+        return index_page_response(request)
     
-    is_internship = request.query_params.get('is_internship')
-    if is_internship:
-        queryset = queryset.filter(is_internship=is_internship.lower() == 'true')
+    queryset = filter_jobs(queryset, request.query_params)
     
-    remote = request.query_params.get('remote')
-    if remote:
-        queryset = queryset.filter(remote=remote.lower() == 'true')
+    if wants_stream(request):
+        return ndjson_response(queryset, JobSerializer, {'request': request})
     
-    # Salary range
-    salary_min = request.query_params.get('salary_min')
-    salary_max = request.query_params.get('salary_max')
-    if salary_min:
-        queryset = queryset.filter(salary_max__gte=salary_min)
-    if salary_max:
-        queryset = queryset.filter(salary_min__lte=salary_max)
-    
-    serializer = JobSerializer(queryset, many=True, context={'request': request})
-    return Response(serializer.data)
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = JobSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+
+def ranked_search_response(request, ranked_ids):
+    """Paginate job ids ranked in memory, loading only the returned page"""
+    if has_job_filters(request.query_params):
+        if filter_index_enabled():
+            ranked_ids = job_filter_index.filter_ids(ranked_ids, request.query_params)
+        else:
+            matching = set(
+                filter_jobs(Job.objects.filter(id__in=ranked_ids), request.query_params)
+                .values_list('id', flat=True)
+            )
+            ranked_ids = [pk for pk in ranked_ids if pk in matching]
+    return id_page_response(request, ranked_ids)
+
+
+def index_page_response(request):
+    """Keyset page of the jobs matching the filters, found in the filter index"""
+    paginator = KeysetPagination()
+    cursor = paginator.read_cursor(request)
+    page_ids = job_filter_index.page_ids(request.query_params, cursor, paginator.page_size + 1)
+    jobs = Job.objects.filter(status='active').for_listing().in_bulk(page_ids)
+    page = paginator.build_page([jobs[pk] for pk in page_ids if pk in jobs], cursor)
+    serializer = JobSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+
+def id_page_response(request, ids):
+    """Paginate an ordered list of job ids, loading only the returned page"""
+    paginator = PageNumberPagination()
+    page_ids = paginator.paginate_queryset(ids, request)
+    jobs = Job.objects.filter(status='active').for_listing().in_bulk(page_ids)
+    page = [jobs[pk] for pk in page_ids if pk in jobs]
+    serializer = JobSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['POST', 'DELETE'])
@@ -150,6 +228,70 @@ def saved_job_toggle(request, job_id):
 @permission_classes([permissions.IsAuthenticated])
 def saved_jobs_list(request):
     """Get all saved jobs for the current user"""
-    saved_jobs = SavedJob.objects.filter(user=request.user).order_by('-saved_at')
-    serializer = SavedJobSerializer(saved_jobs, many=True)
+    saved_jobs = list(
+        SavedJob.objects.filter(user=request.user).prefetch_related(
+            Prefetch('job', queryset=Job.objects.for_listing())
+        ).order_by('-saved_at')
+    )
+    serializer = SavedJobSerializer(saved_jobs, many=True, context={
+        'request': request,
+        # Every job in this list is saved by definition
+        'saved_job_ids': {saved_job.job_id for saved_job in saved_jobs},
+    })
     return Response(serializer.data)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_import_jobs(request):
+    """
+    Create many jobs from a CSV or NDJSON upload (multipart ``file``) or a raw
+    text/csv or application/x-ndjson request body
+    """
+    if not (request.user.is_employer or request.user.is_admin):
+        return Response({'error': 'Only employers can import jobs'}, status=403)
+    
+    import_format = request.query_params.get('import_format')
+    if detect_format(content_type=request.content_type):
+        stream = request.stream or []
+        import_format = import_format or detect_format(content_type=request.content_type)
+    else:
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ParseError('Upload a CSV or NDJSON file as "file", or send it as the request body.')
+        stream = upload
+        import_format = import_format or detect_format(upload.name, upload.content_type)
+    if import_format not in IMPORT_FORMATS:
+        return Response({'error': 'Unknown format; use import_format=csv or import_format=ndjson'}, status=400)
+    
+    batch_size = request.query_params.get('batch_size')
+    try:
+        result = import_jobs(
+            read_rows(stream, import_format), request.user,
+            batch_size=int(batch_size) if batch_size and batch_size.isdigit() else None,
+        )
+    except UnicodeDecodeError:
+        raise ParseError('The file must be UTF-8 encoded.')
+    return Response(result, status=201 if result['created'] else 400)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_export_jobs(request):
+    """Stream the employer's jobs (every job for admins) as ?export=csv or ?export=ndjson"""
+    if request.user.is_admin:
+        queryset = Job.objects.all()
+    elif request.user.is_employer:
+        queryset = Job.objects.filter(posted_by=request.user)
+    else:
+        return Response({'error': 'Only employers can export jobs'}, status=403)
+    
+    queryset = filter_jobs(queryset.order_by('-created_at', '-id'), request.query_params)
+    status_filter = request.query_params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    
+    response = export_response(request, queryset, JobExportSerializer, basename='jobs')
+    if response is None:
+        return Response({'error': 'Use export=csv or export=ndjson'}, status=400)
+    return response
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from notifications.outbox import outbox_setting, process_batch
+
+
+def drain(batch_size):
+    """Process batches until none are due; runs in a pool thread"""
+    totals = [0, 0, 0]
+    try:
+        while True:
+            claimed, sent, failed = process_batch(batch_size)
+            if not claimed:
+                return totals
+            totals[0] += claimed
+            totals[1] += sent
+            totals[2] += failed
+    finally:
+        # Each pool thread opened its own database connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Sender threads, each with its own SMTP connection')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails claimed (and sent per connection) at a time')
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or outbox_setting('BATCH_SIZE', 50)
+        workers = max(1, options['workers'])
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outbox') as pool:
+            while True:
+                results = [future.result() for future in [
+                    pool.submit(drain, batch_size) for _ in range(workers)
+                ]]
+                claimed, sent, failed = (sum(column) for column in zip(*results))
+                if claimed:
+                    self.stdout.write(f'Processed {claimed} emails: {sent} sent, {failed} failed')
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
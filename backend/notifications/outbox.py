@@ -0,0 +1,163 @@
+"""
+Transactional email outbox.
+
+Request handlers call ``enqueue_email()`` inside their transaction, so the
+email is stored if and only if the change it describes is committed. The
+``process_outbox`` management command claims pending rows in batches and
+sends each batch over one SMTP connection, retrying failures with
+exponential backoff.
+"""
+import logging
+import threading
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+_write_lock = threading.Lock()
+
+
+def serialized_writes():
+    """
+    Without row locks (SQLite), threads of one worker take turns writing
+    outbox rows; interleaved read-then-write transactions would deadlock.
+    """
+    if connection.features.has_select_for_update:
+        return nullcontext()
+    return _write_lock
+
+
+def outbox_setting(name, default):
+    return getattr(settings, f'EMAIL_OUTBOX_{name}', default)
+
+
+def build_email(subject, message, recipient, from_email=None):
+    """An unsaved OutboxEmail, for callers that bulk_create many at once"""
+    return OutboxEmail(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient=recipient,
+    )
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None):
+    """Queue one email per recipient; a single INSERT"""
+    return OutboxEmail.objects.bulk_create([
+        build_email(subject, message, recipient, from_email) for recipient in recipient_list
+    ])
+
+
+def claim_batch(batch_size=None):
+    """
+    Mark up to ``batch_size`` due emails as sending and return them.
+
+    Rows stuck in 'sending' longer than EMAIL_OUTBOX_STALE_SECONDS (a worker
+    died mid-batch) are claimed again. SKIP LOCKED lets several workers
+    claim concurrently where the database supports it.
+    """
+    batch_size = batch_size or outbox_setting('BATCH_SIZE', 50)
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=outbox_setting('STALE_SECONDS', 600))
+
+    queryset = OutboxEmail.objects.filter(
+        Q(status='pending', next_attempt_at__lte=now) |
+        Q(status='sending', claimed_at__lt=stale_before)
+    ).order_by('next_attempt_at', 'id')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    elif connection.features.has_select_for_update:
+        queryset = queryset.select_for_update()
+
+    with serialized_writes(), transaction.atomic():
+        emails = list(queryset[:batch_size])
+        if emails:
+            OutboxEmail.objects.filter(id__in=[email.id for email in emails]).update(
+                status='sending', claimed_at=now
+            )
+    return emails
+
+
+def retry_delay(attempts):
+    base = outbox_setting('RETRY_BACKOFF_SECONDS', 30)
+    cap = outbox_setting('RETRY_BACKOFF_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def close_quietly(mail_connection):
+    if mail_connection is None:
+        return
+    try:
+        mail_connection.close()
+    except Exception:
+        logger.debug('Ignoring error while closing the mail connection', exc_info=True)
+
+
+def deliver_batch(emails):
+    """Send ``emails`` over one reused connection; returns (sent, failed)"""
+    max_attempts = outbox_setting('MAX_ATTEMPTS', 5)
+    sent = failed = 0
+    mail_connection = None
+
+    try:
+        for email in emails:
+            email.attempts += 1
+            try:
+                # A backend that cannot be loaded or reached fails this
+                # attempt like a rejected send, so the row is rescheduled
+                if mail_connection is None:
+                    mail_connection = get_connection(fail_silently=False)
+                # No-op while the session is open; reconnects after a failure
+                mail_connection.open()
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=[email.recipient],
+                    connection=mail_connection,
+                ).send()
+            except Exception as exc:
+                failed += 1
+                email.last_error = f'{type(exc).__name__}: {exc}'
+                if email.attempts >= max_attempts:
+                    email.status = 'failed'
+                else:
+                    email.status = 'pending'
+                    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                logger.warning('Outbox email %s failed (attempt %s): %s', email.id, email.attempts, exc)
+                # The SMTP session may be broken; start a fresh one for the rest
+                close_quietly(mail_connection)
+            else:
+                sent += 1
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+    finally:
+        close_quietly(mail_connection)
+        with serialized_writes():
+            OutboxEmail.objects.bulk_update(
+                emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+            )
+
+    return sent, failed
+
+
+def process_batch(batch_size=None):
+    """Claim and deliver one batch; returns (claimed, sent, failed)"""
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0, 0
+    sent, failed = deliver_batch(emails)
+    return len(emails), sent, failed
+
+
+def pending_count():
+    return OutboxEmail.objects.filter(status__in=['pending', 'sending']).count()
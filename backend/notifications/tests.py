@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import OutboxEmail
+from .outbox import claim_batch, enqueue_email, process_batch, retry_delay
+
+
+class RejectingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+class UnreachableBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('Connection refused')
+
+
+def queue(*recipients):
+    return enqueue_email('Application Submitted', 'Thanks for applying.', list(recipients))
+
+
+class OutboxTests(TestCase):
+    def test_claim_takes_due_and_stale_rows(self):
+        queue('due@example.com', 'later@example.com', 'stuck@example.com')
+        OutboxEmail.objects.filter(recipient='later@example.com').update(
+            next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+        OutboxEmail.objects.filter(recipient='stuck@example.com').update(
+            status='sending', claimed_at=timezone.now() - timedelta(hours=1)
+        )
+
+        claimed = claim_batch()
+        self.assertEqual(sorted(email.recipient for email in claimed), ['due@example.com', 'stuck@example.com'])
+        self.assertEqual(OutboxEmail.objects.filter(status='sending').count(), 2)
+        self.assertEqual(claim_batch(), [])
+
+    def test_claim_respects_batch_size(self):
+        queue(*[f'seeker{number}@example.com' for number in range(5)])
+        self.assertEqual(len(claim_batch(batch_size=2)), 2)
+        self.assertEqual(OutboxEmail.objects.filter(status='pending').count(), 3)
+
+    def test_deliver_sends_every_claimed_email(self):
+        queue('first@example.com', 'second@example.com')
+        self.assertEqual(process_batch(), (2, 2, 0))
+        self.assertEqual([message.to for message in mail.outbox], [['first@example.com'], ['second@example.com']])
+        self.assertEqual(set(OutboxEmail.objects.values_list('status', flat=True)), {'sent'})
+
+    @override_settings(
+        EMAIL_BACKEND='notifications.tests.RejectingBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+        EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS=30, EMAIL_OUTBOX_RETRY_BACKOFF_MAX_SECONDS=45,
+    )
+    def test_failures_back_off_then_give_up(self):
+        queue('seeker@example.com')
+        for attempt, delay in ((1, 30), (2, 45), (3, None)):
+            before = timezone.now()
+            with self.assertLogs('notifications.outbox', 'WARNING'):
+                self.assertEqual(process_batch(), (1, 0, 1))
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.attempts, attempt)
+            self.assertIn('SMTPServerDisconnected', email.last_error)
+            if delay is None:
+                self.assertEqual(email.status, 'failed')
+            else:
+                self.assertEqual(email.status, 'pending')
+                self.assertAlmostEqual(
+                    email.next_attempt_at - before, timedelta(seconds=delay), delta=timedelta(seconds=1)
+                )
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(claim_batch(), [])
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        with self.settings(EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS=30, EMAIL_OUTBOX_RETRY_BACKOFF_MAX_SECONDS=100):
+            self.assertEqual([retry_delay(attempt).seconds for attempt in range(1, 5)], [30, 60, 100, 100])
+
+    def test_connection_failures_are_rescheduled(self):
+        for backend in ('notifications.tests.UnreachableBackend', 'notifications.tests.MissingBackend'):
+            with self.subTest(backend=backend), self.settings(EMAIL_BACKEND=backend):
+                OutboxEmail.objects.all().delete()
+                queue('first@example.com', 'second@example.com')
+                with self.assertLogs('notifications.outbox', 'WARNING'):
+                    self.assertEqual(process_batch(), (2, 0, 2))
+                self.assertEqual(set(OutboxEmail.objects.values_list('status', 'attempts')), {('pending', 1)})
+
+
+class ProcessOutboxCommandTests(TransactionTestCase):
+    def test_once_drains_the_outbox(self):
+        queue(*[f'seeker{number}@example.com' for number in range(5)])
+        stdout = StringIO()
+        call_command('process_outbox', '--once', '--workers', '2', '--batch-size', '2', stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), 'Processed 5 emails: 5 sent, 0 failed\n')
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(set(OutboxEmail.objects.values_list('status', flat=True)), {'sent'})
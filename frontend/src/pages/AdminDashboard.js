@@ -21,8 +21,8 @@ const AdminDashboard = () => {
         api.get('/admin/jobs/'),
       ]);
       setStats(statsRes.data);
-      setUsers(usersRes.data);
-      setJobs(jobsRes.data);
+      setUsers(usersRes.data.results || usersRes.data);
+      setJobs(jobsRes.data.results || jobsRes.data);
     } catch (error) {
       console.error('Error fetching admin data:', error);
     } finally {
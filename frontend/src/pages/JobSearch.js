@@ -8,7 +8,9 @@ import './JobSearch.css';
 const JobSearch = () => {
   const [searchParams, setSearchParams] = useSearchParams();
   const [jobs, setJobs] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filters, setFilters] = useState({
     search: searchParams.get('search') || '',
     category: searchParams.get('category') || '',
@@ -35,7 +37,8 @@ const JobSearch = () => {
       });
 
       const response = await api.get(`/jobs/search/?${params.toString()}`);
-      setJobs(response.data);
+      setJobs(response.data.results || response.data);
+      setNextPage(response.data.next || null);
     } catch (error) {
       console.error('Error fetching jobs:', error);
     } finally {
@@ -43,6 +46,20 @@ const JobSearch = () => {
     }
   };
 
+  const loadMoreJobs = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.get(nextPage);
+      setJobs((current) => [...current, ...response.data.results]);
+      setNextPage(response.data.next || null);
+    } catch (error) {
+      console.error('Error fetching jobs:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleFilterChange = (e) => {
     const { name, value } = e.target;
     setFilters({
@@ -223,7 +240,7 @@ const JobSearch = () => {
         <div className="jobs-list">
           <div className="jobs-header">
             <h2>
-              {jobs.length} {jobs.length === 1 ? 'Job' : 'Jobs'} Found
+              {jobs.length}{nextPage ? '+' : ''} {jobs.length === 1 ? 'Job' : 'Jobs'} Found
             </h2>
           </div>
 
@@ -238,6 +255,17 @@ const JobSearch = () => {
               ))}
             </div>
           )}
+
+          {nextPage && (
+            <button
+              type="button"
+              onClick={loadMoreJobs}
+              className="btn btn-secondary btn-block"
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load More'}
+            </button>
+          )}
         </div>
       </div>
     </div>